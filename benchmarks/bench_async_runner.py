@@ -0,0 +1,72 @@
+"""
+Benchmark: throughput of the sequential run_agent loop vs the async runner
+(run_queries) at several concurrency limits, against the local stand-in client.
+
+Run with: python -m benchmarks.bench_async_runner --queries 40 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.fake_anthropic import AsyncFakeAnthropic, FakeAnthropic
+import demo_claude
+from demo_claude import run_agent, run_queries
+
+
+TEMPLATES = [
+    ("What are your hours? #{i}", [[("check_faq", {"question": "hours"})], "We're open Monday-Friday 8AM-6PM."]),
+    ("Is APT-101 confirmed? #{i}", [[("lookup_appointment", {"appointment_id": "APT-101"})], "Yes, APT-101 is confirmed."]),
+    ("Is APT-101 confirmed and what are your hours? #{i}", [
+        [("lookup_appointment", {"appointment_id": "APT-101"}), ("check_faq", {"question": "hours"})],
+        "APT-101 is confirmed; we're open Monday-Friday 8AM-6PM.",
+    ]),
+]
+
+
+def make_workload(count):
+    scripts = {}
+    queries = []
+    for i in range(count):
+        template, script = TEMPLATES[i % len(TEMPLATES)]
+        query = template.format(i=i)
+        scripts[query] = script
+        queries.append(query)
+    return queries, scripts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per simulated LLM call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    queries, scripts = make_workload(args.queries)
+    print(f"{args.queries} queries, simulated LLM latency {args.latency:.2f}s per call\n")
+    print(f"{'runner':<24} {'wall (s)':>9} {'queries/s':>10} {'speedup':>8}")
+    print("-" * 54)
+
+    saved = demo_claude.FAST_PATH
+    demo_claude.FAST_PATH = False
+    try:
+        client = FakeAnthropic(scripts, latency=args.latency)
+        start = time.perf_counter()
+        expected = [run_agent(query, client=client, cache=None) for query in queries]
+        sequential = time.perf_counter() - start
+        print(f"{'sequential run_agent':<24} {sequential:>9.2f} {len(queries) / sequential:>10.2f} {1.0:>8.1f}")
+
+        for concurrency in args.concurrency:
+            async_client = AsyncFakeAnthropic(scripts, latency=args.latency)
+            start = time.perf_counter()
+            responses = asyncio.run(run_queries(queries, concurrency=concurrency, client=async_client, cache=None))
+            elapsed = time.perf_counter() - start
+            assert responses == expected, "runner must preserve input order"
+            label = f"run_queries (c={concurrency})"
+            print(f"{label:<24} {elapsed:>9.2f} {len(queries) / elapsed:>10.2f} {sequential / elapsed:>8.1f}")
+    finally:
+        demo_claude.FAST_PATH = saved
+
+
+if __name__ == "__main__":
+    main()
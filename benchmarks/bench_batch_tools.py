@@ -0,0 +1,60 @@
+"""
+Benchmark: LLM turns and end-to-end latency of a multi-entity query with and
+without the batch lookup tools, against the local stand-in client.
+
+Run with: python -m benchmarks.bench_batch_tools --latency 1.0
+"""
+
+import argparse
+import time
+
+from benchmarks.fake_anthropic import FakeAnthropic
+from demo_claude import TOOLS, run_agent
+
+
+QUERY = "Can you check APT-101 through APT-105 and my labs LAB-201, LAB-202 and LAB-203?"
+APPOINTMENT_IDS = ["APT-101", "APT-102", "APT-103", "APT-104", "APT-105"]
+LAB_IDS = ["LAB-201", "LAB-202", "LAB-203"]
+ANSWER = "Here is a summary of your five appointments and three lab results."
+
+SINGLE_CALLS = (
+    [("lookup_appointment", {"appointment_id": apt_id}) for apt_id in APPOINTMENT_IDS]
+    + [("lookup_lab_result", {"lab_id": lab_id}) for lab_id in LAB_IDS]
+)
+BATCH_TOOL_NAMES = {"lookup_appointments", "lookup_lab_results", "find_doctors"}
+
+SCENARIOS = {
+    # Worst case: the model spreads the single lookups over one turn each
+    "single, one per turn": ([[call] for call in SINGLE_CALLS] + [ANSWER], False),
+    # Best case without batch tools: all single lookups in one turn
+    "single, one turn": ([SINGLE_CALLS, ANSWER], False),
+    "batch tools": ([[
+        ("lookup_appointments", {"appointment_ids": APPOINTMENT_IDS}),
+        ("lookup_lab_results", {"lab_ids": LAB_IDS}),
+    ], ANSWER], True),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per simulated LLM call")
+    args = parser.parse_args()
+
+    single_tools = [tool for tool in TOOLS if tool["name"] not in BATCH_TOOL_NAMES]
+
+    print(f"Simulated LLM latency: {args.latency:.2f}s per call\n")
+    print(f"{'scenario':<22} {'LLM calls':>10} {'tool calls':>11} {'input tokens':>13} {'wall (s)':>9}")
+    print("-" * 69)
+    for label, (script, uses_batch) in SCENARIOS.items():
+        client = FakeAnthropic({QUERY: script}, latency=args.latency)
+        tool_calls = sum(len(turn) for turn in script if not isinstance(turn, str))
+        start = time.perf_counter()
+        run_agent(QUERY, client=client, tools=TOOLS if uses_batch else single_tools, cache=None)
+        elapsed = time.perf_counter() - start
+        # Prompt size regardless of how much of it was served from the prompt cache
+        input_tokens = client.input_tokens + client.cache_read_input_tokens + client.cache_creation_input_tokens
+        print(f"{label:<22} {client.calls:>10} {tool_calls:>11} {input_tokens:>13,} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
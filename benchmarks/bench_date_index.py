@@ -0,0 +1,87 @@
+"""
+Benchmark: time-window queries over the date index (src/storage.py DateIndex)
+against a linear scan that parses every record's date on each call, on
+synthetic appointments of growing size. Reports index build time and the
+latency of a one-week window, with and without a doctor filter, pulling the
+first page of results the way the range tools do.
+
+Run with: python -m benchmarks.bench_date_index --sizes 10000 100000 1000000
+"""
+
+import argparse
+import itertools
+import time
+from datetime import date
+
+from benchmarks import synthetic
+from src.dates import parse_date, parse_time, window_stamps
+from src.records import RecordTable
+from src.storage import APPOINTMENT_CATEGORIES, APPOINTMENT_FIELDS, MemoryStore
+from src.tools import DEFAULT_PAGE_SIZE
+
+
+WEEK = (date(2025, 12, 8), date(2025, 12, 14))
+
+
+def scan(appointments, first, last, doctor=None):
+    """The naive range query: parse every date, keep the matches, sort them"""
+    matches = []
+    for apt_id, record in appointments.items():
+        day = parse_date.__wrapped__(record["date"])
+        if day is None or not first <= day <= last:
+            continue
+        if doctor and record["doctor"].lower() != doctor.lower():
+            continue
+        matches.append((day, parse_time.__wrapped__(record["time"]) or 0, apt_id, record))
+    matches.sort(key=lambda match: match[:3])
+    return [(apt_id, record) for _, _, apt_id, record in matches[:DEFAULT_PAGE_SIZE + 1]]
+
+
+def time_per_call(operation, min_time: float = 0.5) -> float:
+    """Seconds per call, repeating until at least min_time has passed"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        operation()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    first, last = WEEK
+    start, end = window_stamps(first, last)
+    print(f"Window {first} .. {last}, first {DEFAULT_PAGE_SIZE + 1} rows per query\n")
+    print(f"{'rows':>10} {'build (s)':>10} {'filter':>10} {'scan (ms)':>10} {'index (µs)':>11} {'speedup':>9}")
+    print("-" * 66)
+    for size in args.sizes:
+        table = RecordTable(APPOINTMENT_FIELDS, APPOINTMENT_CATEGORIES, synthetic.appointments(size))
+        started = time.perf_counter()
+        store = MemoryStore(appointments=table)
+        build_s = time.perf_counter() - started
+
+        for doctor in (None, "Dr. Smith"):
+            expected = scan(table, first, last, doctor)
+            indexed = list(itertools.islice(store.find_appointments_between(start, end, doctor=doctor),
+                                            DEFAULT_PAGE_SIZE + 1))
+            assert [apt_id for apt_id, _ in indexed] == [apt_id for apt_id, _ in expected]
+
+            scan_s = time_per_call(lambda: scan(table, first, last, doctor), args.min_time)
+            index_s = time_per_call(
+                lambda: list(itertools.islice(store.find_appointments_between(start, end, doctor=doctor),
+                                              DEFAULT_PAGE_SIZE + 1)),
+                args.min_time,
+            )
+            print(f"{size:>10,} {build_s:>10.2f} {doctor or '-':>10} {scan_s * 1e3:>10.1f} "
+                  f"{index_s * 1e6:>11.1f} {scan_s / index_s:>8,.0f}x")
+        del store, table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: doctor-name resolution latency and hit rate as the directory grows
+from the 3 demo doctors to 20k providers. Compares the prebuilt DoctorIndex
+against a linear edit-distance scan over every name.
+
+Query kinds: the exact key, the name without the title, the last name alone,
+a one-letter typo in the last name, and a name nobody has. Names shared by
+several doctors (two Dr. Kovarens) are ambiguous and count as unresolved;
+find_doctor then lists the closest matches instead.
+
+Run with: python -m benchmarks.bench_doctor_index
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks import synthetic
+from src.data import DOCTORS
+from src.doctor_index import DoctorIndex, bounded_distance, max_distance, normalize
+
+
+SIZES = [3, 1_000, 5_000, 20_000]
+QUERIES_PER_KIND = 500
+LINEAR_QUERIES = 20  # the linear scan is too slow to run the full query set at 20k
+
+
+def typo(name: str, rng) -> str:
+    """Replace one letter of the last name"""
+    first, _, last = name.rpartition(" ")
+    position = rng.randrange(1, len(last))
+    letter = rng.choice([c for c in "aeioustrn" if c != last[position]])
+    return f"{first} {last[:position]}{letter}{last[position + 1:]}"
+
+
+def make_queries(directory: dict, rng) -> dict:
+    keys = list(directory)
+    sample = [rng.choice(keys) for _ in range(QUERIES_PER_KIND)]
+    return {
+        "exact key": sample,
+        "no title": [directory[key]["full_name"].removeprefix("Dr. ") for key in sample],
+        "last name": [key.rsplit(" ", 1)[-1] for key in sample],
+        "typo": [typo(key, rng) for key in sample],
+        "unknown": [f"Dr. Qxw{i}" for i in range(QUERIES_PER_KIND)],
+    }
+
+
+def linear_resolve(directory: dict, name: str):
+    """Closest key by edit distance against every key and full name"""
+    form = normalize(name)
+    limit = max_distance(form)
+    best, best_key = limit + 1, None
+    for key, doc in directory.items():
+        for candidate in (key, doc["full_name"]):
+            distance = bounded_distance(form, normalize(candidate), limit)
+            if distance < best:
+                best, best_key = distance, key
+    return best_key
+
+
+def time_per_call(function, queries) -> tuple:
+    start = time.perf_counter()
+    resolved = sum(function(query) is not None for query in queries)
+    return (time.perf_counter() - start) / len(queries) * 1e6, resolved / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'doctors':>8} {'build ms':>9} {'query':<10} {'index us':>9} {'resolved':>9} {'linear us':>10}")
+    print("-" * 60)
+    for size in args.sizes:
+        directory = dict(DOCTORS) if size <= len(DOCTORS) else dict(synthetic.doctors(size))
+
+        start = time.perf_counter()
+        index = DoctorIndex((key, doc["full_name"]) for key, doc in directory.items())
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        for kind, queries in make_queries(directory, rng).items():
+            index_us, resolved = time_per_call(index.resolve, queries)
+            linear_us, _ = time_per_call(lambda name: linear_resolve(directory, name), queries[:LINEAR_QUERIES])
+            print(f"{size:>8,} {build_ms:>9.1f} {kind:<10} {index_us:>9.1f} {resolved:>9.0%} {linear_us:>10.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: incremental evaluation (src/eval_pipeline.py) over a synthetic
+suite, with stand-in agent and judge coroutines that sleep for a fixed latency.
+Reports agent runs, judge calls and wall time for a cold run, a warm re-run,
+1% of the cases edited, a data change and one edited metric, against the
+sequential cost of running everything.
+
+Run with: python -m benchmarks.bench_eval_pipeline --cases 2000 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+
+from src.eval_pipeline import EvalCase, EvalStore, Judge, evaluate_cases, fingerprint
+
+
+TOPICS = ["hours", "insurance", "parking", "telehealth", "billing", "records", "referrals", "vaccines"]
+
+
+def make_cases(count: int, rng) -> list:
+    return [EvalCase(f"Question {i} about {rng.choice(TOPICS)}?", f"Answer {i}") for i in range(count)]
+
+
+def make_judges(latency: float, criteria: dict) -> list:
+    def judge(name):
+        async def measure(case, output):
+            await asyncio.sleep(latency)
+            return 1.0, "ok", True
+        return Judge(name, fingerprint([name, criteria[name]]), measure)
+
+    return [judge(name) for name in criteria]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per agent run and per judge call")
+    parser.add_argument("--agent-concurrency", type=int, default=16)
+    parser.add_argument("--judge-concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    cases = make_cases(args.cases, rng)
+    criteria = {"Correctness": "v1", "Completeness": "v1"}
+
+    async def agent(query):
+        await asyncio.sleep(args.latency)
+        return f"Answer to {query}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EvalStore(os.path.join(tmp, "eval.db"))
+
+        def run(label, cases, data_version="data-1", force=False):
+            judges = make_judges(args.latency, criteria)
+            _, stats = asyncio.run(evaluate_cases(
+                cases, agent, judges, store, agent_version="agent-1", data_version=data_version,
+                agent_concurrency=args.agent_concurrency, judge_concurrency=args.judge_concurrency, force=force,
+            ))
+            sequential = (stats.outputs_run + stats.scores_run) * args.latency
+            print(f"{label:<22} {stats.outputs_run:>8,} {stats.outputs_cached:>8,} {stats.scores_run:>8,} "
+                  f"{stats.scores_cached:>8,} {stats.seconds:>8.2f} {sequential:>12.1f}")
+
+        print(f"{args.cases:,} cases, {len(criteria)} metrics, {args.latency * 1000:.0f}ms per call, "
+              f"concurrency {args.agent_concurrency}/{args.judge_concurrency}\n")
+        print(f"{'run':<22} {'agent':>8} {'reused':>8} {'judge':>8} {'reused':>8} {'wall s':>8} {'sequential s':>12}")
+        print("-" * 80)
+        run("cold", cases)
+        run("warm re-run", cases)
+
+        edited = list(cases)
+        for i in rng.sample(range(len(cases)), max(1, len(cases) // 100)):
+            edited[i] = EvalCase(cases[i].query + " (edited)", cases[i].expected)
+        run("1% of cases edited", edited)
+
+        criteria["Completeness"] = "v2"
+        run("one metric edited", edited)
+        run("data changed", edited, data_version="data-2")
+        run("--force", edited, data_version="data-2", force=True)
+
+
+if __name__ == "__main__":
+    main()
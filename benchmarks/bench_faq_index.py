@@ -0,0 +1,78 @@
+"""
+Benchmark: FAQ lookup latency as the FAQ grows from 20 entries to 100k.
+Compares the prebuilt FaqIndex against the old linear substring scan.
+
+Run with: python -m benchmarks.bench_faq_index
+"""
+
+import random
+import time
+
+from src.faq_index import FaqIndex
+
+
+SIZES = [20, 1_000, 10_000, 100_000]
+QUERIES_PER_SIZE = 2_000
+LINEAR_QUERIES = 50  # the linear scan is too slow to run the full query set at 100k
+
+
+def make_word(rng):
+    return "".join(rng.choice("bcdfghjklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+
+
+def make_faq(size, rng):
+    """Synthetic FAQ with 1-4 word keys drawn from a shared vocabulary"""
+    vocabulary = [make_word(rng) for _ in range(max(200, size // 2))]
+    faq = {}
+    while len(faq) < size:
+        key = " ".join(rng.sample(vocabulary, rng.randint(1, 4)))
+        faq.setdefault(key, f"Answer for {key}")
+    return faq, vocabulary
+
+
+def make_queries(faq, vocabulary, count, rng):
+    """Half of the queries embed a known key in a sentence, half are random words"""
+    keys = list(faq)
+    queries = []
+    for i in range(count):
+        if i % 2 == 0:
+            queries.append(f"can you tell me about {rng.choice(keys)} please")
+        else:
+            queries.append(" ".join(rng.sample(vocabulary, 3)))
+    return queries
+
+
+def linear_lookup(faq, question):
+    question = question.lower().strip()
+    for key, answer in faq.items():
+        if question in key or key in question:
+            return answer
+    return None
+
+
+def time_per_call(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'entries':>10} {'build (ms)':>12} {'index (us)':>12} {'linear (us)':>13}")
+    print("-" * 50)
+    for size in SIZES:
+        faq, vocabulary = make_faq(size, rng)
+        queries = make_queries(faq, vocabulary, QUERIES_PER_SIZE, rng)
+
+        start = time.perf_counter()
+        index = FaqIndex(faq)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        index_us = time_per_call(index.lookup, queries)
+        linear_us = time_per_call(lambda q: linear_lookup(faq, q), queries[:LINEAR_QUERIES])
+        print(f"{size:>10,} {build_ms:>12.1f} {index_us:>12.2f} {linear_us:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: TF-IDF FAQ retrieval (src/faq_search.py) from the demo FAQ up to
+100k entries: build time, memory of the postings, single-question latency,
+batched throughput, and top-1 accuracy on paraphrased questions (key words
+dropped, answer words reordered, one typo).
+
+The pure-Python column scores one question against every row with dict
+vectors, the loop the vectorized bincount replaces.
+
+Needs numpy. Run with: python -m benchmarks.bench_faq_search --sizes 1000 100000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.bench_faq_index import make_word
+from src.data import FAQ_DATA
+from src.faq_search import FaqSearch
+
+
+SIZES = [len(FAQ_DATA), 10_000, 100_000]
+QUESTIONS = 1_000
+PYTHON_QUESTIONS = 5  # the per-row Python loop is too slow for the full set at 100k
+
+
+def make_faq(size: int, rng) -> dict:
+    """Keys of 1-3 words and 6-12 word answers over a shared vocabulary"""
+    vocabulary = [make_word(rng) for _ in range(max(500, size // 4))]
+    faq = {}
+    while len(faq) < size:
+        key = " ".join(rng.sample(vocabulary, rng.randint(1, 3)))
+        faq.setdefault(key, " ".join(rng.sample(vocabulary, rng.randint(6, 12))))
+    return faq
+
+
+def paraphrase(key: str, answer: str, rng) -> str:
+    """A question sharing some answer words with its entry, one of them misspelled"""
+    words = rng.sample(answer.split(), 3)
+    word = words[0]
+    position = rng.randrange(len(word))
+    words[0] = word[:position] + rng.choice("aeiou") + word[position + 1:]
+    return "do you have " + " ".join(words)
+
+
+def python_scores(vectors: list, query: dict) -> list:
+    return [sum(weight * vector.get(feature, 0.0) for feature, weight in query.items()) for vector in vectors]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    print(f"{'entries':>8} {'build s':>8} {'postings MB':>12} {'single us':>10} {'batch q/s':>10} "
+          f"{'top-1 acc':>10} {'python ms':>10}")
+    print("-" * 76)
+    for size in args.sizes:
+        faq = dict(FAQ_DATA) if size <= len(FAQ_DATA) else make_faq(size, rng)
+        entries = list(faq.items())
+
+        start = time.perf_counter()
+        search = FaqSearch(entries)
+        build = time.perf_counter() - start
+        postings_mb = (search._rows.nbytes + search._weights.nbytes + search._starts.nbytes) / 2**20
+
+        targets = [rng.randrange(len(entries)) for _ in range(QUESTIONS)]
+        questions = [paraphrase(*entries[target], rng) for target in targets]
+
+        start = time.perf_counter()
+        single = [search.search(question, args.k) for question in questions]
+        single_us = (time.perf_counter() - start) / len(questions) * 1e6
+
+        start = time.perf_counter()
+        batched = search.search_batch(questions, args.k)
+        batch_qps = len(questions) / (time.perf_counter() - start)
+        assert [hits[:1] for hits in batched] == [hits[:1] for hits in single], "batch must rank like search()"
+
+        answers = [entries[target][1] for target in targets]
+        accuracy = sum(bool(hits) and hits[0][1] == answer for hits, answer in zip(single, answers)) / len(questions)
+
+        # Same features and weights, scored row by row in Python
+        vectors = [{} for _ in entries]
+        columns = np.repeat(np.arange(len(search._starts) - 1), np.diff(search._starts))
+        for row, column, weight in zip(search._rows.tolist(), columns.tolist(), search._weights.tolist()):
+            vectors[row][column] = weight
+        start = time.perf_counter()
+        for question in questions[:PYTHON_QUESTIONS]:
+            query = dict.fromkeys(search._features(question, query=True), 1.0)
+            python_scores(vectors, query)
+        python_ms = (time.perf_counter() - start) / PYTHON_QUESTIONS * 1e3
+
+        print(f"{size:>8,} {build:>8.2f} {postings_mb:>12.1f} {single_us:>10.1f} {batch_qps:>10,.0f} "
+              f"{accuracy:>10.1%} {python_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
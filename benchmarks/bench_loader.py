@@ -0,0 +1,176 @@
+"""
+Benchmark: load time and peak memory of the streaming export loader
+(src/loader.py) on a large appointments export, against reading the whole
+file before building the store. Each mode runs in its own subprocess so peak
+RSS numbers don't mix.
+
+Then hot reload on a smaller export while a thread keeps calling a tool:
+time to apply appended rows, time to rebuild and swap after an edit, and the
+slowest tool call and errors seen meanwhile.
+
+Run with: python -m benchmarks.bench_loader --rows 5000000 --format csv
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks import synthetic
+from src.loader import DataReloader, load_store, write_export
+from src.storage import MemoryStore
+
+
+MODES = ("stream-compact", "stream-dicts", "read-all")
+RELOAD_ROWS = 500_000
+APPENDED_ROWS = 10_000
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def read_all(path: str) -> MemoryStore:
+    """The naive loader: every line in memory, then every parsed row, then the store"""
+    with open(path) as export:
+        lines = export.read().splitlines()
+    if path.endswith(".csv"):
+        import csv
+        header, *rows = list(csv.reader(lines))
+        items = [dict(zip(header, row)) for row in rows]
+        for item in items:
+            item["urgent"] = item.get("urgent") == "true"
+    else:
+        items = [json.loads(line) for line in lines]
+    return MemoryStore(appointments={item.pop("id"): item for item in items})
+
+
+def worker(mode: str, directory: str):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "read-all":
+        path = next(os.path.join(directory, name) for name in os.listdir(directory))
+        store = read_all(path)
+    else:
+        store = load_store(directory, compact=mode == "stream-compact")
+    load_s = time.perf_counter() - start
+    print(json.dumps({"load_s": load_s, "peak_mb": peak_rss_mb() - baseline, "rows": len(store.appointments)}))
+
+
+def run_worker(mode: str, directory: str) -> dict:
+    process = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_loader", "--worker", mode, "--dir", directory],
+        capture_output=True, text=True,
+    )
+    if process.returncode:
+        return {"error": f"exit {process.returncode}"}
+    return json.loads(process.stdout)
+
+
+def bench_reload(directory: str, extension: str, rows: int):
+    from demo_claude import FUNCTION_MAP
+
+    path = os.path.join(directory, "appointments" + extension)
+    write_export(path, "appointments", synthetic.appointments(rows))
+    reloader = DataReloader(directory)
+    start = time.perf_counter()
+    reloader.load()
+    print(f"\nHot reload on {rows:,} appointments (initial load {time.perf_counter() - start:.1f}s)")
+
+    # A caller that never stops: the slowest call shows how long tools are held up
+    stop = threading.Event()
+    calls = {"count": 0, "errors": 0, "slowest_ms": 0.0}
+
+    def call_tools():
+        lookup = FUNCTION_MAP["lookup_appointment"]
+        i = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                lookup(appointment_id=synthetic.appointment_id(i % rows))
+            except Exception:
+                calls["errors"] += 1
+            calls["slowest_ms"] = max(calls["slowest_ms"], (time.perf_counter() - started) * 1e3)
+            calls["count"] += 1
+            i += 7919
+
+    caller = threading.Thread(target=call_tools, daemon=True)
+    caller.start()
+    try:
+        appended = ((synthetic.appointment_id(rows + i), record)
+                    for i, (_, record) in enumerate(synthetic.appointments(APPENDED_ROWS, seed=9)))
+        write_export(path, "appointments", appended, append=True)
+        start = time.perf_counter()
+        action = reloader.check()
+        append_s = time.perf_counter() - start
+        assert action == "append" and len(reloader.store.appointments) == rows + APPENDED_ROWS
+
+        with open(path, "r+b") as export:
+            # Same length, different content: only a rebuild is correct
+            middle = export.seek(0, os.SEEK_END) // 2
+            export.seek(middle)
+            position = middle + export.read(1 << 16).index(b"confirmed")
+            export.seek(position)
+            export.write(b"C")
+        start = time.perf_counter()
+        action = reloader.check()
+        reload_s = time.perf_counter() - start
+        assert action == "reload"
+    finally:
+        stop.set()
+        caller.join()
+
+    print(f"  {APPENDED_ROWS:,} appended rows applied in place: {append_s * 1e3:.0f}ms")
+    print(f"  edit -> rebuild and swap:               {reload_s:.1f}s")
+    print(f"  meanwhile: {calls['count']:,} tool calls, {calls['errors']} errors, "
+          f"slowest {calls['slowest_ms']:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--reload-rows", type=int, default=RELOAD_ROWS)
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.dir)
+        return
+
+    extension = "." + args.format
+    with tempfile.TemporaryDirectory() as tmp:
+        big = os.path.join(tmp, "big")
+        os.mkdir(big)
+        path = os.path.join(big, "appointments" + extension)
+        start = time.perf_counter()
+        write_export(path, "appointments", synthetic.appointments(args.rows))
+        print(f"Wrote {args.rows:,} appointments ({os.path.getsize(path) / 2**20:.0f} MB {args.format}) "
+              f"in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'mode':>15} {'load (s)':>10} {'peak RSS (MB)':>14} {'rows/s':>10}")
+        print("-" * 52)
+        for mode in args.modes:
+            result = run_worker(mode, big)
+            if "error" in result:
+                print(f"{mode:>15} {'failed (' + result['error'] + ')':>36}")
+                continue
+            print(f"{mode:>15} {result['load_s']:>10.1f} {result['peak_mb']:>14.0f} "
+                  f"{result['rows'] / result['load_s']:>10,.0f}")
+        os.remove(path)
+
+        small = os.path.join(tmp, "small")
+        os.mkdir(small)
+        bench_reload(small, extension, args.reload_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Microbenchmark: cost of the per-tool metrics in call_tool.
+Times memoized call_tool hits (the cheapest path, so the worst case for
+relative overhead) with recording on and off, plus ToolMetrics.record alone.
+
+Run with: python -m benchmarks.bench_metrics
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.mcp_server import call_tool, metrics, render_stats
+
+
+CASES = [
+    ("check_faq", {"question": "What are your hours?"}),
+    ("lookup_appointment", {"appointment_id": "APT-101"}),
+    ("find_doctor", {"doctor_name": "Dr. Who"}),
+    ("find_appointments", {"doctor": "Dr. Smith"}),
+]
+
+
+async def nanoseconds_per_call(calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        for name, arguments in CASES:
+            await call_tool(name, arguments)
+    return (time.perf_counter() - start) / (calls * len(CASES)) * 1e9
+
+
+async def run(args):
+    # Warm the tool caches so every timed call is a hit
+    await nanoseconds_per_call(1)
+
+    timings = {True: [], False: []}
+    for _ in range(args.rounds):
+        for enabled in (False, True):
+            metrics.enabled = enabled
+            timings[enabled].append(await nanoseconds_per_call(args.calls))
+    metrics.enabled = True
+    off, on = min(timings[False]), min(timings[True])
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        metrics.record("bench", 0.0001)
+    record = (time.perf_counter() - start) / args.calls * 1e9
+
+    print(f"call_tool, metrics off:  {off:8.0f} ns/call")
+    print(f"call_tool, metrics on:   {on:8.0f} ns/call  (+{on - off:.0f} ns, {(on - off) / off:+.1%})")
+    print(f"ToolMetrics.record:      {record:8.0f} ns/call")
+    if args.show:
+        print()
+        print(render_stats(args.show))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20_000, help="calls per case per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--show", choices=["json", "prometheus"], help="print the collected stats afterwards")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: one page of a search tool (cursor pagination in src/tools.py)
+against rendering every match into a single result, on a large synthetic
+store where a doctor filter matches a third of the appointments. Reports
+wall time, peak traced allocation and the result's estimated tokens for the
+first page, a page deep into the results, and the unpaged answer.
+
+Run with: python -m benchmarks.bench_pagination --rows 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+from src.records import RecordTable
+from src.storage import APPOINTMENT_CATEGORIES, APPOINTMENT_FIELDS, MemoryStore, get_store, set_store
+from src.tools import CHARS_PER_TOKEN, REGISTRY, appointment_row, encode_cursor, search_filters
+
+
+DOCTOR = "Dr. Smith"
+
+
+def measure(operation, repeat: int = 5) -> tuple:
+    """(best seconds, peak traced KiB, result) of `operation` over `repeat` runs"""
+    operation()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        result = operation()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024, result
+
+
+def unpaged(store):
+    """The old shape: every match rendered into one string"""
+    rows = [appointment_row(apt_id, apt) for apt_id, apt in store.find_appointments(doctor=DOCTOR)]
+    return "\n".join([f"Found {len(rows)} appointments:", *rows])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    table = RecordTable(APPOINTMENT_FIELDS, APPOINTMENT_CATEGORIES, synthetic.appointments(args.rows))
+    store = MemoryStore(appointments=table)
+    original = get_store()
+    set_store(store)
+    try:
+        find = REGISTRY["find_appointments"]
+        matches = [apt_id for apt_id, _ in store.find_appointments(doctor=DOCTOR)]
+        # The cursor the caller would hold halfway through the results
+        search = ("find_appointments", search_filters({"doctor": DOCTOR, "patient": None, "status": None}))
+        middle = encode_cursor(search, matches[len(matches) // 2])
+
+        cases = [
+            ("first page", lambda: find(doctor=DOCTOR, page_size=args.page_size)),
+            ("middle page (cursor)", lambda: find(doctor=DOCTOR, page_size=args.page_size, cursor=middle)),
+            ("unpaged", lambda: unpaged(store)),
+        ]
+        print(f"{args.rows:,} appointments, {len(matches):,} match doctor={DOCTOR!r}, "
+              f"page size {args.page_size}\n")
+        print(f"{'result':<22} {'time (ms)':>10} {'peak (KiB)':>12} {'tokens':>10}")
+        print("-" * 58)
+        for label, operation in cases:
+            seconds, peak_kb, text = measure(operation, repeat=3 if label == "unpaged" else 20)
+            print(f"{label:<22} {seconds * 1e3:>10.2f} {peak_kb:>12,.0f} {len(text) // CHARS_PER_TOKEN:>10,}")
+    finally:
+        set_store(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: latency of one agent turn with several artificially slow tools.
+With concurrent execution the turn should take about as long as the slowest
+tool, not the sum, and a failing or hung tool must not block the others.
+
+Run with: python -m benchmarks.bench_parallel_tools
+"""
+
+import time
+from types import SimpleNamespace
+
+import demo_claude
+from demo_claude import execute_tool_calls
+
+
+DELAYS = [0.1, 0.2, 0.3, 0.4]
+
+
+def slow_tool(delay: float) -> str:
+    time.sleep(delay)
+    return f"slept {delay}s"
+
+
+def failing_tool(delay: float) -> str:
+    time.sleep(delay)
+    raise RuntimeError("backend unavailable")
+
+
+FUNCTION_MAP = {"slow_tool": slow_tool, "failing_tool": failing_tool}
+
+
+def tool_use(index: int, name: str, delay: float):
+    return SimpleNamespace(id=f"toolu_{index}", name=name, input={"delay": delay})
+
+
+def run_turn(label, tool_uses, expected):
+    start = time.perf_counter()
+    results = execute_tool_calls(tool_uses, function_map=FUNCTION_MAP)
+    elapsed = time.perf_counter() - start
+    in_order = [result["tool_use_id"] for result in results] == [use.id for use in tool_uses]
+    errors = sum(1 for result in results if result.get("is_error"))
+    print(f"{label:<28} {elapsed:>8.3f} {expected:>10.3f} {sum(use.input['delay'] for use in tool_uses):>8.3f} "
+          f"{'yes' if in_order else 'NO':>7} {errors:>7}")
+
+
+def main():
+    print(f"{'turn':<28} {'wall (s)':>8} {'slowest':>10} {'sum':>8} {'ordered':>7} {'errors':>7}")
+    print("-" * 73)
+
+    run_turn("4 slow tools", [tool_use(i, "slow_tool", d) for i, d in enumerate(DELAYS)], max(DELAYS))
+
+    mixed = [tool_use(i, "slow_tool", d) for i, d in enumerate(DELAYS)]
+    mixed.insert(1, tool_use(9, "failing_tool", 0.05))
+    run_turn("4 slow + 1 failing", mixed, max(DELAYS))
+
+    # A tool that outlives its timeout is reported as an error at the deadline
+    demo_claude.TOOL_TIMEOUTS["slow_tool"] = 0.25
+    try:
+        run_turn("4 slow, 0.25s timeout", [tool_use(i, "slow_tool", d) for i, d in enumerate(DELAYS)], 0.25)
+    finally:
+        del demo_claude.TOOL_TIMEOUTS["slow_tool"]
+
+
+if __name__ == "__main__":
+    main()
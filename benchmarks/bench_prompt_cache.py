@@ -0,0 +1,105 @@
+"""
+Benchmark: input tokens and time-to-first-token per turn of run_agent, with
+and without prompt-cache breakpoints (PROMPT_CACHE) and compact tool outputs
+(COMPACT_TOOL_OUTPUTS), against the local stand-in client.
+
+The stand-in charges prefill time per uncached input token (cached tokens cost
+a tenth), so the TTFT column follows the uncached prompt size.
+
+Run with: python -m benchmarks.bench_prompt_cache --prefill-per-token 0.0002
+"""
+
+import argparse
+import os
+import tempfile
+
+import demo_claude
+from benchmarks.fake_anthropic import FakeAnthropic
+from src.tracing import Tracer, load_traces
+
+
+# Multi-turn queries, run one after another against the same client
+SCRIPTS = {
+    "I have APT-102 scheduled. What doctor will I see and are they accepting new patients?": [
+        [("lookup_appointment", {"appointment_id": "APT-102"})],
+        [("find_doctor", {"doctor_name": "Dr. Johnson"})],
+        "You'll see Dr. Johnson, who is accepting new patients.",
+    ],
+    "Is APT-101 confirmed, is LAB-202 ready and what are your hours?": [
+        [("lookup_appointment", {"appointment_id": "APT-101"}), ("lookup_lab_result", {"lab_id": "LAB-202"})],
+        [("check_faq", {"question": "hours"})],
+        "APT-101 is confirmed, LAB-202 is ready, and we're open Monday-Friday 8AM-6PM.",
+    ],
+    "Tell me about Dr. Smith and Dr. Lee": [
+        [("find_doctor", {"doctor_name": "Dr. Smith"})],
+        [("find_doctor", {"doctor_name": "Dr. Lee"})],
+        "Dr. Smith is a family physician; Dr. Lee is a pediatrician.",
+    ],
+}
+
+CONFIGS = [
+    ("baseline", False, False),
+    ("compact outputs", False, True),
+    ("prompt cache", True, False),
+    ("cache + compact", True, True),
+]
+
+
+def run_config(prompt_cache: bool, compact: bool, args, tmp: str) -> list:
+    demo_claude.PROMPT_CACHE = prompt_cache
+    demo_claude.COMPACT_TOOL_OUTPUTS = compact
+    client = FakeAnthropic(SCRIPTS, latency=args.latency, prefill_per_token=args.prefill_per_token)
+    path = os.path.join(tmp, f"{prompt_cache}-{compact}.jsonl")
+    tracer = Tracer(path)
+    for query in SCRIPTS:
+        demo_claude.run_agent(query, client=client, cache=None, tracer=tracer)
+    return load_traces(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="fixed seconds per simulated LLM call")
+    parser.add_argument("--prefill-per-token", type=float, default=0.0002,
+                        help="simulated seconds per uncached input token")
+    args = parser.parse_args()
+
+    saved = demo_claude.PROMPT_CACHE, demo_claude.COMPACT_TOOL_OUTPUTS, demo_claude.FAST_PATH
+    demo_claude.FAST_PATH = False
+    totals = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            print(f"{'config':<16} {'query':<28} {'turn':>4} {'uncached':>9} {'cache rd':>9} "
+                  f"{'cache wr':>9} {'TTFT ms':>8}")
+            print("-" * 89)
+            for label, prompt_cache, compact in CONFIGS:
+                uncached = read = write = ttft = 0
+                for trace in run_config(prompt_cache, compact, args, tmp):
+                    query = trace["attributes"]["query"]
+                    for span in trace.get("children", ()):
+                        if span["name"] != "llm":
+                            continue
+                        attributes = span["attributes"]
+                        print(
+                            f"{label:<16} {query[:28]:<28} {attributes['turn']:>4} "
+                            f"{attributes['input_tokens']:>9,} {attributes['cache_read_input_tokens']:>9,} "
+                            f"{attributes['cache_creation_input_tokens']:>9,} {span['duration_ms']:>8.1f}"
+                        )
+                        uncached += attributes["input_tokens"]
+                        read += attributes["cache_read_input_tokens"]
+                        write += attributes["cache_creation_input_tokens"]
+                        ttft += span["duration_ms"]
+                totals[label] = (uncached, read, write, ttft)
+                print()
+    finally:
+        demo_claude.PROMPT_CACHE, demo_claude.COMPACT_TOOL_OUTPUTS, demo_claude.FAST_PATH = saved
+
+    # Cache writes bill at 1.25x and reads at 0.1x of the base input price
+    print(f"{'config':<16} {'uncached':>9} {'cache rd':>9} {'cache wr':>9} {'billed eq.':>10} {'TTFT ms':>8}")
+    print("-" * 66)
+    for label, (uncached, read, write, ttft) in totals.items():
+        billed = uncached + 1.25 * write + 0.1 * read
+        print(f"{label:<16} {uncached:>9,} {read:>9,} {write:>9,} {billed:>10,.0f} {ttft:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: response-cache hit rate and LLM calls saved on repetitive traffic,
+plus invalidation after a data write, against the local stand-in client.
+
+Run with: python -m benchmarks.bench_response_cache --requests 2000 --memory-size 8
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.fake_anthropic import FakeAnthropic
+import demo_claude
+from demo_claude import run_agent
+from src.cache import DiskCache, LRUCache, ResponseCache
+from src.storage import get_store
+
+
+QUERIES = {
+    "What are your hours?": [[("check_faq", {"question": "hours"})], "Monday-Friday 8AM-6PM."],
+    "Is APT-101 confirmed?": [[("lookup_appointment", {"appointment_id": "APT-101"})], "Yes, it is confirmed."],
+    "What's the status of LAB-202?": [[("lookup_lab_result", {"lab_id": "LAB-202"})], "LAB-202 is ready."],
+    "Tell me about Dr. Smith": [[("find_doctor", {"doctor_name": "Dr. Smith"})], "Dr. Sarah Smith, Family Medicine."],
+    "Where are you located?": [[("check_faq", {"question": "location"})], "123 Medical Plaza, Boston."],
+    "Do you accept insurance?": [[("check_faq", {"question": "insurance"})], "Yes, most major plans."],
+    "Is there parking?": [[("check_faq", {"question": "parking"})], "Free parking in Lot B."],
+    "Do you treat kids?": [[("check_faq", {"question": "kids"})], "Ages 12 and older."],
+    "What is your cancellation policy?": [[("check_faq", {"question": "cancel"})], "24 hours notice."],
+    "Do you offer telehealth?": [[("check_faq", {"question": "telehealth"})], "Yes, for follow-ups."],
+    "Can I get a covid test?": [[("check_faq", {"question": "covid"})], "Yes, Monday-Friday."],
+    "What lab services do you have?": [[("check_faq", {"question": "lab services"})], "Blood work, X-rays, ultrasound."],
+}
+
+
+def traffic(count, rng):
+    """Zipf-like mix: a few questions dominate, with case/punctuation variations"""
+    queries = list(QUERIES)
+    weights = [1 / (rank + 1) for rank in range(len(queries))]
+    for query in rng.choices(queries, weights=weights, k=count):
+        yield rng.choice([query, query.lower(), query.rstrip("?"), f"  {query}  "])
+
+
+def print_stats(label, cache):
+    stats = cache.stats_dict()
+    print(f"\n{label}")
+    for tier, counters in stats.items():
+        print(f"  {tier:<8} hits={counters['hits']:<6} misses={counters['misses']:<6} "
+              f"evictions={counters['evictions']:<5} expirations={counters['expirations']:<5} "
+              f"hit rate={counters['hit_rate']:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--memory-size", type=int, default=8, help="LRU entries in the memory tier")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per simulated LLM call")
+    args = parser.parse_args()
+
+    # Every query here is simple enough for the fast path; measure the cache in front of the model
+    saved = demo_claude.FAST_PATH
+    demo_claude.FAST_PATH = False
+    try:
+        rng = random.Random(3)
+        requests = list(traffic(args.requests, rng))
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(
+                LRUCache(max_entries=args.memory_size, ttl=300),
+                DiskCache(os.path.join(tmp, "responses.db"), ttl=300)
+            )
+            client = FakeAnthropic(QUERIES, latency=args.latency)
+
+            start = time.perf_counter()
+            for query in requests:
+                run_agent(query.strip(), client=client, cache=cache)
+            elapsed = time.perf_counter() - start
+            uncached_calls = 2 * len(requests)
+            print(f"{len(requests)} requests in {elapsed:.2f}s: {client.calls} LLM calls "
+                  f"instead of {uncached_calls} ({1 - client.calls / uncached_calls:.1%} saved)")
+            print_stats("Counters after steady traffic:", cache)
+
+            # A write to the store changes the data version, so the next lookups miss
+            store = get_store()
+            original = dict(store.get_appointment("APT-101"))
+            store.put_appointment("APT-101", dict(original, status="cancelled"))
+            try:
+                before = client.calls
+                for query in QUERIES:
+                    run_agent(query, client=client, cache=cache)
+                print(f"\nAfter a data write: {client.calls - before} LLM calls for {len(QUERIES)} distinct queries "
+                      "(every answer recomputed)")
+            finally:
+                store.put_appointment("APT-101", original)
+    finally:
+        demo_claude.FAST_PATH = saved
+
+
+if __name__ == "__main__":
+    main()
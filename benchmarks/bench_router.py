@@ -0,0 +1,102 @@
+"""
+Benchmark: share of the demo, evaluation and FAQ-traffic queries the
+deterministic fast path (src/router.py) answers without the LLM, the router's
+own cost, and the LLM calls and wall time saved against the local stand-in
+client.
+
+Each routed query is also replayed through run_agent with FAST_PATH off and a
+one-tool script built from its route, the path it would take without the
+router.
+
+Run with: python -m benchmarks.bench_router --latency 0.5
+"""
+
+import argparse
+import time
+
+import demo_claude
+from benchmarks.bench_response_cache import QUERIES as FAQ_TRAFFIC
+from benchmarks.fake_anthropic import FakeAnthropic
+from src.router import ROUTER_THRESHOLD, route
+
+
+QUERY_SETS = {
+    "demo": [
+        "What are your hours?",
+        "Is APT-101 confirmed?",
+        "What's the status of LAB-202?",
+        "Tell me about Dr. Smith",
+        "Is APT-101 confirmed and what are your office hours?",
+        "I have APT-102 scheduled. What doctor will I see and are they accepting new patients?",
+    ],
+    "evaluation": [
+        "What are your hours?",
+        "Is APT-101 confirmed?",
+        "What's the status of LAB-202?",
+        "Tell me about Dr. Smith",
+        "Is APT-101 confirmed and what are your hours?",
+    ],
+    "faq traffic": list(FAQ_TRAFFIC),
+}
+
+
+def time_per_call(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per simulated LLM call")
+    parser.add_argument("--repeat", type=int, default=2000, help="router calls timed per query")
+    args = parser.parse_args()
+
+    print(f"{'set':<12} {'query':<44} {'route':<20} {'conf':>5} {'router us':>10}")
+    print("-" * 95)
+    routed = {}
+    for label, queries in QUERY_SETS.items():
+        for query in queries:
+            decision = route(query)
+            cost = time_per_call(lambda: route(query), args.repeat)
+            fast = decision is not None and decision.confidence >= ROUTER_THRESHOLD
+            if fast:
+                routed[query] = decision
+            tool = decision.tool if decision else "-"
+            confidence = decision.confidence if decision else 0.0
+            print(f"{label:<12} {query[:44]:<44} {tool if fast else 'LLM':<20} {confidence:>5.2f} {cost * 1e6:>10.1f}")
+        handled = sum(query in routed for query in queries)
+        print(f"{'':<12} {handled}/{len(queries)} answered without the LLM ({handled / len(queries):.0%})\n")
+
+    scripts = {
+        query: [[(decision.tool, decision.arguments)], "Here is what I found."]
+        for query, decision in routed.items()
+    }
+    client = FakeAnthropic(scripts, latency=args.latency)
+    saved = demo_claude.FAST_PATH
+    try:
+        demo_claude.FAST_PATH = True
+        start = time.perf_counter()
+        for query in routed:
+            demo_claude.run_agent(query, client=client, cache=None)
+        fast_wall = time.perf_counter() - start
+        fast_calls = client.calls
+
+        demo_claude.FAST_PATH = False
+        start = time.perf_counter()
+        for query in routed:
+            demo_claude.run_agent(query, client=client, cache=None)
+        llm_wall = time.perf_counter() - start
+        llm_calls = client.calls - fast_calls
+    finally:
+        demo_claude.FAST_PATH = saved
+
+    print(f"{len(routed)} routed queries, simulated LLM latency {args.latency:.2f}s per call")
+    print(f"  fast path:  {fast_calls:>3} LLM calls, {fast_wall * 1000:>9.1f} ms")
+    print(f"  LLM loop:   {llm_calls:>3} LLM calls, {llm_wall * 1000:>9.1f} ms")
+    print(f"  saved:      {llm_calls - fast_calls:>3} LLM calls, {(llm_wall - fast_wall) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: multi-turn chat sessions (demo_claude.chat, src/sessions.py)
+against the local stand-in client. Every message makes the model page through
+a search tool, so unbounded history grows by a full tool result per turn.
+Reports input tokens per request by turn with the history budget and without
+it, then the traced memory held by many concurrent sessions.
+
+Run with: python -m benchmarks.bench_sessions --turns 20 --sessions 500
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import demo_claude
+from benchmarks import synthetic
+from benchmarks.fake_anthropic import FakeAnthropic
+from demo_claude import chat
+from src.records import RecordTable
+from src.sessions import HISTORY_TOKENS, SessionStore
+from src.storage import APPOINTMENT_CATEGORIES, APPOINTMENT_FIELDS, MemoryStore, get_store, set_store
+
+
+DOCTORS = ["Dr. Smith", "Dr. Johnson", "Dr. Lee"]
+STATUSES = ["confirmed", "pending confirmation", "cancelled"]
+UNBOUNDED = 10 ** 9
+
+
+def conversation(turns: int) -> dict:
+    """Scripts for `turns` distinct user messages, each one search and an answer"""
+    scripts = {}
+    for i in range(turns):
+        doctor, status = DOCTORS[i % 3], STATUSES[i // 3 % 3]
+        message = f"Message {i}: which of {doctor}'s appointments are {status}?"
+        scripts[message] = [
+            [("find_appointments", {"doctor": doctor, "status": status, "page_size": 50})],
+            f"{doctor} has many {status} appointments; the first is on {synthetic.MONTHS[i % 12]} 3.",
+        ]
+    return scripts
+
+
+def run_session(client, sessions, session_id: str, messages: list) -> list:
+    """Input tokens (uncached + cache read + cache write) of each message's last request"""
+    usage = []
+    for message in messages:
+        before = client.input_tokens + client.cache_read_input_tokens + client.cache_creation_input_tokens
+        calls = client.calls
+        chat(session_id, message, client=client, sessions=sessions)
+        total = client.input_tokens + client.cache_read_input_tokens + client.cache_creation_input_tokens
+        usage.append((total - before) // max(client.calls - calls, 1))
+    return usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    table = RecordTable(APPOINTMENT_FIELDS, APPOINTMENT_CATEGORIES, synthetic.appointments(args.rows))
+    original, fast_path = get_store(), demo_claude.FAST_PATH
+    set_store(MemoryStore(appointments=table))
+    demo_claude.FAST_PATH = False
+    try:
+        scripts = conversation(args.turns)
+        messages = list(scripts)
+        client = FakeAnthropic(scripts)
+
+        usage = {}
+        for label, budget in (("bounded", HISTORY_TOKENS), ("unbounded", UNBOUNDED)):
+            usage[label] = run_session(client, SessionStore(history_tokens=budget), label, messages)
+        print(f"Input tokens per request, history budget {HISTORY_TOKENS:,} tokens\n")
+        print(f"{'turn':>6} {'bounded':>10} {'unbounded':>10}")
+        print("-" * 28)
+        for turn in sorted({1, 2, 3, 5, 10, args.turns} & set(range(1, args.turns + 1))):
+            print(f"{turn:>6} {usage['bounded'][turn - 1]:>10,} {usage['unbounded'][turn - 1]:>10,}")
+        print(f"{'total':>6} {sum(usage['bounded']):>10,} {sum(usage['unbounded']):>10,}")
+
+        print(f"\n{args.sessions:,} sessions of {args.turns} turns each, half of them kept "
+              f"(SessionStore max_sessions={args.sessions // 2:,})\n")
+        print(f"{'history':>10} {'sessions':>10} {'memory (MiB)':>13} {'KiB/session':>12} {'time (s)':>9}")
+        print("-" * 58)
+        for label, budget in (("bounded", HISTORY_TOKENS), ("unbounded", UNBOUNDED)):
+            sessions = SessionStore(max_sessions=args.sessions // 2, history_tokens=budget)
+            tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                for i in range(args.sessions):
+                    run_session(client, sessions, f"patient-{i}", messages)
+                elapsed = time.perf_counter() - start
+                kept = len(sessions)
+                # What the sessions hold: traced memory released by dropping them
+                held = tracemalloc.get_traced_memory()[0]
+                del sessions
+                gc.collect()
+                held -= tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+            print(f"{label:>10} {kept:>10,} {held / 2**20:>13.1f} {held / 1024 / kept:>12.1f} {elapsed:>9.1f}")
+    finally:
+        set_store(original)
+        demo_claude.FAST_PATH = fast_path
+
+
+if __name__ == "__main__":
+    main()
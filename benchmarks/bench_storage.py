@@ -0,0 +1,127 @@
+"""
+Benchmark: resident memory and lookup latency of MemoryStore (dict-of-dicts
+and compact column tables) vs SQLiteStore. A lookup fetches a record and reads
+every field, as the tool formatters do; find is a find_appointments(doctor,
+status) query. Each backend runs in its own subprocess so RSS numbers don't mix.
+
+Run with: python -m benchmarks.bench_storage --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+from src.records import RecordTable
+from src.storage import (
+    APPOINTMENT_CATEGORIES, APPOINTMENT_FIELDS, LAB_RESULT_CATEGORIES, LAB_RESULT_FIELDS, MemoryStore, SQLiteStore,
+)
+
+
+LOOKUPS = 50_000
+FINDS = 20
+BACKENDS = ("memory", "compact", "sqlite")
+
+
+def rss_mb() -> float:
+    """Peak resident set size of this process (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(backend: str, rows: int, db_path: str):
+    baseline = rss_mb()
+    start = time.perf_counter()
+    if backend == "memory":
+        store = MemoryStore(
+            appointments=dict(synthetic.appointments(rows)),
+            lab_results=dict(synthetic.lab_results(rows)),
+        )
+    elif backend == "compact":
+        # Built straight from the generators: the per-row dicts never all exist at once
+        store = MemoryStore(
+            appointments=RecordTable(APPOINTMENT_FIELDS, APPOINTMENT_CATEGORIES, synthetic.appointments(rows)),
+            lab_results=RecordTable(LAB_RESULT_FIELDS, LAB_RESULT_CATEGORIES, synthetic.lab_results(rows)),
+        )
+    else:
+        store = SQLiteStore(db_path)
+    open_s = time.perf_counter() - start
+
+    rng = random.Random(7)
+    ids = [synthetic.appointment_id(rng.randrange(rows)) for _ in range(LOOKUPS // 2)]
+    ids += [synthetic.lab_id(rng.randrange(rows)) for _ in range(LOOKUPS // 2)]
+    start = time.perf_counter()
+    for record_id in ids:
+        if record_id.startswith("APT"):
+            record = store.get_appointment(record_id)
+            fields = APPOINTMENT_FIELDS
+        else:
+            record = store.get_lab_result(record_id)
+            fields = LAB_RESULT_FIELDS
+        for field in fields:
+            record[field]
+    lookup_us = (time.perf_counter() - start) / len(ids) * 1e6
+
+    start = time.perf_counter()
+    for i in range(FINDS):
+        for record_id, record in store.find_appointments(doctor=synthetic.DOCTORS[i % 3], status="cancelled"):
+            record["date"]
+    find_ms = (time.perf_counter() - start) / FINDS * 1e3
+
+    print(json.dumps({
+        "backend": backend,
+        "open_s": open_s,
+        "rss_mb": rss_mb() - baseline,
+        "lookup_us": lookup_us,
+        "find_ms": find_ms,
+    }))
+
+
+def run_worker(backend, rows, db_path):
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_storage", "--worker", backend,
+         "--rows", str(rows), "--db", db_path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="appointments and lab results each")
+    parser.add_argument("--db", help="reuse an existing benchmark database")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.rows, args.db)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "bench.db")
+        if not args.db and "sqlite" in args.backends:
+            start = time.perf_counter()
+            store = SQLiteStore(db_path)
+            store.put_appointments(synthetic.appointments(args.rows))
+            store.put_lab_results(synthetic.lab_results(args.rows))
+            print(f"Built {db_path} with {args.rows:,} appointments and lab results "
+                  f"in {time.perf_counter() - start:.1f}s "
+                  f"({os.path.getsize(db_path) / 2**20:.0f} MB on disk)\n")
+
+        print(f"{'backend':>8} {'open (s)':>10} {'RSS (MB)':>10} {'bytes/row':>10} {'lookup (us)':>12} {'find (ms)':>10}")
+        print("-" * 66)
+        for backend in args.backends:
+            result = run_worker(backend, args.rows, db_path)
+            per_row = result["rss_mb"] * 2**20 / (2 * args.rows)
+            print(f"{backend:>8} {result['open_s']:>10.2f} {result['rss_mb']:>10.1f} {per_row:>10.0f} "
+                  f"{result['lookup_us']:>12.2f} {result['find_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
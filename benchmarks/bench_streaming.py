@@ -0,0 +1,87 @@
+"""
+Benchmark: time to first visible text and total time of run_agent vs the
+streaming stream_agent, against the local stand-in client.
+
+stream_agent shows text as soon as the first delta arrives and starts each
+tool as soon as its tool_use block is complete, overlapping slow tools with
+the rest of the streamed turn.
+
+Run with: python -m benchmarks.bench_streaming --latency 0.4 --token-interval 0.02 --tool-latency 0.1
+"""
+
+import argparse
+import functools
+import time
+
+import demo_claude
+from benchmarks.fake_anthropic import FakeAnthropic
+
+
+SCRIPTS = {
+    "What are your hours?": [
+        [("check_faq", {"question": "hours"})],
+        "We're open Monday through Friday from 8AM to 6PM, and Saturday from 9AM to 1PM.",
+    ],
+    "Is APT-101 confirmed, is LAB-202 ready and what are your hours?": [
+        [
+            "Let me look up your appointment, your lab result and our hours.",
+            ("lookup_appointment", {"appointment_id": "APT-101"}),
+            ("lookup_lab_result", {"lab_id": "LAB-202"}),
+            ("check_faq", {"question": "hours"}),
+        ],
+        "APT-101 with Dr. Smith is confirmed, LAB-202 is ready for review, "
+        "and we're open Monday through Friday from 8AM to 6PM.",
+    ],
+    "I have APT-102 scheduled. What doctor will I see and are they accepting new patients?": [
+        [("lookup_appointment", {"appointment_id": "APT-102"})],
+        [("find_doctor", {"doctor_name": "Dr. Johnson"})],
+        "You'll see Dr. Johnson, a cardiologist, who is currently accepting new patients.",
+    ],
+}
+
+
+def slow(function, seconds: float):
+    @functools.wraps(function)
+    def wrapper(**arguments):
+        time.sleep(seconds)
+        return function(**arguments)
+    return wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.4, help="seconds before a simulated response starts")
+    parser.add_argument("--token-interval", type=float, default=0.02, help="seconds between streamed deltas")
+    parser.add_argument("--tool-latency", type=float, default=0.1, help="extra seconds per tool call")
+    args = parser.parse_args()
+
+    saved = demo_claude.FUNCTION_MAP, demo_claude.COMPACT_TOOL_OUTPUTS, demo_claude.FAST_PATH
+    demo_claude.FUNCTION_MAP = {name: slow(function, args.tool_latency) for name, function in saved[0].items()}
+    demo_claude.COMPACT_TOOL_OUTPUTS = demo_claude.FAST_PATH = False
+    client = FakeAnthropic(SCRIPTS, latency=args.latency, token_interval=args.token_interval)
+
+    print(f"{'query':<40} {'mode':<8} {'first text (s)':>15} {'total (s)':>10}")
+    print("-" * 76)
+    try:
+        for query in SCRIPTS:
+            start = time.perf_counter()
+            answer = demo_claude.run_agent(query, client=client, cache=None)
+            total = time.perf_counter() - start
+            print(f"{query[:40]:<40} {'blocking':<8} {total:>15.2f} {total:>10.2f}")
+
+            start = time.perf_counter()
+            first = None
+            deltas = []
+            for delta in demo_claude.stream_agent(query, client=client, cache=None):
+                if first is None:
+                    first = time.perf_counter() - start
+                deltas.append(delta)
+            total = time.perf_counter() - start
+            assert "".join(deltas).endswith(answer), "streamed text must end with the final answer"
+            print(f"{'':<40} {'stream':<8} {first:>15.2f} {total:>10.2f}")
+    finally:
+        demo_claude.FUNCTION_MAP, demo_claude.COMPACT_TOOL_OUTPUTS, demo_claude.FAST_PATH = saved
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Microbenchmark: MCP call_tool throughput with result memoization (call_tool)
+and without it (run_tool), for hits and "not found" answers.
+
+Run with: python -m benchmarks.bench_tool_cache [--sqlite]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from src.data import FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS
+from src.mcp_server import call_tool, run_tool, tool_cache_stats
+from src.storage import SQLiteStore, set_store
+
+
+CALLS = 20_000
+
+CASES = [
+    ("check_faq", {"question": "What are your hours?"}),
+    ("check_faq", {"question": "do you validate parking tickets downtown"}),
+    ("lookup_appointment", {"appointment_id": "APT-101"}),
+    ("lookup_appointment", {"appointment_id": "APT-999"}),
+    ("lookup_lab_result", {"lab_id": "LAB-202"}),
+    ("find_doctor", {"doctor_name": "Dr. Smith"}),
+    ("find_doctor", {"doctor_name": "Dr. Who"}),
+    ("find_appointments", {"doctor": "Dr. Smith"}),
+    ("lookup_appointments", {"appointment_ids": ["APT-101", "APT-102", "APT-999"]}),
+]
+
+
+async def calls_per_second(handler, name, arguments):
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await handler(name, arguments)
+    return CALLS / (time.perf_counter() - start)
+
+
+async def run():
+    print(f"{'tool':<20} {'arguments':<46} {'uncached/s':>11} {'cached/s':>11} {'speedup':>8}")
+    print("-" * 100)
+    for name, arguments in CASES:
+        uncached = await calls_per_second(run_tool, name, arguments)
+        cached = await calls_per_second(call_tool, name, arguments)
+        label = str(arguments)[:46]
+        print(f"{name:<20} {label:<46} {uncached:>11,.0f} {cached:>11,.0f} {cached / uncached:>8.1f}")
+
+    print()
+    for name, stats in tool_cache_stats().items():
+        print(f"{name:<20} hits={stats['hits']:<8} misses={stats['misses']:<4} evictions={stats['evictions']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sqlite", action="store_true", help="serve from a SQLite store instead of the dicts")
+    args = parser.parse_args()
+
+    if not args.sqlite:
+        asyncio.run(run())
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        set_store(SQLiteStore.create(os.path.join(tmp, "clinic.db"), FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS))
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
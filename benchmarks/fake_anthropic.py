@@ -0,0 +1,265 @@
+"""
+Local stand-in for the Anthropic client, used by the benchmarks.
+Replays scripted tool_use turns with artificial latency so agent-loop numbers
+are deterministic and don't cost API credits.
+
+A script is a list of turns. Each turn is either a list of (tool_name, input)
+pairs, answered with stop_reason "tool_use", or a final text string. A tool
+turn may also contain plain strings, sent as text blocks ("Let me check.").
+
+`create(stream=True)` yields raw stream events (message_start,
+content_block_start/delta/stop, message_delta, message_stop): the first one
+after the call's latency, then one delta every `token_interval` seconds.
+Non-streaming calls wait for the whole message.
+
+Prompt caching is modelled too: a prefix ending at a `cache_control` block is
+stored, and later requests that start with a stored prefix report it as
+cache_read_input_tokens. With `prefill_per_token` set, each call also sleeps
+in proportion to its uncached input (cached tokens cost a tenth), a stand-in
+for time-to-first-token.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+
+def text_block(text: str):
+    return SimpleNamespace(type="text", text=text)
+
+
+def tool_use_block(block_id: str, name: str, tool_input: dict):
+    return SimpleNamespace(type="tool_use", id=block_id, name=name, input=tool_input)
+
+
+def _jsonable(value):
+    if isinstance(value, SimpleNamespace):
+        return vars(value)
+    return str(value)
+
+
+def estimate_tokens(value) -> int:
+    """Rough token count (~4 characters per token) of a request payload"""
+    return len(json.dumps(value, default=_jsonable)) // 4
+
+
+def _prompt_blocks(request: dict):
+    """Tools, the system prompt, then every message content block, in the order the API caches them"""
+    for tool in request.get("tools") or ():
+        yield tool
+    if request.get("system"):
+        yield {"type": "text", "text": request["system"]}
+    for message in request["messages"]:
+        content = message["content"]
+        if isinstance(content, str):
+            yield {"type": "text", "text": content}
+        else:
+            yield from content
+
+
+def _block_dict(block) -> dict:
+    return dict(block) if isinstance(block, dict) else dict(vars(block))
+
+
+def _event(event_type: str, **fields):
+    return SimpleNamespace(type=event_type, **fields)
+
+
+def stream_events(response, chunk_chars: int = 16) -> list:
+    """The raw stream events that would produce `response`"""
+    events = [_event("message_start", message=SimpleNamespace(
+        usage=SimpleNamespace(**{**vars(response.usage), "output_tokens": 1})
+    ))]
+    for index, block in enumerate(response.content):
+        if block.type == "text":
+            events.append(_event("content_block_start", index=index, content_block=text_block("")))
+            words = block.text.split(" ")
+            events += [
+                _event("content_block_delta", index=index, delta=SimpleNamespace(
+                    type="text_delta", text=word if i == 0 else " " + word
+                ))
+                for i, word in enumerate(words)
+            ]
+        else:
+            events.append(_event("content_block_start", index=index,
+                                 content_block=tool_use_block(block.id, block.name, {})))
+            payload = json.dumps(block.input)
+            events += [
+                _event("content_block_delta", index=index, delta=SimpleNamespace(
+                    type="input_json_delta", partial_json=payload[start:start + chunk_chars]
+                ))
+                for start in range(0, len(payload), chunk_chars)
+            ]
+        events.append(_event("content_block_stop", index=index))
+    events.append(_event("message_delta", delta=SimpleNamespace(stop_reason=response.stop_reason),
+                         usage=SimpleNamespace(output_tokens=response.usage.output_tokens)))
+    events.append(_event("message_stop"))
+    return events
+
+
+def _is_delta(event) -> bool:
+    return event.type == "content_block_delta"
+
+
+class FakeMessages:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, stream: bool = False, **kwargs):
+        response = self._owner.respond(kwargs)
+        events = stream_events(response)
+        if stream:
+            return self._stream(response, events)
+        time.sleep(self._owner.delay(response.usage) + self._owner.token_interval * sum(map(_is_delta, events)))
+        return response
+
+    def _stream(self, response, events):
+        time.sleep(self._owner.delay(response.usage))
+        for event in events:
+            if _is_delta(event):
+                time.sleep(self._owner.token_interval)
+            yield event
+
+
+class AsyncFakeMessages:
+    def __init__(self, owner):
+        self._owner = owner
+
+    async def create(self, stream: bool = False, **kwargs):
+        response = self._owner.respond(kwargs)
+        events = stream_events(response)
+        if stream:
+            return self._stream(response, events)
+        await asyncio.sleep(
+            self._owner.delay(response.usage) + self._owner.token_interval * sum(map(_is_delta, events))
+        )
+        return response
+
+    async def _stream(self, response, events):
+        await asyncio.sleep(self._owner.delay(response.usage))
+        for event in events:
+            if _is_delta(event):
+                await asyncio.sleep(self._owner.token_interval)
+            yield event
+
+
+class FakeAnthropic:
+    """
+    Drop-in for `Anthropic()` in run_agent.
+    `scripts` maps a user message to its turns; `default` is used for
+    queries without a script. In a multi-turn conversation the script is the
+    newest user message's, and its turns count from there. Counters are
+    updated on every call.
+    """
+
+    def __init__(self, scripts: dict, latency: float = 0.0, default=None, prefill_per_token: float = 0.0,
+                 token_interval: float = 0.0):
+        self.scripts = scripts
+        self.default = default or ["I'm not sure. Please call 555-1234."]
+        self.latency = latency
+        self.prefill_per_token = prefill_per_token
+        self.token_interval = token_interval
+        self.messages = FakeMessages(self)
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_input_tokens = 0
+        self.cache_creation_input_tokens = 0
+        self._prompt_cache = set()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.calls = self.input_tokens = self.output_tokens = 0
+        self.cache_read_input_tokens = self.cache_creation_input_tokens = 0
+        self._prompt_cache.clear()
+
+    def delay(self, usage) -> float:
+        """Seconds a call takes: fixed latency plus prefill of the uncached input"""
+        uncached = usage.input_tokens + usage.cache_creation_input_tokens
+        return self.latency + self.prefill_per_token * (uncached + usage.cache_read_input_tokens / 10)
+
+    def prompt_usage(self, request: dict) -> tuple:
+        """(uncached, cache read, cache write) input tokens for a request"""
+        digest = hashlib.sha256()
+        total = 0
+        boundaries = []   # (digest, tokens so far) after every block
+        breakpoints = []
+        for block in _prompt_blocks(request):
+            block = _block_dict(block)
+            marked = block.pop("cache_control", None) is not None
+            digest.update(json.dumps(block, sort_keys=True, default=_jsonable).encode())
+            total += estimate_tokens(block)
+            boundaries.append((digest.hexdigest(), total))
+            if marked:
+                breakpoints.append(boundaries[-1])
+        if not breakpoints:
+            return total, 0, 0
+
+        # Longest stored prefix at or before the last breakpoint
+        last_key, last_tokens = breakpoints[-1]
+        read = 0
+        with self._lock:
+            for key, tokens in boundaries:
+                if tokens > last_tokens:
+                    break
+                if key in self._prompt_cache:
+                    read = tokens
+            self._prompt_cache.update(key for key, _ in breakpoints)
+        write = last_tokens - read
+        return total - read - write, read, write
+
+    @staticmethod
+    def _query(message: dict):
+        """The user's text, or None for a message of tool results"""
+        if message["role"] != "user":
+            return None
+        content = message["content"]
+        if isinstance(content, str):
+            return content
+        first = _block_dict(content[0])
+        return first["text"] if first.get("type") == "text" else None
+
+    def respond(self, request: dict):
+        messages = request["messages"]
+        start = max(i for i, message in enumerate(messages) if self._query(message) is not None)
+        script = self.scripts.get(self._query(messages[start]), self.default)
+        turn_index = sum(1 for message in messages[start:] if message["role"] == "assistant")
+        turn = script[min(turn_index, len(script) - 1)]
+
+        if isinstance(turn, str):
+            content = [text_block(turn)]
+            stop_reason = "end_turn"
+        else:
+            content = [
+                text_block(item) if isinstance(item, str)
+                else tool_use_block(f"toolu_{turn_index}_{i}", item[0], item[1])
+                for i, item in enumerate(turn)
+            ]
+            stop_reason = "tool_use"
+
+        uncached, read, write = self.prompt_usage(request)
+        usage = SimpleNamespace(
+            input_tokens=uncached,
+            output_tokens=estimate_tokens(content),
+            cache_read_input_tokens=read,
+            cache_creation_input_tokens=write,
+        )
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += usage.input_tokens
+            self.output_tokens += usage.output_tokens
+            self.cache_read_input_tokens += read
+            self.cache_creation_input_tokens += write
+        return SimpleNamespace(content=content, stop_reason=stop_reason, usage=usage)
+
+
+class AsyncFakeAnthropic(FakeAnthropic):
+    """Drop-in for `AsyncAnthropic()` in run_agent_async"""
+
+    def __init__(self, scripts: dict, latency: float = 0.0, default=None, prefill_per_token: float = 0.0,
+                 token_interval: float = 0.0):
+        super().__init__(scripts, latency, default, prefill_per_token, token_interval)
+        self.messages = AsyncFakeMessages(self)
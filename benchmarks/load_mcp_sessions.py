@@ -0,0 +1,153 @@
+"""
+Load test: MCP agent sessions per second and memory per session, comparing
+one stdio server process per session against one shared HTTP server.
+
+Each session initializes, makes a few tool calls and disconnects. The "hold"
+phase keeps --concurrency sessions open at once to measure memory per session.
+
+Run with: python -m benchmarks.load_mcp_sessions --sessions 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmarks.procstats import child_pids, rss_mb
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CALLS = [
+    ("check_faq", {"question": "What are your hours?"}),
+    ("lookup_appointment", {"appointment_id": "APT-101"}),
+    ("lookup_lab_result", {"lab_id": "LAB-202"}),
+    ("find_doctor", {"doctor_name": "Dr. Smith"}),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return
+        time.sleep(0.05)
+    raise RuntimeError(f"MCP server did not start listening on port {port}")
+
+
+async def run_session(open_transport, calls: int, ready: list = None, release: asyncio.Event = None):
+    async with open_transport() as streams:
+        read_stream, write_stream = streams[0], streams[1]
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            for name, arguments in itertools.islice(itertools.cycle(CALLS), calls):
+                await session.call_tool(name, arguments)
+            if release is not None:
+                ready.append(1)
+                await release.wait()
+
+
+async def hold_phase(open_transport, concurrency: int, calls: int, measure_rss) -> float:
+    """Open `concurrency` sessions at once and return the memory they add, per session"""
+    baseline = measure_rss()
+    ready = []
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(run_session(open_transport, calls, ready, release)) for _ in range(concurrency)]
+    while len(ready) < concurrency:
+        if any(task.done() and task.exception() for task in tasks):
+            break
+        await asyncio.sleep(0.05)
+    peak = measure_rss()
+    release.set()
+    await asyncio.gather(*tasks)
+    return (peak - baseline) / concurrency
+
+
+async def churn_phase(open_transport, sessions: int, concurrency: int, calls: int) -> float:
+    """Run `sessions` short sessions, `concurrency` at a time; return sessions per second"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await run_session(open_transport, calls)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(sessions)))
+    return sessions / (time.perf_counter() - start)
+
+
+async def benchmark_stdio(args):
+    params = StdioServerParameters(command=sys.executable, args=["-m", "src.mcp_server"], cwd=ROOT)
+
+    def open_transport():
+        return stdio_client(params)
+
+    def measure_rss():
+        return sum(rss_mb(pid) for pid in child_pids())
+
+    per_session = await hold_phase(open_transport, args.concurrency, args.calls, measure_rss)
+    rate = await churn_phase(open_transport, args.sessions, args.concurrency, args.calls)
+    return rate, per_session
+
+
+async def benchmark_http(args):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp_server", "--transport", "http", "--port", str(port)],
+        cwd=ROOT
+    )
+    try:
+        wait_for_port(port)
+        url = f"http://127.0.0.1:{port}/mcp"
+
+        def open_transport():
+            return streamablehttp_client(url)
+
+        def measure_rss():
+            return rss_mb(server.pid)
+
+        per_session = await hold_phase(open_transport, args.concurrency, args.calls, measure_rss)
+        rate = await churn_phase(open_transport, args.sessions, args.concurrency, args.calls)
+        return rate, per_session
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def run(args):
+    print(f"{args.sessions} sessions, {args.concurrency} concurrent, {args.calls} tool calls each\n")
+    print(f"{'transport':<10} {'sessions/s':>11} {'MB/session':>11}")
+    print("-" * 34)
+    for label, benchmark in (("stdio", benchmark_stdio), ("http", benchmark_http)):
+        if label not in args.transports:
+            continue
+        rate, per_session = await benchmark(args)
+        print(f"{label:<10} {rate:>11.1f} {per_session:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=4, help="tool calls per session")
+    parser.add_argument("--transports", nargs="+", default=["stdio", "http"], choices=["stdio", "http"])
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
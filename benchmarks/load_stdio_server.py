@@ -0,0 +1,218 @@
+"""
+Load generator: JSON-RPC call_tool requests pipelined over one stdio session
+to a single src/mcp_server.py process.
+
+Closed loop (--concurrency N keeps N requests in flight) or open loop
+(--rate R starts R requests per second regardless of how fast answers come
+back; latency is measured from the scheduled start, so a stalled server
+shows up as queueing instead of silently lowering the offered load).
+Reports throughput, latency percentiles and the server's RSS over time.
+
+Run with: python -m benchmarks.load_stdio_server --duration 20 --concurrency 32
+          python -m benchmarks.load_stdio_server --duration 20 --rate 2000
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from benchmarks.procstats import child_pids, percentile, rss_mb
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Argument pools per tool; unknown keys exercise the "not found" paths
+ARGUMENTS = {
+    "check_faq": [{"question": q} for q in ("What are your hours?", "insurance", "Where are you located?", "parking")],
+    "lookup_appointment": [{"appointment_id": f"APT-{n}"} for n in (101, 102, 103, 104, 999)],
+    "lookup_lab_result": [{"lab_id": f"LAB-{n}"} for n in (201, 202, 203, 999)],
+    "find_doctor": [{"doctor_name": name} for name in ("Dr. Smith", "Dr. Johnson", "Dr. Lee", "Dr. Who")],
+}
+
+DEFAULT_MIX = "check_faq=4,lookup_appointment=3,lookup_lab_result=2,find_doctor=1"
+
+
+def parse_mix(mix: str) -> tuple:
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ARGUMENTS:
+            raise SystemExit(f"Unknown tool in --mix: {name} (choose from {', '.join(ARGUMENTS)})")
+        names.append(name)
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = {}  # tool -> [seconds]
+        self.errors = 0
+        self._completed = 0
+
+    def record(self, tool: str, seconds: float, error: bool):
+        self.latencies.setdefault(tool, []).append(seconds)
+        self.errors += error
+        self._completed += 1
+
+    def take_interval(self) -> int:
+        completed, self._completed = self._completed, 0
+        return completed
+
+
+def request_stream(args):
+    """Endless (tool, arguments) sequence following the --mix weights"""
+    names, weights = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    counter = itertools.count()
+    while True:
+        name = rng.choices(names, weights)[0]
+        arguments = dict(rng.choice(ARGUMENTS[name]))
+        if args.uncached:
+            # A unique suffix defeats the server's per-tool memoization
+            key = next(iter(arguments))
+            arguments[key] = f"{arguments[key]} {next(counter)}"
+        yield name, arguments
+
+
+async def timed_call(session, stats: LoadStats, name: str, arguments: dict, started: float):
+    try:
+        result = await session.call_tool(name, arguments)
+        error = bool(getattr(result, "isError", False))
+    except Exception:
+        error = True
+    stats.record(name, time.perf_counter() - started, error)
+
+
+async def closed_loop(session, stats, requests, args, deadline):
+    async def worker():
+        while time.perf_counter() < deadline:
+            name, arguments = next(requests)
+            await timed_call(session, stats, name, arguments, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+
+async def open_loop(session, stats, requests, args, deadline):
+    interval = 1.0 / args.rate
+    start = time.perf_counter()
+    in_flight = set()
+    for n in itertools.count():
+        scheduled = start + n * interval
+        if scheduled >= deadline:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name, arguments = next(requests)
+        task = asyncio.create_task(timed_call(session, stats, name, arguments, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    await asyncio.gather(*in_flight)
+
+
+async def sample_rss(stats: LoadStats, pid: int, interval: float, samples: list, stop: asyncio.Event):
+    start = time.perf_counter()
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        samples.append((time.perf_counter() - start, rss_mb(pid), stats.take_interval() / interval))
+
+
+async def run(args) -> dict:
+    params = StdioServerParameters(command=sys.executable, args=["-m", "src.mcp_server"], cwd=ROOT)
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            server_pid = child_pids()[0]
+
+            stats = LoadStats()
+            requests = request_stream(args)
+            for _ in range(args.warmup):
+                name, arguments = next(requests)
+                await session.call_tool(name, arguments)
+
+            samples = []
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(sample_rss(stats, server_pid, args.sample_interval, samples, stop))
+            start = time.perf_counter()
+            deadline = start + args.duration
+            if args.rate:
+                await open_loop(session, stats, requests, args, deadline)
+            else:
+                await closed_loop(session, stats, requests, args, deadline)
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await sampler
+
+    every = sorted(latency for latencies in stats.latencies.values() for latency in latencies)
+    return {
+        "mode": f"rate={args.rate}/s" if args.rate else f"concurrency={args.concurrency}",
+        "requests": len(every),
+        "errors": stats.errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(every) / elapsed,
+        "latency_ms": latency_summary(every),
+        "per_tool_latency_ms": {
+            tool: latency_summary(sorted(latencies)) for tool, latencies in sorted(stats.latencies.items())
+        },
+        "rss_mb": [{"t": round(t, 2), "rss_mb": round(rss, 1), "rps": round(rps, 1)} for t, rss, rps in samples],
+    }
+
+
+def latency_summary(sorted_latencies: list) -> dict:
+    return {
+        "p50": percentile(sorted_latencies, 0.50) * 1e3,
+        "p90": percentile(sorted_latencies, 0.90) * 1e3,
+        "p99": percentile(sorted_latencies, 0.99) * 1e3,
+        "max": (sorted_latencies[-1] if sorted_latencies else 0.0) * 1e3,
+    }
+
+
+def print_report(report: dict):
+    latency = report["latency_ms"]
+    print(f"{report['mode']}: {report['requests']} requests in {report['elapsed_s']:.1f}s, "
+          f"{report['errors']} errors")
+    print(f"throughput {report['throughput_rps']:,.0f} req/s, latency p50 {latency['p50']:.2f} ms, "
+          f"p90 {latency['p90']:.2f} ms, p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms\n")
+    print(f"{'tool':<20} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    print("-" * 56)
+    for tool, row in report["per_tool_latency_ms"].items():
+        print(f"{tool:<20} {row['p50']:>8.2f} {row['p90']:>8.2f} {row['p99']:>8.2f} {row['max']:>8.2f}")
+    print(f"\n{'t (s)':>7} {'server RSS MB':>14} {'req/s':>9}")
+    for sample in report["rss_mb"]:
+        print(f"{sample['t']:>7.1f} {sample['rss_mb']:>14.1f} {sample['rps']:>9,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=32, help="requests kept in flight (closed loop)")
+    load.add_argument("--rate", type=float, help="requests started per second (open loop)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"tool=weight list (default {DEFAULT_MIX})")
+    parser.add_argument("--uncached", action="store_true", help="make every request unique to bypass memoization (lookups then miss)")
+    parser.add_argument("--warmup", type=int, default=200, help="requests sent before measuring")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="seconds between RSS samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Process and latency statistics helpers for the load tests (Linux /proc).
+"""
+
+import os
+
+
+def rss_mb(pid: int) -> float:
+    """Current resident set size of a process, 0 if it has exited"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return 0.0
+
+
+def child_pids(pid: int = None) -> list[int]:
+    """Direct children of a process (defaults to this one)"""
+    pid = pid or os.getpid()
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # Field 4 is the parent pid; the command name (field 2) may contain spaces
+                fields = stat.read().rsplit(")", 1)[1].split()
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def percentile(sorted_samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
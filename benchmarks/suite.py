@@ -0,0 +1,271 @@
+"""
+Offline benchmark suite: the registry tools (FUNCTION_MAP), the MCP call_tool
+handler and the run_agent loop against the scripted local client, with no
+network and no API credits.
+
+Reports ops/s and peak allocation per op for every case, and for run_agent
+the time split into LLM, tool and loop overhead (from the tracing spans).
+Results can be saved as JSON and compared against an earlier run; the
+process exits non-zero when any case got slower than --tolerance allows.
+
+Run with: python -m benchmarks.suite --json results.json [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fake_anthropic import FakeAnthropic
+import demo_claude
+from demo_claude import FUNCTION_MAP, run_agent
+from src.mcp_server import call_tool, run_tool
+from src.router import route
+from src.tracing import Tracer, load_traces, summarize
+
+
+TOOL_CASES = [
+    ("check_faq", {"question": "What are your hours?"}),
+    ("check_faq", {"question": "do you validate parking tickets downtown"}),
+    ("check_faq", {"question": "do you take Aetna?"}),
+    ("search_faq", {"question": "when do you open on weekends?"}),
+    ("lookup_appointment", {"appointment_id": "APT-101"}),
+    ("lookup_lab_result", {"lab_id": "LAB-202"}),
+    ("find_doctor", {"doctor_name": "Dr. Smith"}),
+    ("find_doctor", {"doctor_name": "Dr. Who"}),
+    ("find_appointments", {"doctor": "Dr. Smith"}),
+    ("find_appointments_by_date", {"start_date": "2025-12-01", "end_date": "2025-12-14"}),
+    ("lookup_appointments", {"appointment_ids": ["APT-101", "APT-102", "APT-999"]}),
+]
+
+# Fast-path router decisions: routed, and falling through to the LLM
+ROUTER_CASES = [
+    "What are your hours?",
+    "Is APT-101 confirmed?",
+    "Is APT-101 confirmed and what are your hours?",
+]
+
+# Deterministic tool_use sequences replayed by the fake client
+AGENT_SCRIPTS = {
+    "What are your hours?": [
+        [("check_faq", {"question": "hours"})],
+        "We're open Monday-Friday 8AM-6PM.",
+    ],
+    "Is APT-101 confirmed and what are your hours?": [
+        [("lookup_appointment", {"appointment_id": "APT-101"}), ("check_faq", {"question": "hours"})],
+        "APT-101 is confirmed; we're open Monday-Friday 8AM-6PM.",
+    ],
+    "I have APT-102 scheduled. What doctor will I see and are they accepting new patients?": [
+        [("lookup_appointment", {"appointment_id": "APT-102"})],
+        [("find_doctor", {"doctor_name": "Dr. Johnson"})],
+        "You'll see Dr. Johnson, who is accepting new patients.",
+    ],
+    "Hello!": ["Hi! How can I help you today?"],
+}
+
+
+def ops_per_second(operation, min_time: float) -> float:
+    """Repeat `operation` in growing batches until a batch takes at least min_time"""
+    operation()
+    batch = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(batch):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return batch / elapsed
+        batch *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+
+def peak_allocation_kb(operation, repeat: int = 20) -> float:
+    """Largest tracemalloc peak above the starting point over `repeat` runs"""
+    operation()
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            operation()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        return peak / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def case_label(name: str, arguments: dict) -> str:
+    return f"{name}({', '.join(f'{key}={value!r}' for key, value in arguments.items())})"
+
+
+def bench_tools(args) -> dict:
+    results = {}
+    for name, arguments in TOOL_CASES:
+        function = FUNCTION_MAP[name]
+
+        def operation():
+            function(**arguments)
+
+        results[f"tool/{case_label(name, arguments)}"] = {
+            "ops_per_sec": ops_per_second(operation, args.min_time),
+            "alloc_peak_kb": peak_allocation_kb(operation),
+        }
+    for query in ROUTER_CASES:
+        def operation():
+            route(query)
+
+        results[f"router/{query}"] = {
+            "ops_per_sec": ops_per_second(operation, args.min_time),
+            "alloc_peak_kb": peak_allocation_kb(operation),
+        }
+    return results
+
+
+# call_tool invocations per event-loop round trip, so loop overhead doesn't dominate
+CALL_TOOL_BATCH = 100
+
+
+async def _call_repeatedly(handler, name: str, arguments: dict, count: int):
+    for _ in range(count):
+        await handler(name, arguments)
+
+
+def bench_call_tool(args) -> dict:
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for label, handler in (("call_tool", call_tool), ("call_tool_uncached", run_tool)):
+            for name, arguments in TOOL_CASES:
+                def batch():
+                    loop.run_until_complete(_call_repeatedly(handler, name, arguments, CALL_TOOL_BATCH))
+
+                def single():
+                    loop.run_until_complete(handler(name, arguments))
+
+                results[f"{label}/{case_label(name, arguments)}"] = {
+                    "ops_per_sec": ops_per_second(batch, args.min_time) * CALL_TOOL_BATCH,
+                    "alloc_peak_kb": peak_allocation_kb(single),
+                }
+    finally:
+        loop.close()
+    return results
+
+
+def bench_agent(args) -> dict:
+    client = FakeAnthropic(AGENT_SCRIPTS, latency=args.latency)
+    results = {}
+    # Measure the model loop itself, not the router answering simple queries
+    saved = demo_claude.FAST_PATH
+    demo_claude.FAST_PATH = False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for query in AGENT_SCRIPTS:
+                def operation():
+                    run_agent(query, client=client, cache=None)
+
+                entry = {
+                    "ops_per_sec": ops_per_second(operation, args.min_time),
+                    "alloc_peak_kb": peak_allocation_kb(operation, repeat=5),
+                }
+
+                # Stage split from a traced run of the same query
+                path = os.path.join(tmp, f"{len(results)}.jsonl")
+                tracer = Tracer(path)
+                for _ in range(args.traced_runs):
+                    run_agent(query, client=client, cache=None, tracer=tracer)
+                stages = summarize(load_traces(path), by="query")[query]
+                entry.update({
+                    "llm_calls": stages["llm_calls_mean"],
+                    "wall_ms": stages["wall_mean_ms"],
+                    "llm_ms": stages["llm_mean_ms"],
+                    "tools_ms": stages["tools_mean_ms"],
+                    "overhead_ms": stages["overhead_mean_ms"],
+                })
+                results[f"run_agent/{query}"] = entry
+    finally:
+        demo_claude.FAST_PATH = saved
+    return results
+
+
+def environment() -> dict:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Cases whose ops/s fell by more than `tolerance` relative to the baseline"""
+    regressions = []
+    for name, entry in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = entry["ops_per_sec"] / before["ops_per_sec"] - 1
+        if change < -tolerance:
+            regressions.append((name, before["ops_per_sec"], entry["ops_per_sec"], change))
+    return regressions
+
+
+def print_results(results: dict):
+    print(f"{'case':<72} {'ops/s':>11} {'peak KB':>8} {'llm ms':>7} {'tool ms':>7} {'other ms':>8}")
+    print("-" * 118)
+    for name, entry in results.items():
+        stages = ""
+        if "overhead_ms" in entry:
+            stages = f" {entry['llm_ms']:>7.2f} {entry['tools_ms']:>7.2f} {entry['overhead_ms']:>8.2f}"
+        print(f"{name[:72]:<72} {entry['ops_per_sec']:>11,.0f} {entry['alloc_peak_kb']:>8.1f}{stages}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", nargs="+", default=["tools", "call_tool", "agent"],
+                        choices=["tools", "call_tool", "agent"])
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds per simulated LLM call (0 isolates our own overhead)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds of timing per case")
+    parser.add_argument("--traced-runs", type=int, default=20, help="traced run_agent calls per query")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed ops/s drop against the baseline before failing")
+    args = parser.parse_args()
+
+    results = {}
+    for group, bench in (("tools", bench_tools), ("call_tool", bench_call_tool), ("agent", bench_agent)):
+        if group in args.groups:
+            results.update(bench(args))
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "latency": args.latency, "results": results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%} against {args.compare}")
+        for name, before, after, change in regressions:
+            print(f"  {name}: {before:,.0f} -> {after:,.0f} ops/s ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
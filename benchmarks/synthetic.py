@@ -0,0 +1,95 @@
+"""
+Deterministic synthetic clinic data for benchmarks.
+Rows have the same shape as the records in src/data.py.
+"""
+
+import random
+
+
+PATIENT_FIRST = ["John", "Jane", "Bob", "Alice", "Charlie", "Maria", "Wei", "Priya", "Omar", "Sofia"]
+PATIENT_LAST = ["Doe", "Wilson", "Brown", "Davis", "Garcia", "Chen", "Patel", "Khan", "Rossi", "Novak"]
+DOCTORS = ["Dr. Smith", "Dr. Johnson", "Dr. Lee"]
+APPOINTMENT_STATUSES = ["confirmed", "pending confirmation", "cancelled"]
+REASONS = ["Annual checkup", "Follow-up consultation", "Flu symptoms", "Annual physical", "Blood pressure check"]
+TIMES = ["9:00 AM", "10:00 AM", "11:00 AM", "2:00 PM", "3:00 PM"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+TEST_TYPES = ["Complete Blood Panel", "Chest X-Ray", "COVID-19 PCR Test", "Abdominal Ultrasound", "Lipid Panel"]
+LAB_STATUSES = ["ready", "processing"]
+DOCTOR_FIRST = ["Sarah", "Michael", "Emily", "David", "Laura", "James", "Anita", "Carlos", "Mei", "Tom",
+                "Hannah", "Ravi", "Olga", "Peter", "Fatima", "Lucas"]
+SPECIALTIES = ["Family Medicine", "Cardiology", "Pediatrics", "Dermatology", "Neurology", "Orthopedics"]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+LANGUAGES = ["English", "Spanish", "Chinese", "French", "Hindi", "Arabic"]
+SUMMARIES = ["All values within normal range", "Abnormal findings - doctor will contact you",
+             "Results expected within 24 hours", "No abnormalities detected"]
+
+
+def appointment_id(i: int) -> str:
+    return f"APT-{1000 + i}"
+
+
+def lab_id(i: int) -> str:
+    return f"LAB-{1000 + i}"
+
+
+def _date(rng) -> str:
+    return f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.choice([2024, 2025, 2026])}"
+
+
+def _patient(rng) -> str:
+    return f"{rng.choice(PATIENT_FIRST)} {rng.choice(PATIENT_LAST)} {rng.randint(1, 50_000)}"
+
+
+def appointments(count: int, seed: int = 1):
+    """Yield (appointment_id, record) pairs without materializing the whole set"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield appointment_id(i), {
+            "patient": _patient(rng),
+            "doctor": rng.choice(DOCTORS),
+            "date": _date(rng),
+            "time": rng.choice(TIMES),
+            "status": rng.choice(APPOINTMENT_STATUSES),
+            "reason": rng.choice(REASONS),
+        }
+
+
+def lab_results(count: int, seed: int = 2):
+    """Yield (lab_id, record) pairs without materializing the whole set"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield lab_id(i), {
+            "patient": _patient(rng),
+            "test_type": rng.choice(TEST_TYPES),
+            "ordered_date": _date(rng),
+            "status": rng.choice(LAB_STATUSES),
+            "urgent": rng.random() < 0.05,
+            "result_summary": rng.choice(SUMMARIES),
+        }
+
+
+def surname(rng) -> str:
+    """Pronounceable made-up last name ('Kovaren'), so large directories stay mostly unique"""
+    syllables = "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 3)))
+    return (syllables + rng.choice(["n", "r", "s", "", "ll", "tt"])).title()
+
+
+def doctors(count: int, seed: int = 3):
+    """Yield (directory key, record) pairs; keys are "Dr. First Last" and unique"""
+    rng = random.Random(seed)
+    seen = set()
+    while len(seen) < count:
+        first, last = rng.choice(DOCTOR_FIRST), surname(rng)
+        key = f"Dr. {first} {last}"
+        if key in seen:
+            continue
+        seen.add(key)
+        yield key, {
+            "full_name": key,
+            "specialty": rng.choice(SPECIALTIES),
+            "available_days": sorted(rng.sample(WEEKDAYS, 3), key=WEEKDAYS.index),
+            "accepting_new_patients": rng.random() < 0.5,
+            "languages": ["English"] + rng.sample(LANGUAGES[1:], rng.randint(0, 2)),
+            "years_experience": rng.randint(1, 35),
+        }
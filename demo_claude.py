@@ -3,204 +3,667 @@ Healthcare assistant using Claude (Anthropic) API with MCP-style tool calling.
 Demonstrates handling multiple tool calls in a single conversation turn.
 """
 
+import asyncio
+import collections
+import itertools
+import json
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from types import SimpleNamespace
 from dotenv import load_dotenv
-from anthropic import Anthropic
-from src.data import FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS
+from anthropic import Anthropic, AsyncAnthropic
+from src import router
+from src.cache import DiskCache, LRUCache, ResponseCache
+from src.sessions import TURN_TOKENS, SessionStore, block_dict, elide_tool_results
+from src.storage import get_store
+from src.tools import ANTHROPIC_TOOLS, REGISTRY
+from src.tracing import NULL_SPAN, NULL_TRACER, Tracer, response_attributes
 
 
 # Load API key
 load_dotenv()
 client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+async_client = AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+MODEL = "claude-sonnet-4-20250514"
 
+# Final-answer cache: in-memory LRU, plus an on-disk tier when RESPONSE_CACHE_PATH is set.
+# Keys include the store's data version, so any data change invalidates old answers.
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", 300))
+response_cache = ResponseCache(
+    LRUCache(max_entries=int(os.environ.get("RESPONSE_CACHE_SIZE", 1024)), ttl=RESPONSE_CACHE_TTL),
+    DiskCache(os.environ["RESPONSE_CACHE_PATH"], ttl=RESPONSE_CACHE_TTL)
+    if os.environ.get("RESPONSE_CACHE_PATH") else None
+)
 
-# Define tools
-def check_faq(question: str) -> str:
-    """Search frequently asked questions"""
-    question = question.lower().strip()
-    for key, answer in FAQ_DATA.items():
-        if question in key or key in question:
-            return f"FAQ Answer: {answer}"
-    return "I couldn't find an answer to that question. Please call 555-1234."
-
-
-def lookup_appointment(appointment_id: str) -> str:
-    """Look up appointment details"""
-    apt_id = appointment_id.upper()
-    if apt_id in APPOINTMENTS:
-        apt = APPOINTMENTS[apt_id]
-        return (
-            f"Appointment {apt_id}:\n"
-            f"Patient: {apt['patient']}\n"
-            f"Doctor: {apt['doctor']}\n"
-            f"Date: {apt['date']}\n"
-            f"Time: {apt['time']}\n"
-            f"Status: {apt['status']}\n"
-            f"Reason: {apt['reason']}"
-        )
-    return f"Appointment {apt_id} not found."
-
-
-def lookup_lab_result(lab_id: str) -> str:
-    """Look up lab results"""
-    lab_id = lab_id.upper()
-    if lab_id in LAB_RESULTS:
-        lab = LAB_RESULTS[lab_id]
-        urgency = "🚨 URGENT" if lab["urgent"] else "Normal priority"
-        return (
-            f"Lab Result {lab_id}:\n"
-            f"Patient: {lab['patient']}\n"
-            f"Test: {lab['test_type']}\n"
-            f"Status: {lab['status']}\n"
-            f"Priority: {urgency}\n"
-            f"Summary: {lab['result_summary']}"
-        )
-    return f"Lab result {lab_id} not found."
-
-
-def find_doctor(doctor_name: str) -> str:
-    """Get doctor information"""
-    if doctor_name in DOCTORS:
-        doc = DOCTORS[doctor_name]
-        accepting = "Yes ✓" if doc["accepting_new_patients"] else "No (full schedule)"
-        return (
-            f"{doc['full_name']}:\n"
-            f"Specialty: {doc['specialty']}\n"
-            f"Available: {', '.join(doc['available_days'])}\n"
-            f"Accepting new patients: {accepting}\n"
-            f"Languages: {', '.join(doc['languages'])}\n"
-            f"Experience: {doc['years_experience']} years"
-        )
-    return "Doctor not found. Available: Dr. Smith, Dr. Johnson, Dr. Lee"
-
-
-# Map functions
-FUNCTION_MAP = {
-    "check_faq": check_faq,
-    "lookup_appointment": lookup_appointment,
-    "lookup_lab_result": lookup_lab_result,
-    "find_doctor": find_doctor
-}
-
-
-# Define tools for Claude
-TOOLS = [
-    {
-        "name": "check_faq",
-        "description": "Search frequently asked questions about clinic hours, location, insurance, services, and policies. Use this for general information queries.",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "question": {
-                    "type": "string",
-                    "description": "The question or topic to search for (e.g., 'hours', 'insurance', 'location')"
-                }
-            },
-            "required": ["question"]
-        }
-    },
-    {
-        "name": "lookup_appointment",
-        "description": "Look up appointment details by appointment ID. Returns patient name, doctor, date, time, status, and reason. Appointment IDs follow format APT-XXX.",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "appointment_id": {
-                    "type": "string",
-                    "description": "The appointment ID (e.g., 'APT-101')"
-                }
-            },
-            "required": ["appointment_id"]
-        }
-    },
-    {
-        "name": "lookup_lab_result",
-        "description": "Look up laboratory test results by lab ID. Returns test type, status, urgency, and result summary. Lab IDs follow format LAB-XXX.",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "lab_id": {
-                    "type": "string",
-                    "description": "The lab result ID (e.g., 'LAB-201')"
-                }
-            },
-            "required": ["lab_id"]
-        }
-    },
-    {
-        "name": "find_doctor",
-        "description": "Get information about a specific doctor including specialty, availability, languages spoken, and whether they're accepting new patients.",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "doctor_name": {
-                    "type": "string",
-                    "description": "The doctor's name (e.g., 'Dr. Smith', 'Dr. Johnson', 'Dr. Lee')"
-                }
-            },
-            "required": ["doctor_name"]
-        }
+# Multi-turn conversations for chat(): per-session history fitted to a token budget,
+# sessions kept in an LRU (SESSION_LIMIT, SESSION_TTL, SESSION_HISTORY_TOKENS; see src/sessions.py)
+session_store = SessionStore()
+
+# Set AGENT_TRACE_PATH=traces.jsonl to write one span tree per query (see src/tracing.py)
+agent_tracer = Tracer(os.environ["AGENT_TRACE_PATH"]) if os.environ.get("AGENT_TRACE_PATH") else NULL_TRACER
+
+
+# Tool functions and schemas come from the shared registry in src/tools.py
+FUNCTION_MAP = dict(REGISTRY)
+TOOLS = ANTHROPIC_TOOLS
+
+# COMPACT_TOOL_OUTPUTS=1 sends one-line tool results instead of the multi-line cards
+COMPACT_TOOL_OUTPUTS = os.environ.get("COMPACT_TOOL_OUTPUTS", "0") == "1"
+COMPACT_FUNCTION_MAP = {name: spec.compact for name, spec in REGISTRY.items()}
+
+# Prompt-cache breakpoints on the tool definitions and the conversation so far,
+# so later turns of a multi-tool query re-read the prefix instead of re-sending it
+PROMPT_CACHE = os.environ.get("PROMPT_CACHE", "1") != "0"
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Simple single-intent queries (one id, doctor or FAQ topic) are answered from the
+# tools without calling the model; FAST_PATH=0 sends everything to the model
+FAST_PATH = os.environ.get("FAST_PATH", "1") != "0"
+
+
+# Tool calls from one model turn run concurrently on a bounded pool. A call's
+# timeout counts from when a worker starts it; waiting for a free worker is
+# bounded by the same timeout, separately
+TOOL_WORKERS = 8
+TOOL_TIMEOUT = 10.0  # seconds, per tool call
+TOOL_TIMEOUTS = {}   # optional per-tool overrides, e.g. {"find_appointments": 20.0}
+_tool_executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="tool")
+
+
+class _Started(threading.Event):
+    """Set, with the time in `at`, when a worker picks up a submitted call"""
+
+    at = None
+
+    def set(self):
+        self.at = time.monotonic()
+        super().set()
+
+
+def _run_started(started, function, arguments):
+    started.set()
+    return function(**arguments)
+
+
+def _not_started(tool_use, timeout: float) -> dict:
+    return make_tool_error(tool_use, f"didn't start within {timeout:g}s; all tool workers are busy. "
+                                     "Please try again later.")
+
+
+def start_tool_call(tool_use, function_map=FUNCTION_MAP, span=NULL_SPAN) -> tuple:
+    """
+    Submit one tool call to the pool without waiting for it.
+    Returns the pending call for finish_tool_call; its "tool" span (a child
+    of `span`) ends when the call finishes.
+    """
+    tool_span = span.child("tool", tool=tool_use.name)
+    function = function_map.get(tool_use.name)
+    future = None
+    started = _Started()
+    if function is not None:
+        future = _tool_executor.submit(_run_started, started, function, tool_use.input)
+        future.add_done_callback(lambda _: tool_span.end())
+    return future, tool_span, started, time.monotonic()
+
+
+def finish_tool_call(tool_use, pending: tuple) -> dict:
+    """Wait for a started call, up to its timeout once running, and build its tool_result"""
+    future, tool_span, started, submitted = pending
+    timeout = TOOL_TIMEOUTS.get(tool_use.name, TOOL_TIMEOUT)
+    try:
+        if future is None:
+            raise KeyError(f"Unknown tool: {tool_use.name}")
+        if not started.wait(max(0.0, submitted + timeout - time.monotonic())):
+            future.cancel()
+            tool_span.end(status="not_started")
+            return _not_started(tool_use, timeout)
+        content = future.result(timeout=max(0.0, started.at + timeout - time.monotonic()))
+        tool_span.end(status="ok", result_chars=len(content))
+        return make_tool_result(tool_use, content)
+    except FutureTimeout:
+        future.cancel()
+        tool_span.end(status="timeout")
+        return make_tool_error(tool_use, f"timed out after {timeout:g}s. Please try again later.")
+    except Exception as e:
+        tool_span.end(status="error", error=str(e))
+        return make_tool_error(tool_use, f"failed: {e}")
+
+
+def execute_tool_calls(tool_uses, function_map=FUNCTION_MAP, span=NULL_SPAN) -> list[dict]:
+    """
+    Run the tool calls of one turn concurrently.
+    Results come back in tool_use order. A tool that raises or exceeds its
+    timeout produces an is_error result without affecting the others.
+    """
+    pending = [start_tool_call(tool_use, function_map, span) for tool_use in tool_uses]
+    return [finish_tool_call(tool_use, call) for tool_use, call in zip(tool_uses, pending)]
+
+
+async def run_tool_call_async(tool_use, function_map=FUNCTION_MAP, span=NULL_SPAN) -> dict:
+    """Run one tool call on the shared pool and build its tool_result"""
+    loop = asyncio.get_running_loop()
+    tool_span = span.child("tool", tool=tool_use.name)
+    function = function_map.get(tool_use.name)
+    if function is None:
+        tool_span.end(status="error", error="Unknown tool")
+        return make_tool_error(tool_use, "failed: Unknown tool")
+    timeout = TOOL_TIMEOUTS.get(tool_use.name, TOOL_TIMEOUT)
+    started = loop.create_future()
+
+    def mark_started():
+        if not started.done():
+            started.set_result(None)
+
+    def run():
+        loop.call_soon_threadsafe(mark_started)
+        return function(**tool_use.input)
+
+    future = loop.run_in_executor(_tool_executor, run)
+    try:
+        try:
+            await asyncio.wait_for(started, timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            tool_span.end(status="not_started")
+            return _not_started(tool_use, timeout)
+        content = await asyncio.wait_for(future, timeout)
+        tool_span.end(status="ok", result_chars=len(content))
+        return make_tool_result(tool_use, content)
+    except asyncio.TimeoutError:
+        tool_span.end(status="timeout")
+        return make_tool_error(tool_use, f"timed out after {timeout:g}s. Please try again later.")
+    except Exception as e:
+        tool_span.end(status="error", error=str(e))
+        return make_tool_error(tool_use, f"failed: {e}")
+
+
+async def execute_tool_calls_async(tool_uses, function_map=FUNCTION_MAP, span=NULL_SPAN) -> list[dict]:
+    """Async counterpart of execute_tool_calls, sharing the same bounded pool"""
+    return list(await asyncio.gather(
+        *(run_tool_call_async(tool_use, function_map, span) for tool_use in tool_uses)
+    ))
+
+
+def tool_functions() -> dict:
+    return COMPACT_FUNCTION_MAP if COMPACT_TOOL_OUTPUTS else FUNCTION_MAP
+
+
+def with_cache_breakpoint(blocks):
+    """Copy of a message's content with cache_control on its last block"""
+    if isinstance(blocks, str):
+        return [{"type": "text", "text": blocks, "cache_control": CACHE_CONTROL}]
+    blocks = list(blocks)
+    last = blocks[-1]
+    if not isinstance(last, dict):
+        last = last.model_dump(exclude_none=True) if hasattr(last, "model_dump") else dict(vars(last))
+    blocks[-1] = {**last, "cache_control": CACHE_CONTROL}
+    return blocks
+
+
+def request_params(tools, messages, system: str = None) -> dict:
+    """
+    Keyword arguments for messages.create.
+    With PROMPT_CACHE on, one breakpoint goes on the last tool (caching every
+    definition) and one on the newest message, so each turn reads the previous
+    turn's prefix from the cache. Only the request copies are marked; the
+    stored history stays untouched, keeping at most two breakpoints per request.
+    """
+    if PROMPT_CACHE:
+        tools = tools[:-1] + [{**tools[-1], "cache_control": CACHE_CONTROL}] if tools else tools
+        messages = messages[:-1] + [{**messages[-1], "content": with_cache_breakpoint(messages[-1]["content"])}]
+    params = {"model": MODEL, "max_tokens": 1024, "tools": tools, "messages": messages}
+    if system:
+        params["system"] = system
+    return params
+
+
+def fast_path(query: str, trace=NULL_SPAN):
+    """Templated tool answer when the router is confident, else None"""
+    if not FAST_PATH:
+        return None
+    routed = router.answer(query, FUNCTION_MAP)
+    if routed is None:
+        return None
+    answer, route = routed
+    trace.end(cached=False, routed=route.tool, confidence=route.confidence, answer_chars=len(answer))
+    return answer
+
+
+def make_tool_result(tool_use, content: str) -> dict:
+    return {
+        "type": "tool_result",
+        "tool_use_id": tool_use.id,
+        "content": content
     }
-]
+
+
+def make_tool_error(tool_use, message: str) -> dict:
+    result = make_tool_result(tool_use, f"{tool_use.name} {message}")
+    result["is_error"] = True
+    return result
+
+
+# Queries the demo runs at the same time
+DEMO_CONCURRENCY = 4
 
 
 def print_separator():
     print("\n" + "="*70 + "\n")
 
 
-def run_agent(query: str):
-    """Run Claude agent with tool calling"""
+def run_agent(query: str, client=client, tools=TOOLS, cache=response_cache, tracer=agent_tracer):
+    """
+    Run Claude agent with tool calling.
+    Benchmarks pass a local stand-in `client` or a reduced `tools` list;
+    pass cache=None to always call the model, or a Tracer to record spans.
+    """
+    with tracer.trace("run_agent", query=query, model=MODEL) as trace:
+        return _run_agent(query, client, tools, cache, trace)
+
+
+def _run_agent(query, client, tools, cache, trace):
+    routed = fast_path(query, trace)
+    if routed is not None:
+        return routed
+    if cache is not None:
+        cache_key = cache.key(query, MODEL, tools, get_store().data_version)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            trace.end(cached=True, answer_chars=len(cached))
+            return cached
+    
+    answer = agent_loop([{"role": "user", "content": query}], client, tools, trace)
+    if cache is not None and answer:
+        cache.put(cache_key, answer)
+    trace.end(cached=False, answer_chars=len(answer))
+    return answer
+
+
+def agent_steps(messages: list, tools, system: str = None, start: int = 0):
+    """
+    The tool-use loop without the I/O, shared by every agent variant.
+    Yields ("llm", turn, request params), to be sent the model's response,
+    and ("tools", turn, tool_uses), to be sent their tool_results in order.
+    Appends the exchange to `messages` with content blocks as plain dicts;
+    messages[start:] is the current turn, whose older tool results are
+    elided past TURN_TOKENS. Returns the text of every turn, joined the way
+    stream_agent emits it.
+    """
+    texts = []
+    for turn in itertools.count():
+        response = yield "llm", turn, request_params(tools, messages, system)
+        content = [block_dict(block) for block in response.content]
+        texts += [block["text"] for block in content if block["type"] == "text" and block["text"]]
+        tool_uses = [SimpleNamespace(**block) for block in content if block["type"] == "tool_use"]
+        if response.stop_reason != "tool_use" or not tool_uses:
+            return " ".join(texts)
+
+        # The assistant's tool calls, then their results, keeping the turn within its budget
+        messages.append({"role": "assistant", "content": content})
+        tool_results = yield "tools", turn, tool_uses
+        messages.append({"role": "user", "content": tool_results})
+        elide_tool_results(messages, TURN_TOKENS, start)
+
+
+def agent_loop(messages: list, client, tools, trace, system: str = None, start: int = 0) -> str:
+    """
+    Call the model and run the tools it asks for until it answers.
+    Appends the exchange to `messages`; see agent_steps.
+    """
+    steps = agent_steps(messages, tools, system, start)
+    step = next(steps)
+    while True:
+        kind, turn, value = step
+        if kind == "llm":
+            llm_span = trace.child("llm", turn=turn)
+            result = client.messages.create(**value)
+            llm_span.end(**response_attributes(result))
+        else:
+            # Execute the tools concurrently and collect results in order
+            with trace.child("tools", turn=turn) as tools_span:
+                result = execute_tool_calls(value, tool_functions(), span=tools_span)
+        try:
+            step = steps.send(result)
+        except StopIteration as done:
+            return done.value
+
+
+def chat(session_id: str, message: str, client=client, tools=TOOLS, sessions=session_store,
+         tracer=agent_tracer) -> str:
+    """
+    One message in a multi-turn conversation. The session's earlier turns
+    (and the summary of those it dropped) go with the request, and the turn
+    is recorded afterwards. The response cache, and the router once there is
+    history, are skipped: the same words can mean something else later in a
+    conversation.
+    """
+    session = sessions.get(session_id)
+    with session.lock, tracer.trace("chat", query=message, model=MODEL, session=session_id) as trace:
+        history = session.messages()
+        answer = None if history or session.summary else fast_path(message, trace)
+        messages = history + [{"role": "user", "content": message}]
+        if answer is None:
+            answer = agent_loop(messages, client, tools, trace, session.system(), start=len(history))
+            trace.end(cached=False, answer_chars=len(answer), history_turns=len(session.turns))
+        if answer:
+            session.add_turn(messages[len(history):] + [{"role": "assistant", "content": answer}])
+    return answer
+
+
+async def run_agent_async(query: str, client=async_client, tools=TOOLS, cache=response_cache,
+                          tracer=agent_tracer):
+    """Async version of run_agent built on AsyncAnthropic"""
+    with tracer.trace("run_agent", query=query, model=MODEL) as trace:
+        return await _run_agent_async(query, client, tools, cache, trace)
+
+
+async def _run_agent_async(query, client, tools, cache, trace):
+    routed = fast_path(query, trace)
+    if routed is not None:
+        return routed
+    if cache is not None:
+        cache_key = cache.key(query, MODEL, tools, get_store().data_version)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            trace.end(cached=True, answer_chars=len(cached))
+            return cached
+    
+    answer = await agent_loop_async([{"role": "user", "content": query}], client, tools, trace)
+    if cache is not None and answer:
+        cache.put(cache_key, answer)
+    trace.end(cached=False, answer_chars=len(answer))
+    return answer
+
+
+async def agent_loop_async(messages: list, client, tools, trace, system: str = None, start: int = 0) -> str:
+    """Async counterpart of agent_loop, driving the same agent_steps"""
+    steps = agent_steps(messages, tools, system, start)
+    step = next(steps)
+    while True:
+        kind, turn, value = step
+        if kind == "llm":
+            llm_span = trace.child("llm", turn=turn)
+            result = await client.messages.create(**value)
+            llm_span.end(**response_attributes(result))
+        else:
+            with trace.child("tools", turn=turn) as tools_span:
+                result = await execute_tool_calls_async(value, tool_functions(), span=tools_span)
+        try:
+            step = steps.send(result)
+        except StopIteration as done:
+            return done.value
+
+
+class StreamedTurn:
+    """
+    Rebuilds one assistant message from raw Messages API stream events.
+    `feed(event)` returns ("text", delta) for text as it arrives and
+    ("tool_use", block) as soon as a tool_use block's input JSON is complete.
+    """
+
+    def __init__(self):
+        self.blocks = {}        # index -> content block dict
+        self.stop_reason = None
+        self.usage = SimpleNamespace()
+        self._partial_json = {}
+
+    @property
+    def content(self) -> list:
+        return [self.blocks[index] for index in sorted(self.blocks)]
+
+    def text(self) -> str:
+        return " ".join(block["text"] for block in self.content if block["type"] == "text")
+
+    def feed(self, event):
+        if event.type == "message_start":
+            usage = event.message.usage
+            for field in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+                setattr(self.usage, field, getattr(usage, field, None))
+        elif event.type == "content_block_start":
+            block = event.content_block
+            if block.type == "tool_use":
+                self.blocks[event.index] = {"type": "tool_use", "id": block.id, "name": block.name, "input": {}}
+                self._partial_json[event.index] = []
+            elif block.type == "text":
+                self.blocks[event.index] = {"type": "text", "text": block.text or ""}
+        elif event.type == "content_block_delta":
+            delta = event.delta
+            if delta.type == "text_delta":
+                self.blocks[event.index]["text"] += delta.text
+                return "text", delta.text
+            if delta.type == "input_json_delta":
+                self._partial_json[event.index].append(delta.partial_json)
+        elif event.type == "content_block_stop":
+            block = self.blocks.get(event.index)
+            if block is not None and block["type"] == "tool_use":
+                block["input"] = json.loads("".join(self._partial_json.pop(event.index)) or "{}")
+                return "tool_use", SimpleNamespace(**block)
+        elif event.type == "message_delta":
+            self.stop_reason = event.delta.stop_reason
+            if getattr(event, "usage", None) is not None:
+                self.usage.output_tokens = event.usage.output_tokens
+        return None
+
+
+def stream_agent(query: str, client=client, tools=TOOLS, cache=response_cache, tracer=agent_tracer):
+    """
+    Streaming variant of run_agent: yields text deltas as they arrive.
+    Each tool call starts as soon as its tool_use block is complete, while
+    the rest of the turn is still streaming; the follow-up turn then streams
+    too. A cached or fast-path answer is yielded whole.
+    """
+    with tracer.trace("stream_agent", query=query, model=MODEL) as trace:
+        yield from _stream_agent(query, client, tools, cache, trace)
+
+
+def _stream_agent(query, client, tools, cache, trace):
+    routed = fast_path(query, trace)
+    if routed is not None:
+        yield routed
+        return
+    if cache is not None:
+        cache_key = cache.key(query, MODEL, tools, get_store().data_version)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            trace.end(cached=True, answer_chars=len(cached))
+            yield cached
+            return
+    
+    messages = [{"role": "user", "content": query}]
+    deltas = []
+    steps = agent_steps(messages, tools)
+    step = next(steps)
+    while True:
+        kind, turn, value = step
+        if kind == "llm":
+            result, tools_span, pending = yield from _stream_turn(client, value, trace, turn, deltas)
+        else:
+            # The calls started while the turn streamed, in tool_use order
+            with tools_span:
+                result = [finish_tool_call(tool_use, call) for tool_use, call in zip(value, pending)]
+        try:
+            step = steps.send(result)
+        except StopIteration:
+            break
+
+    # Cache exactly what was streamed, so a later hit yields the same text
+    answer = "".join(deltas)
+    if cache is not None and answer:
+        cache.put(cache_key, answer)
+    trace.end(cached=False, answer_chars=len(answer))
+
+
+def _stream_turn(client, params, trace, turn, deltas):
+    """
+    Stream one model response, yielding its text (also appended to `deltas`)
+    and starting each tool call as soon as its block is complete. Returns
+    the StreamedTurn, the "tools" span and the started calls.
+    """
+    llm_span = trace.child("llm", turn=turn)
+    tools_span = NULL_SPAN
+    started = time.perf_counter()
+    first_token = None
+    text_index = None
+    streamed = StreamedTurn()
+    pending = []
+    for event in client.messages.create(stream=True, **params):
+        fed = streamed.feed(event)
+        if fed is None:
+            continue
+        kind, value = fed
+        if kind == "text":
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            if event.index != text_index:
+                # Separate text blocks (and turns) the way agent_steps joins them
+                if deltas:
+                    deltas.append(" ")
+                    yield " "
+                text_index = event.index
+            deltas.append(value)
+            yield value
+        else:
+            # Start the tool now; the model may still be streaming the next block
+            if tools_span is NULL_SPAN:
+                tools_span = trace.child("tools", turn=turn)
+            pending.append(start_tool_call(value, tool_functions(), tools_span))
+    llm_span.end(ttft_ms=first_token * 1e3 if first_token is not None else None,
+                 **response_attributes(streamed))
+    return streamed, tools_span, pending
+
+
+async def stream_agent_async(query: str, client=async_client, tools=TOOLS, cache=response_cache,
+                             tracer=agent_tracer):
+    """Async-iterator version of stream_agent built on AsyncAnthropic"""
+    with tracer.trace("stream_agent", query=query, model=MODEL) as trace:
+        async for delta in _stream_agent_async(query, client, tools, cache, trace):
+            yield delta
+
+
+async def _stream_agent_async(query, client, tools, cache, trace):
+    routed = fast_path(query, trace)
+    if routed is not None:
+        yield routed
+        return
+    if cache is not None:
+        cache_key = cache.key(query, MODEL, tools, get_store().data_version)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            trace.end(cached=True, answer_chars=len(cached))
+            yield cached
+            return
     
     messages = [{"role": "user", "content": query}]
+    deltas = []
+    steps = agent_steps(messages, tools)
+    step = next(steps)
+    while True:
+        kind, turn, value = step
+        if kind == "llm":
+            # _stream_turn's async counterpart, inline: async generators can't delegate
+            llm_span = trace.child("llm", turn=turn)
+            tools_span = NULL_SPAN
+            started = time.perf_counter()
+            first_token = None
+            text_index = None
+            result = StreamedTurn()
+            tasks = []
+            async for event in await client.messages.create(stream=True, **value):
+                fed = result.feed(event)
+                if fed is None:
+                    continue
+                kind, delta = fed
+                if kind == "text":
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    if event.index != text_index:
+                        if deltas:
+                            deltas.append(" ")
+                            yield " "
+                        text_index = event.index
+                    deltas.append(delta)
+                    yield delta
+                else:
+                    if tools_span is NULL_SPAN:
+                        tools_span = trace.child("tools", turn=turn)
+                    tasks.append(asyncio.ensure_future(run_tool_call_async(delta, tool_functions(), tools_span)))
+            llm_span.end(ttft_ms=first_token * 1e3 if first_token is not None else None,
+                         **response_attributes(result))
+        else:
+            with tools_span:
+                result = list(await asyncio.gather(*tasks))
+        try:
+            step = steps.send(result)
+        except StopIteration:
+            break
+
+    answer = "".join(deltas)
+    if cache is not None and answer:
+        cache.put(cache_key, answer)
+    trace.end(cached=False, answer_chars=len(answer))
+
+
+async def _aiter(items):
+    """Iterate a plain or async iterable from async code"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def stream_queries(queries, concurrency: int = 4, client=async_client, tools=TOOLS,
+                         cache=response_cache, return_exceptions: bool = False, tracer=agent_tracer):
+    """
+    Run queries through run_agent_async with at most `concurrency` in flight.
+    `queries` may be a list, any iterable or an async iterable (a stream).
+    Responses are yielded in input order; with return_exceptions=True a
+    failing query yields its exception instead of stopping the stream.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = collections.deque()
+    window = concurrency * 4  # how far ahead of the oldest unfinished query we read
     
-    # Initial API call
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1024,
-        tools=TOOLS,
-        messages=messages
-    )
+    async def run_one(query):
+        async with semaphore:
+            return await run_agent_async(query, client=client, tools=tools, cache=cache, tracer=tracer)
     
-    # Handle tool calls in a loop
-    while response.stop_reason == "tool_use":
-        # Extract tool calls from response
-        tool_uses = [block for block in response.content if block.type == "tool_use"]
-        
-        # Add assistant's response to messages
-        messages.append({"role": "assistant", "content": response.content})
-        
-        # Execute each tool and collect results
-        tool_results = []
-        for tool_use in tool_uses:
-            function_name = tool_use.name
-            function_args = tool_use.input
-            
-            # Execute the function
-            result = FUNCTION_MAP[function_name](**function_args)
-            
-            tool_results.append({
-                "type": "tool_result",
-                "tool_use_id": tool_use.id,
-                "content": result
-            })
-        
-        # Add tool results to messages
-        messages.append({"role": "user", "content": tool_results})
-        
-        # Get next response
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            tools=TOOLS,
-            messages=messages
-        )
+    async def next_result():
+        task = pending.popleft()
+        try:
+            return await task
+        except Exception as e:
+            if not return_exceptions:
+                for other in pending:
+                    other.cancel()
+                raise
+            return e
+    
+    async for query in _aiter(queries):
+        pending.append(asyncio.ensure_future(run_one(query)))
+        if len(pending) >= window:
+            yield await next_result()
     
-    # Extract final text response
-    text_blocks = [block.text for block in response.content if hasattr(block, "text")]
-    return " ".join(text_blocks)
+    while pending:
+        yield await next_result()
 
 
-def main():
+async def run_queries(queries, concurrency: int = 4, client=async_client, tools=TOOLS,
+                      cache=response_cache, return_exceptions: bool = False, tracer=agent_tracer) -> list:
+    """Collect stream_queries into a list, in input order"""
+    return [
+        response async for response in stream_queries(
+            queries, concurrency, client=client, tools=tools, cache=cache,
+            return_exceptions=return_exceptions, tracer=tracer
+        )
+    ]
+
+
+def main(stream: bool = False):
     print("Healthcare Assistant Demo (Claude API)")
     print_separator()
     
@@ -213,20 +676,53 @@ def main():
         "I have APT-102 scheduled. What doctor will I see and are they accepting new patients?",
     ]
     
-    for i, query in enumerate(queries, 1):
+    if stream:
+        # One query at a time, printing text as it arrives
+        for i, query in enumerate(queries, 1):
+            print(f"Query {i}: {query}")
+            print("-" * 70)
+            print("Claude: ", end="", flush=True)
+            for delta in stream_agent(query):
+                print(delta, end="", flush=True)
+            print()
+            print_separator()
+        print(" Demo complete!")
+        return
+    
+    # Queries run concurrently; responses are printed in the original order
+    responses = asyncio.run(run_queries(queries, concurrency=DEMO_CONCURRENCY, return_exceptions=True))
+    
+    for i, (query, response) in enumerate(zip(queries, responses), 1):
         print(f"Query {i}: {query}")
         print("-" * 70)
-        try:
-            response = run_agent(query)
-            print(f"Claude: {response}")
-        except Exception as e:
-            print(f" Error: {e}")
+        if isinstance(response, Exception):
+            print(f" Error: {response}")
             import traceback
-            traceback.print_exc()
+            traceback.print_exception(response)
+        else:
+            print(f"Claude: {response}")
         print_separator()
     
     print(" Demo complete!")
 
 
+def chat_main():
+    """Interactive multi-turn conversation on one session"""
+    print("Healthcare Assistant Chat (Claude API) - empty line to quit")
+    print_separator()
+    while True:
+        try:
+            message = input("You: ").strip()
+        except EOFError:
+            break
+        if not message:
+            break
+        print(f"Claude: {chat('cli', message)}\n")
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python demo_claude.py --stream prints answers token by token; --chat keeps a conversation
+    if "--chat" in sys.argv[1:]:
+        chat_main()
+    else:
+        main(stream="--stream" in sys.argv[1:])
\ No newline at end of file
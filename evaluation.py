@@ -1,79 +1,120 @@
 """
 Simple DeepEval evaluation for healthcare assistant.
 Focuses on response quality without complex MCP tracking.
+
+Agent outputs and judge scores are stored in EVAL_CACHE_PATH, so a re-run
+only recomputes cases whose query, agent (model, request parameters, tool
+schemas), data or metric changed. Pass --force to recompute everything.
+Set EVAL_CASES_PATH to a JSONL file of {"query", "expected"} objects to run
+a larger suite.
 """
 
+import asyncio
 import os
+import sys
 from dotenv import load_dotenv
-from deepeval import evaluate
-from deepeval.metrics import GEval, AnswerRelevancyMetric
+from deepeval.metrics import GEval
 from deepeval.test_case import LLMTestCase, LLMTestCaseParams
 from deepeval.models import AnthropicModel
-from demo_claude import run_agent
+import demo_claude
+from demo_claude import TOOLS, request_params, run_agent_async
+from src.eval_pipeline import EvalCase, EvalStore, Judge, evaluate_cases, fingerprint, load_cases, summarize
+from src.storage import get_store
 
 load_dotenv()
 
+# Agent runs and judge calls in flight at the same time
+EVAL_CONCURRENCY = int(os.environ.get("EVAL_CONCURRENCY", 4))
+JUDGE_CONCURRENCY = int(os.environ.get("JUDGE_CONCURRENCY", 8))
+
+# Persisted outputs and scores (SQLite)
+EVAL_CACHE_PATH = os.environ.get("EVAL_CACHE_PATH", "eval_cache.db")
+
+JUDGE_MODEL = "claude-sonnet-4-20250514"
+
+DEFAULT_CASES = [
+    EvalCase("What are your hours?", "Monday-Friday 8AM-6PM, Saturday 9AM-2PM"),
+    EvalCase("Is APT-101 confirmed?", "Confirmed for John Doe with Dr. Smith on December 10"),
+    EvalCase("What's the status of LAB-202?", "Ready, urgent, chest X-ray with abnormal findings"),
+    EvalCase("Tell me about Dr. Smith", "Dr. Sarah Smith, Family Medicine, 15 years experience"),
+    EvalCase("Is APT-101 confirmed and what are your hours?", "APT-101 confirmed, hours Mon-Fri 8AM-6PM"),
+]
+
+METRICS = [
+    {
+        "name": "Correctness",
+        "criteria": "Is the actual output factually correct based on expected output?",
+        "evaluation_params": [LLMTestCaseParams.ACTUAL_OUTPUT, LLMTestCaseParams.EXPECTED_OUTPUT],
+        "threshold": 0.7,
+    },
+    {
+        "name": "Completeness",
+        "criteria": "Does the actual output fully answer all parts of the user's question?",
+        "evaluation_params": [LLMTestCaseParams.INPUT, LLMTestCaseParams.ACTUAL_OUTPUT],
+        "threshold": 0.7,
+    },
+]
+
+
+def agent_fingerprint() -> str:
+    """Everything besides the query that shapes an answer: model, request parameters, tools, modes"""
+    params = request_params(TOOLS, [{"role": "user", "content": ""}])
+    return fingerprint([params, demo_claude.FAST_PATH, demo_claude.COMPACT_TOOL_OUTPUTS])
+
+
+def make_judge(spec: dict, eval_model) -> Judge:
+    async def measure(case: EvalCase, output: str):
+        # A fresh metric per call: GEval keeps its last score on the instance
+        metric = GEval(model=eval_model, **spec)
+        await metric.a_measure(LLMTestCase(input=case.query, actual_output=output, expected_output=case.expected))
+        return metric.score, metric.reason, metric.is_successful()
 
-def main():
+    return Judge(spec["name"], fingerprint([spec, JUDGE_MODEL]), measure)
+
+
+def main(force: bool = False):
     print("="*70)
     print("HEALTHCARE ASSISTANT EVALUATION (DeepEval)")
     print("="*70)
-    print("\nRunning queries and evaluating responses...\n")
-    
+
+    cases = load_cases(os.environ["EVAL_CASES_PATH"]) if os.environ.get("EVAL_CASES_PATH") else DEFAULT_CASES
+    print(f"\nEvaluating {len(cases)} cases (agent concurrency {EVAL_CONCURRENCY}, "
+          f"judge concurrency {JUDGE_CONCURRENCY})...\n")
+
     # Use Claude as the evaluation judge
-    eval_model = AnthropicModel(model="claude-sonnet-4-20250514")
-    
-    # Create test cases
-    queries = [
-        ("What are your hours?", "Monday-Friday 8AM-6PM, Saturday 9AM-2PM"),
-        ("Is APT-101 confirmed?", "Confirmed for John Doe with Dr. Smith on December 10"),
-        ("What's the status of LAB-202?", "Ready, urgent, chest X-ray with abnormal findings"),
-        ("Tell me about Dr. Smith", "Dr. Sarah Smith, Family Medicine, 15 years experience"),
-        ("Is APT-101 confirmed and what are your hours?", "APT-101 confirmed, hours Mon-Fri 8AM-6PM"),
-    ]
-    
-    test_cases = []
-    for i, (query, expected) in enumerate(queries, 1):
-        print(f"{i}. Processing: {query}")
-        actual = run_agent(query)
-        test_cases.append(LLMTestCase(
-            input=query,
-            actual_output=actual,
-            expected_output=expected
-        ))
-    
-    print("\n" + "="*70)
-    print("RUNNING EVALUATION")
-    print("="*70 + "\n")
-    
-    # Define metrics
-    correctness = GEval(
-        name="Correctness",
-        criteria="Is the actual output factually correct based on expected output?",
-        evaluation_params=[LLMTestCaseParams.ACTUAL_OUTPUT, LLMTestCaseParams.EXPECTED_OUTPUT],
-        model=eval_model,
-        threshold=0.7
-    )
-    
-    completeness = GEval(
-        name="Completeness", 
-        criteria="Does the actual output fully answer all parts of the user's question?",
-        evaluation_params=[LLMTestCaseParams.INPUT, LLMTestCaseParams.ACTUAL_OUTPUT],
-        model=eval_model,
-        threshold=0.7
-    )
-    
-    # Run evaluation (removed print_results parameter)
-    results = evaluate(
-        test_cases=test_cases,
-        metrics=[correctness, completeness]
-    )
-    
+    eval_model = AnthropicModel(model=JUDGE_MODEL)
+    judges = [make_judge(spec, eval_model) for spec in METRICS]
+
+    results, stats = asyncio.run(evaluate_cases(
+        cases,
+        agent=lambda query: run_agent_async(query, cache=None),
+        judges=judges,
+        store=EvalStore(EVAL_CACHE_PATH),
+        agent_version=agent_fingerprint(),
+        data_version=get_store().data_version,
+        agent_concurrency=EVAL_CONCURRENCY,
+        judge_concurrency=JUDGE_CONCURRENCY,
+        force=force,
+    ))
+
+    for i, result in enumerate(results, 1):
+        print(f"{i}. {result.case.query}")
+        if result.error:
+            print(f"   Error: {result.error}")
+        for name, score in result.scores.items():
+            verdict = "PASS" if score["success"] else "FAIL"
+            print(f"   {name}: {score['score']:.2f} {verdict}")
+
     print("\n" + "="*70)
     print("EVALUATION COMPLETE")
     print("="*70)
-    print(f"\nResults: {results}")
+    print(f"\nAgent outputs: {stats.outputs_run} run, {stats.outputs_cached} reused")
+    print(f"Judge scores:  {stats.scores_run} run, {stats.scores_cached} reused")
+    print(f"Errors: {stats.errors}, wall time {stats.seconds:.1f}s")
+    for name, metric in summarize(results, judges).items():
+        print(f"{name}: mean {metric['mean_score']:.2f}, pass rate {metric['pass_rate']:.0%} "
+              f"over {metric['judged']} cases")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(force="--force" in sys.argv[1:])
@@ -1,30 +1,39 @@
 """
 MCP Agent that connects to the healthcare MCP server.
-This agent can dynamically discover and use all 4 tools.
+This agent can dynamically discover and use all of the server's tools.
 """
 
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
 from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
-from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
+from google.adk.tools.mcp_tool.mcp_session_manager import (
+    StdioConnectionParams,
+    StreamableHTTPConnectionParams,
+)
 from mcp import StdioServerParameters
 import os
 
 
-def create_healthcare_agent():
+def create_healthcare_agent(server_url: str = None):
     """
     Create and return a healthcare agent connected to MCP server.
-    """
     
-    # Configure connection to MCP server
-    server_params = StdioServerParameters(
-        command="python",
-        args=["-m", "src.mcp_server"],
-        env=None
-    )
+    With a server URL (or HEALTHCARE_MCP_URL), the agent joins a shared
+    long-lived server started with `python -m src.mcp_server --transport http`,
+    e.g. http://127.0.0.1:8000/mcp. Otherwise it spawns its own stdio server.
+    """
+    server_url = server_url or os.environ.get("HEALTHCARE_MCP_URL")
     
-    # Create connection params
-    connection_params = StdioConnectionParams(server_params=server_params)
+    if server_url:
+        connection_params = StreamableHTTPConnectionParams(url=server_url)
+    else:
+        # Configure connection to a per-agent stdio server
+        server_params = StdioServerParameters(
+            command="python",
+            args=["-m", "src.mcp_server"],
+            env=None
+        )
+        connection_params = StdioConnectionParams(server_params=server_params)
     
     # Create MCP toolset
     mcp_tools = McpToolset(connection_params=connection_params)
@@ -36,15 +45,25 @@ def create_healthcare_agent():
         tools=[mcp_tools],
         instruction="""You are a helpful healthcare assistant.
 
-You have access to 4 tools:
+You have access to 12 tools:
 1. check_faq - For general questions about hours, location, insurance, services
 2. lookup_appointment - For appointment details using appointment ID (APT-XXX)
 3. lookup_lab_result - For lab results using lab ID (LAB-XXX)
 4. find_doctor - For doctor information
+5. find_appointments - Search appointments by doctor, patient or status when the ID is unknown
+6. find_lab_results - Search lab results by patient, status or urgency when the ID is unknown
+7. lookup_appointments - Several appointments by ID in one call
+8. lookup_lab_results - Several lab results by ID in one call
+9. find_doctors - Several doctors in one call
+10. find_appointments_by_date - Appointments in a date window or period such as 'next week'
+11. find_lab_results_by_date - Lab results ordered in a date window or period
+12. search_faq - Several ranked FAQ answers with scores, for questions check_faq doesn't match
 
 When users ask questions:
 - Use the appropriate tool(s) to find information
 - If a query requires multiple pieces of information, use multiple tools
+- When a query mentions several IDs or doctors, use the batch tools instead of one call per item
+- Search results come a page at a time; only ask for the next page (with the returned cursor) when the user needs more
 - Be friendly and professional
 - If you can't find information, politely suggest they call 555-1234
 
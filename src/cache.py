@@ -0,0 +1,221 @@
+"""
+Caches for agent responses and tool results.
+
+- LRUCache: bounded in-memory tier with optional TTL
+- DiskCache: SQLite-backed tier that survives restarts
+- ResponseCache: both tiers in front of run_agent, keyed on the normalized
+  query, model, TOOLS schema hash and the store's data version
+
+Every tier counts hits, misses, evictions and expirations so it can be sized.
+"""
+
+import collections
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+
+class CacheStats:
+    """Counters shared by the cache tiers"""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live per entry.
+    `get` returns `default` on a miss, so None can be cached as a value.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = collections.OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """
+    SQLite-backed string cache with TTL and LRU eviction.
+    Expiry uses wall-clock time so entries stay valid across restarts.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl: float = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at);
+        """)
+
+    def get(self, key: str, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return default
+            value, expires_at = row
+            with self._conn:
+                if expires_at is not None and expires_at <= now:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self.stats.expirations += 1
+                    self.stats.misses += 1
+                    return default
+                self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: str, value: str, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl if ttl is not None else None, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (excess,)
+                )
+                self.stats.evictions += excess
+
+    def invalidate(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case, spacing and trailing punctuation don't change the answer"""
+    return _WHITESPACE_RE.sub(" ", query.lower()).strip().rstrip("?!. ")
+
+
+def schema_hash(tools) -> str:
+    """Stable hash of a tool schema list, so schema edits invalidate responses"""
+    payload = json.dumps(tools, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class ResponseCache:
+    """
+    Two-tier cache for final agent responses.
+    Lookups try memory first, then disk (promoting disk hits into memory).
+    Because the data version is part of the key, any write to the store
+    makes earlier responses unreachable; they age out through LRU and TTL.
+    """
+
+    def __init__(self, memory: LRUCache, disk: DiskCache = None):
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(query: str, model: str, tools, data_version: str) -> str:
+        parts = [normalize_query(query), model, schema_hash(tools), data_version]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def put(self, key: str, value: str):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats_dict(self) -> dict:
+        """Overall counters plus per-tier breakdown"""
+        stats = {"overall": self.stats.as_dict(), "memory": self.memory.stats.as_dict()}
+        stats["memory"]["entries"] = len(self.memory)
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats.as_dict()
+        return stats
@@ -0,0 +1,148 @@
+"""
+Record dates as sortable integers, and the date windows the range tools accept.
+Records keep their display strings ("December 10, 2025", "10:00 AM"); the
+stores parse them once, on write, into timestamps: minutes since 0001-01-01.
+"""
+
+import calendar
+import os
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+
+
+MINUTES_PER_DAY = 24 * 60
+
+# Named windows for the range tools, relative to today(); weeks start on Monday
+PERIODS = ("today", "tomorrow", "yesterday", "this week", "next week", "last week",
+           "this month", "next month", "last month")
+
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+_MONTHS["sept"] = 9
+
+_ISO_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})$")
+_US_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})$")
+_WRITTEN_RE = re.compile(r"([a-z]+)\.? (\d{1,2})(?:st|nd|rd|th)?(?:,? (\d{4}))?$")
+_TIME_RE = re.compile(r"(\d{1,2})(?::(\d{2}))? ?([ap]\.?m\.?)?$")
+
+
+def today() -> date:
+    """The clinic's current date; HEALTHCARE_TODAY=2025-12-08 pins it (demos, benchmarks)"""
+    pinned = os.environ.get("HEALTHCARE_TODAY")
+    return date.fromisoformat(pinned) if pinned else date.today()
+
+
+@lru_cache(maxsize=65536)
+def parse_date(text: str, default_year: int = None):
+    """
+    "December 10, 2025", "Dec 10 2025", "2025-12-10" or "12/10/2025" as a date,
+    None if it isn't one. A date without a year ("Dec 10") takes default_year.
+    """
+    text = " ".join(text.lower().replace(",", " ").split()) if text else ""
+    try:
+        if match := _ISO_RE.match(text):
+            return date(int(match[1]), int(match[2]), int(match[3]))
+        if match := _US_RE.match(text):
+            return date(int(match[3]), int(match[1]), int(match[2]))
+        if (match := _WRITTEN_RE.match(text)) and match[1] in _MONTHS:
+            year = int(match[3]) if match[3] else default_year
+            return date(year, _MONTHS[match[1]], int(match[2])) if year else None
+    except ValueError:
+        return None
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_time(text: str):
+    """Minutes after midnight for "10:00 AM", "2 pm" or "14:30"; None if it isn't a time"""
+    match = _TIME_RE.match(text.strip().lower()) if text else None
+    if match is None:
+        return None
+    hour, minute = int(match[1]), int(match[2] or 0)
+    if match[3]:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match[3].startswith("p") else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def display(day: date) -> str:
+    """A date the way the records write it: 'December 10, 2025'"""
+    return f"{day:%B} {day.day}, {day.year}"
+
+
+def day_stamp(day: date) -> int:
+    """Timestamp of midnight at the start of `day`"""
+    return day.toordinal() * MINUTES_PER_DAY
+
+
+@lru_cache(maxsize=65536)
+def timestamp(date_text: str, time_text: str = None):
+    """Timestamp of a record's date (and time, if it parses); None when the date doesn't parse"""
+    day = parse_date(date_text)
+    if day is None:
+        return None
+    minutes = parse_time(time_text) if time_text else None
+    return day_stamp(day) + (minutes or 0)
+
+
+def _period(name: str, reference: date):
+    if name in ("today", "tomorrow", "yesterday"):
+        day = reference + timedelta(days={"today": 0, "tomorrow": 1, "yesterday": -1}[name])
+        return day, day
+    which, unit = name.split()
+    shift = {"this": 0, "next": 1, "last": -1}[which]
+    if unit == "week":
+        first = reference - timedelta(days=reference.weekday()) + timedelta(weeks=shift)
+        return first, first + timedelta(days=6)
+    month_index = reference.year * 12 + reference.month - 1 + shift
+    year, month = divmod(month_index, 12)
+    return date(year, month + 1, 1), date(year, month + 1, calendar.monthrange(year, month + 1)[1])
+
+
+def _bound(text: str, reference: date):
+    text = text.strip().lower()
+    if text in ("today", "tomorrow", "yesterday"):
+        return _period(text, reference)[0]
+    day = parse_date(text, default_year=reference.year)
+    if day is None:
+        raise ValueError(f"Couldn't read the date {text!r}; use a date like 'December 1, 2025' or '2025-12-01'.")
+    return day
+
+
+def resolve_window(start_date: str = None, end_date: str = None, period: str = None, reference: date = None):
+    """
+    Inclusive (first day, last day) for the range tools: a named period, or
+    start and/or end dates (an open end is None). Raises ValueError with a
+    message meant for the caller when nothing usable was given.
+    """
+    reference = reference or today()
+    if period:
+        name = " ".join(period.lower().split())
+        if name not in PERIODS:
+            raise ValueError(f"Unknown period {period!r}; use one of: {', '.join(PERIODS)}.")
+        first, last = _period(name, reference)
+    else:
+        first = _bound(start_date, reference) if start_date else None
+        last = _bound(end_date, reference) if end_date else None
+        if first is None and last is None:
+            raise ValueError("Please provide a start date, an end date or a period such as 'next week'.")
+    if first is not None and last is not None and first > last:
+        raise ValueError(f"The start date {display(first)} is after the end date {display(last)}.")
+    return first, last
+
+
+def window_stamps(first: date = None, last: date = None) -> tuple:
+    """[start, end) timestamps covering the inclusive day window; None for an open end"""
+    return (day_stamp(first) if first else None,
+            day_stamp(last + timedelta(days=1)) if last else None)
+
+
+def describe_window(first: date = None, last: date = None) -> str:
+    """'on December 10, 2025', 'from December 8, 2025 to December 14, 2025', 'on or after ...'"""
+    if first and last:
+        return f"on {display(first)}" if first == last else f"from {display(first)} to {display(last)}"
+    return f"on or after {display(first)}" if first else f"on or before {display(last)}"
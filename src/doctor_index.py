@@ -0,0 +1,177 @@
+"""
+Prebuilt doctor-name resolver shared by the MCP server and the Claude demo.
+find_doctor used to need the exact directory key ("Dr. Smith"); this index
+also accepts "smith", "Dr Smith", "Sarah Smith", "Dr. Emily Lee" and small
+misspellings ("Dr. Jonson"), so the model doesn't spend a round trip retrying.
+
+Each doctor is indexed under several normalized forms: the key, the full name,
+first + last name and the last name. Lookup tries an exact form first, then
+character trigrams narrow the forms down to a few candidates that are checked
+with a bounded edit distance. The cost depends on the query and on how many
+forms share its trigrams, not on the size of the directory.
+"""
+
+import re
+from collections import Counter
+
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Titles and suffixes that don't identify a doctor
+_IGNORED_WORDS = frozenset({"dr", "doctor", "md", "do", "phd", "mbbs", "jr", "sr"})
+
+# Forms compared with the edit distance per lookup, after trigram ranking
+FUZZY_CANDIDATES = 32
+
+# Posting entries counted per lookup; the rarest trigrams are counted first
+FUZZY_POSTINGS_BUDGET = 2048
+
+
+def normalize(name: str) -> str:
+    """Lowercase name words without titles or punctuation ('Dr. O'Neil' -> 'o neil')"""
+    return " ".join(word for word in _WORD_RE.findall(name.lower()) if word not in _IGNORED_WORDS)
+
+
+def max_distance(form: str) -> int:
+    """Typos tolerated for a form of this length: none for very short names"""
+    if len(form) <= 3:
+        return 0
+    return 1 if len(form) <= 7 else 2
+
+
+def _trigrams(form: str) -> set:
+    padded = f"  {form} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between a and b, or limit + 1 once it must exceed
+    limit. Only the diagonal band |i - j| <= limit is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+        for j in range(low, high + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != b[j - 1]),
+                over,
+            )
+        if min(current[low - 1:high + 1]) > limit:
+            return over
+        previous = current
+    return previous[-1]
+
+
+class DoctorIndex:
+    """
+    Name forms -> directory keys, plus a trigram index over the forms.
+
+    `resolve(name)` returns the one key a name refers to, or None when it
+    matches nobody or is ambiguous (two doctors named Smith).
+    `suggest(name)` ranks the closest keys for "did you mean" answers.
+    """
+
+    def __init__(self, entries=None):
+        self._forms = []          # form id -> normalized form
+        self._form_ids = {}       # normalized form -> form id
+        self._form_keys = []      # form id -> directory keys with that form
+        self._postings = {}       # trigram -> form ids containing it
+        if entries:
+            for key, full_name in entries:
+                self.add(key, full_name)
+
+    def __len__(self):
+        return len(self._forms)
+
+    def _add_form(self, form: str, key: str):
+        form_id = self._form_ids.get(form)
+        if form_id is None:
+            form_id = len(self._forms)
+            self._forms.append(form)
+            self._form_ids[form] = form_id
+            self._form_keys.append([])
+            for gram in _trigrams(form):
+                self._postings.setdefault(gram, []).append(form_id)
+        if key not in self._form_keys[form_id]:
+            self._form_keys[form_id].append(key)
+
+    def add(self, key: str, full_name: str = None):
+        """Index one doctor under its key and, when given, its full name"""
+        for name in (key, full_name):
+            words = normalize(name or "").split()
+            if not words:
+                continue
+            for form in {" ".join(words), f"{words[0]} {words[-1]}", words[-1]}:
+                self._add_form(form, key)
+
+    def _candidates(self, form: str, count: int, limit: int) -> tuple:
+        """
+        (form id, shared trigrams) pairs, most shared first, for the forms
+        that can be within `limit` edits of `form`, plus how many of its
+        trigrams were counted.
+        Each edit changes at most 3 trigrams, so counting the 3 * limit + 1
+        rarest ones is enough for every such form to show up; common trigrams
+        ("  s" in a large directory) are only counted while the budget lasts.
+        """
+        postings = sorted((self._postings.get(gram, ()) for gram in _trigrams(form)), key=len)
+        shared = Counter()
+        counted = grams = 0
+        for ids in postings:
+            if grams > 3 * limit and counted + len(ids) > FUZZY_POSTINGS_BUDGET:
+                break
+            shared.update(ids)
+            counted += len(ids)
+            grams += 1
+        needed = grams - 3 * limit
+        return [(form_id, hits) for form_id, hits in shared.most_common(count) if hits >= needed], grams
+
+    def resolve(self, name: str):
+        """The directory key `name` refers to, or None"""
+        form = normalize(name)
+        if not form:
+            return None
+        form_id = self._form_ids.get(form)
+        if form_id is not None:
+            keys = self._form_keys[form_id]
+            return keys[0] if len(keys) == 1 else None
+
+        limit = max_distance(form)
+        if not limit:
+            return None
+        candidates, grams = self._candidates(form, FUZZY_CANDIDATES, limit)
+        best, keys = limit + 1, set()
+        for candidate, hits in candidates:
+            # A form within `best` edits keeps all but 3 * best of the counted trigrams
+            if hits < grams - 3 * min(best, limit):
+                break
+            distance = bounded_distance(form, self._forms[candidate], min(limit, best))
+            if distance < best:
+                best, keys = distance, set(self._form_keys[candidate])
+            elif distance == best:
+                keys.update(self._form_keys[candidate])
+        return keys.pop() if best <= limit and len(keys) == 1 else None
+
+    def suggest(self, name: str, count: int) -> list:
+        """Up to `count` keys closest to `name`, best first"""
+        form = normalize(name)
+        if not form:
+            return []
+        candidates, _ = self._candidates(form, FUZZY_CANDIDATES, max(max_distance(form), 1))
+        ranked = sorted(
+            (candidate for candidate, _ in candidates),
+            key=lambda candidate: bounded_distance(form, self._forms[candidate], len(form))
+        )
+        keys = []
+        for candidate in ranked:
+            for key in self._form_keys[candidate]:
+                if key not in keys:
+                    keys.append(key)
+        return keys[:count]
@@ -0,0 +1,174 @@
+"""
+Incremental evaluation: run the agent and the judges concurrently, and keep
+every agent output and judge score on disk so re-runs only recompute what
+changed.
+
+- An output is keyed on the normalized query, the agent fingerprint (model,
+  request parameters, tool schemas) and the store's data version.
+- A score is keyed on the metric fingerprint (name, criteria, judge model,
+  threshold) plus the exact input, output and expected output it judged.
+
+Editing a tool description or the data therefore re-runs every case; editing
+one metric re-judges only that metric; adding cases runs only the new ones.
+Failed agent runs and judge calls are reported but never stored.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from src.cache import normalize_query
+
+
+@dataclass(frozen=True)
+class EvalCase:
+    query: str
+    expected: str
+
+
+@dataclass
+class CaseResult:
+    case: EvalCase
+    output: str = None
+    scores: dict = field(default_factory=dict)   # metric -> {"score", "reason", "success"}
+    error: str = None
+    output_cached: bool = False
+
+
+@dataclass
+class RunStats:
+    cases: int = 0
+    outputs_run: int = 0
+    outputs_cached: int = 0
+    scores_run: int = 0
+    scores_cached: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+def fingerprint(value) -> str:
+    """Stable short hash of any JSON-able value"""
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def load_cases(path: str) -> list:
+    """EvalCases from a JSONL file of {"query": ..., "expected": ...} objects"""
+    with open(path) as cases:
+        return [EvalCase(item["query"], item["expected"]) for item in map(json.loads, cases) if item]
+
+
+class EvalStore:
+    """
+    Persisted outputs and scores, in one SQLite file. Unlike DiskCache there
+    is no TTL or eviction, so a read doesn't write and a warm re-run of a
+    large suite stays read-only.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+    @staticmethod
+    def output_key(query: str, agent: str, data_version: str) -> str:
+        return "output:" + fingerprint([normalize_query(query), agent, data_version])
+
+    @staticmethod
+    def score_key(output_key: str, metric: str, case: EvalCase, output: str) -> str:
+        return "score:" + fingerprint([output_key, metric, case.query, case.expected, output])
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key: str, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class Judge:
+    """
+    One metric. `measure(case, output)` is a coroutine returning
+    (score, reason, success); `fingerprint` must change whenever the metric
+    would judge differently (criteria, threshold, judge model).
+    """
+
+    def __init__(self, name: str, fingerprint: str, measure):
+        self.name = name
+        self.fingerprint = fingerprint
+        self.measure = measure
+
+
+async def evaluate_cases(cases, agent, judges, store: EvalStore, agent_version: str, data_version: str,
+                         agent_concurrency: int = 4, judge_concurrency: int = 8, force: bool = False):
+    """
+    Evaluate every case: reuse stored outputs and scores, run the rest.
+    `agent(query)` is a coroutine returning the answer text. Each case is
+    judged as soon as its own output is ready, so agent runs and judge calls
+    overlap. Returns ([CaseResult] in case order, RunStats).
+    """
+    agent_slots = asyncio.Semaphore(agent_concurrency)
+    judge_slots = asyncio.Semaphore(judge_concurrency)
+    stats = RunStats(cases=len(cases))
+    started = time.perf_counter()
+
+    async def judge(result: CaseResult, output_key: str, metric: Judge):
+        key = EvalStore.score_key(output_key, metric.fingerprint, result.case, result.output)
+        stored = None if force else store.get(key)
+        if stored is None:
+            async with judge_slots:
+                score, reason, success = await metric.measure(result.case, result.output)
+            stored = {"score": score, "reason": reason, "success": success}
+            store.put(key, stored)
+            stats.scores_run += 1
+        else:
+            stats.scores_cached += 1
+        result.scores[metric.name] = stored
+
+    async def evaluate(case: EvalCase) -> CaseResult:
+        result = CaseResult(case)
+        output_key = EvalStore.output_key(case.query, agent_version, data_version)
+        stored = None if force else store.get(output_key)
+        try:
+            if stored is None:
+                async with agent_slots:
+                    result.output = await agent(case.query)
+                store.put(output_key, result.output)
+                stats.outputs_run += 1
+            else:
+                result.output, result.output_cached = stored, True
+                stats.outputs_cached += 1
+            await asyncio.gather(*(judge(result, output_key, metric) for metric in judges))
+        except Exception as exc:
+            result.error = f"{type(exc).__name__}: {exc}"
+            stats.errors += 1
+        return result
+
+    results = await asyncio.gather(*(evaluate(case) for case in cases))
+    stats.seconds = time.perf_counter() - started
+    return results, stats
+
+
+def summarize(results, judges) -> dict:
+    """Per metric: mean score and pass rate over the cases that were judged"""
+    summary = {}
+    for metric in judges:
+        scores = [result.scores[metric.name] for result in results if metric.name in result.scores]
+        summary[metric.name] = {
+            "judged": len(scores),
+            "mean_score": round(sum(score["score"] for score in scores) / len(scores), 3) if scores else 0.0,
+            "pass_rate": round(sum(bool(score["success"]) for score in scores) / len(scores), 3) if scores else 0.0,
+        }
+    return summary
@@ -0,0 +1,111 @@
+"""
+Prebuilt FAQ matcher shared by the MCP server and the Claude demo.
+Replaces the linear `question in key or key in question` scan over FAQ_DATA
+with a token n-gram index that each store builds once (see src/storage.py).
+"""
+
+import re
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> tuple[str, ...]:
+    """Lowercase, split on non-alphanumerics and fold simple plurals ('labs' -> 'lab')"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tuple(tokens)
+
+
+class FaqIndex:
+    """
+    Token n-gram index over FAQ keys.
+
+    A key matches a question when the key's tokens appear as a contiguous run
+    inside the question, or the question's tokens appear as a contiguous run
+    inside the key. This is the token-level version of the old substring test.
+
+    Lookup only enumerates the question's own n-grams, so its cost depends on
+    the question length and the longest key, not on the number of entries.
+
+    Ranking is deterministic:
+      1. exact key match
+      2. longest key contained in the question
+      3. shortest key containing the question
+    Ties go to the key that was added first.
+    """
+
+    def __init__(self, entries=None):
+        self._keys = []          # entry id -> original key
+        self._answers = []       # entry id -> answer
+        self._exact = {}         # "tok tok" -> entry id of first key with those tokens
+        self._containing = {}    # "tok tok" -> entry id of shortest key containing the run
+        self._key_lengths = []   # entry id -> number of tokens
+        self._max_key_len = 0
+        if entries:
+            items = entries.items() if hasattr(entries, "items") else entries
+            for key, answer in items:
+                self.add(key, answer)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key: str, answer: str):
+        """Index one FAQ entry. Earlier entries win ties."""
+        tokens = tokenize(key)
+        if not tokens:
+            return
+
+        entry_id = len(self._keys)
+        self._keys.append(key)
+        self._answers.append(answer)
+        self._key_lengths.append(len(tokens))
+        self._max_key_len = max(self._max_key_len, len(tokens))
+        self._exact.setdefault(" ".join(tokens), entry_id)
+
+        # Every contiguous run of the key points at the shortest key containing it
+        size = len(tokens)
+        for start in range(size):
+            for end in range(start + 1, size + 1):
+                gram = " ".join(tokens[start:end])
+                best = self._containing.get(gram)
+                if best is None or size < self._key_lengths[best]:
+                    self._containing[gram] = entry_id
+
+    def match(self, question: str):
+        """Return (key, answer) of the best matching entry, or None"""
+        tokens = tokenize(question)
+        if not tokens:
+            return None
+
+        whole = " ".join(tokens)
+        exact = self._exact.get(whole)
+        if exact is not None:
+            return self._keys[exact], self._answers[exact]
+
+        # Longest key contained in the question, earliest key on ties
+        size = len(tokens)
+        for length in range(min(size, self._max_key_len), 0, -1):
+            hits = [
+                self._exact[gram]
+                for gram in (" ".join(tokens[start:start + length]) for start in range(size - length + 1))
+                if gram in self._exact
+            ]
+            if hits:
+                best = min(hits)
+                return self._keys[best], self._answers[best]
+
+        # Shortest key containing the question
+        containing = self._containing.get(whole)
+        if containing is not None:
+            return self._keys[containing], self._answers[containing]
+
+        return None
+
+    def lookup(self, question: str):
+        """Return the best matching answer, or None"""
+        hit = self.match(question)
+        return hit[1] if hit else None
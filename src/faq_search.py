@@ -0,0 +1,204 @@
+"""
+Ranked FAQ retrieval for paraphrased questions ("do you take Aetna?").
+FaqIndex only matches key words; this scores a question against every FAQ key
+and answer with hashed n-gram TF-IDF and returns the top-k answers.
+
+Features are word unigrams, word bigrams and character trigrams (which absorb
+typos and plurals), hashed into a fixed number of columns.
+
+The matrix is kept column-major, one posting list of (row, weight) per
+feature, so scoring a question is a single bincount over the postings of its
+few features, and a batch of questions is one bincount over all of theirs.
+
+Needs numpy (optional dependency): `pip install numpy`. Without it,
+`available()` is False and callers fall back to FaqIndex.
+"""
+
+import importlib.util
+import math
+import zlib
+
+from src.faq_index import tokenize
+
+
+# Hashed feature space; collisions are rare at this size even for 100k entries
+N_FEATURES = 1 << 20
+
+# Words too common to say anything about the topic
+STOPWORDS = frozenset("""
+    a an and are as at be can could do doe for from have how i in is it me my of on or our s
+    should that the there to we what whats when where which who will with would you your
+""".split())
+
+# Query words that mean the same as words in the FAQ text
+EXPANSIONS = {
+    "open": ("hour",),
+    "close": ("hour",),
+    "weekend": ("saturday", "sunday"),
+    "take": ("accept",),
+    "plan": ("insurance",),
+    "child": ("children", "age"),
+    "kid": ("children", "age"),
+    "virtual": ("telehealth",),
+    "book": ("schedule", "appointment"),
+}
+
+# Query features in more than this share of entries (and at least MIN_SKIPPED_POSTINGS)
+# are skipped: their postings are long and their weight small
+MAX_POSTINGS_FRACTION = 0.02
+MIN_SKIPPED_POSTINGS = 1000
+
+# Score cells (questions x entries) per bincount in search_batch
+BATCH_CELLS = 1 << 20
+
+
+def available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def content_words(text: str, query: bool = False) -> list:
+    """Tokens of `text` without stopwords; a question's also gain their EXPANSIONS"""
+    words = [word for word in tokenize(text) if word not in STOPWORDS]
+    if query:
+        words += [extra for word in words for extra in EXPANSIONS.get(word, ())]
+    return words
+
+
+def _bucket(feature: str) -> int:
+    # crc32 rather than hash(): stable across processes
+    return zlib.crc32(feature.encode()) % N_FEATURES
+
+
+class FaqSearch:
+    """
+    TF-IDF retrieval over (key, answer) entries.
+    `search(question, k)` returns up to k (key, answer, score) triples with
+    distinct answers, best first; scores are cosine similarities in [0, 1].
+    """
+
+    def __init__(self, entries):
+        import numpy as np
+
+        self._np = np
+        items = entries.items() if hasattr(entries, "items") else entries
+        self._keys = []
+        self._answers = []
+        self._word_features = {}   # word -> its hashed buckets, for the entries' words only
+        rows, columns, counts = [], [], []
+        for row, (key, answer) in enumerate(items):
+            self._keys.append(key)
+            self._answers.append(answer)
+            for column, count in self._features(f"{key} {answer}").items():
+                rows.append(row)
+                columns.append(column)
+                counts.append(count)
+
+        rows = np.asarray(rows, dtype=np.int32)
+        columns = np.asarray(columns, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.float32)
+        size = len(self._keys)
+
+        document_frequency = np.bincount(columns, minlength=N_FEATURES).astype(np.int32)
+        self._idf = (np.log((1 + size) / (1 + document_frequency)) + 1).astype(np.float32)
+        self._document_frequency = document_frequency
+        weights = (1 + np.log(counts)) * self._idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=size))
+        weights /= norms[rows].astype(np.float32)
+
+        # Column-major postings: the rows of feature f are _rows[_starts[f]:_starts[f + 1]]
+        order = np.argsort(columns, kind="stable")
+        self._rows = rows[order]
+        self._weights = weights[order]
+        self._starts = np.concatenate(([0], np.cumsum(document_frequency))).astype(np.int32)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _features(self, text: str, query: bool = False) -> dict:
+        """
+        Hashed feature -> count for an entry's text, or for a question.
+        Only entry words are memoized, so arbitrary questions can't grow the
+        memo past the FAQ's own vocabulary.
+        """
+        words = content_words(text, query)
+        features = {}
+        for word in words:
+            buckets = self._word_features.get(word)
+            if buckets is None:
+                padded = f"<{word}>"
+                buckets = [_bucket(f"w:{word}")] + [_bucket(padded[i:i + 3]) for i in range(len(padded) - 2)]
+                if not query:
+                    self._word_features[word] = buckets
+            for bucket in buckets:
+                features[bucket] = features.get(bucket, 0) + 1
+        for first, second in zip(words, words[1:]):
+            bucket = _bucket(f"b:{first} {second}")
+            features[bucket] = features.get(bucket, 0) + 1
+        return features
+
+    def _query(self, question: str):
+        """(postings rows, postings weights x query weights) for one question"""
+        np = self._np
+        features = self._features(question, query=True)
+        if not features:
+            return np.empty(0, np.int32), np.empty(0, np.float32)
+        columns = np.fromiter(features, dtype=np.int64, count=len(features))
+        weights = (1 + np.log(np.fromiter(features.values(), dtype=np.float32, count=len(features))))
+        keep = self._document_frequency[columns] <= max(MIN_SKIPPED_POSTINGS, MAX_POSTINGS_FRACTION * len(self._keys))
+        columns, weights = columns[keep], weights[keep]
+        if not len(columns):
+            return np.empty(0, np.int32), np.empty(0, np.float32)
+        weights *= self._idf[columns]
+        weights /= math.sqrt(float(weights @ weights))
+        starts, ends = self._starts[columns], self._starts[columns + 1]
+        lengths = ends - starts
+        positions = np.repeat(ends - lengths.cumsum(), lengths) + np.arange(lengths.sum())
+        return self._rows[positions], self._weights[positions] * np.repeat(weights, lengths)
+
+    def scores(self, question: str):
+        """Cosine similarity of `question` to every entry, as one array"""
+        rows, weights = self._query(question)
+        return self._np.bincount(rows, weights=weights, minlength=len(self._keys))
+
+    def search(self, question: str, k: int = 3) -> list:
+        return self._top(self.scores(question), k)
+
+    def search_batch(self, questions, k: int = 3) -> list:
+        """search() for many questions, scoring as many per bincount as fit in BATCH_CELLS"""
+        np = self._np
+        questions = list(questions)
+        size = len(self._keys)
+        step = max(1, BATCH_CELLS // max(size, 1))
+        results = []
+        for chunk_start in range(0, len(questions), step):
+            chunk = [self._query(question) for question in questions[chunk_start:chunk_start + step]]
+            rows = np.concatenate([query_rows + offset * size for offset, (query_rows, _) in enumerate(chunk)])
+            weights = np.concatenate([query_weights for _, query_weights in chunk])
+            block = np.bincount(rows, weights=weights, minlength=len(chunk) * size).reshape(len(chunk), size)
+            fetch = min(size, 4 * k)
+            if fetch == 0:
+                results += [[] for _ in chunk]
+                continue
+            best = np.argpartition(-block, fetch - 1, axis=1)[:, :fetch]
+            results += [self._top(scores, k, candidates) for scores, candidates in zip(block, best)]
+        return results
+
+    def _top(self, scores, k: int, candidates=None) -> list:
+        """Best k distinct answers; entries sharing an answer ("hours", "what are your hours") count once"""
+        np = self._np
+        # Over-fetch so duplicates don't leave fewer than k answers
+        fetch = min(len(scores), 4 * k)
+        if fetch == 0:
+            return []
+        best = np.argpartition(-scores, fetch - 1)[:fetch] if candidates is None else candidates
+        best = best[np.argsort(-scores[best], kind="stable")]
+        results, seen = [], set()
+        for row in best.tolist():
+            score = float(scores[row])
+            if score <= 0 or len(results) == k:
+                break
+            answer = self._answers[row]
+            if answer not in seen:
+                seen.add(answer)
+                results.append((self._keys[row], answer, round(score, 4)))
+        return results
@@ -0,0 +1,408 @@
+"""
+Streaming loader and hot reload for clinic data exports.
+
+A data directory holds one export per record type: faq, appointments,
+lab_results and doctors, each as .jsonl (one object per line) or .csv (with a
+header row). Exports are read in chunks of CHUNK_ROWS rows straight into the
+store, so a multi-million-row file is never held in memory as lines or dicts.
+
+DataReloader polls the exports' size and mtime. Rows appended to an export
+are applied to the live store through its put_* methods, which keep the
+indexes current. Any other change (an edited row, a replaced or removed file)
+builds a new store in the background and swaps it in with set_store(), so
+tool calls keep being answered from the old store until the new one is
+complete. Tool caches key on the store version, so neither path serves stale
+results.
+
+Serve a directory with HEALTHCARE_DATA_DIR=/path/to/exports; set
+HEALTHCARE_RELOAD_INTERVAL=2 to have the MCP server watch it.
+Write the src/data.py literals as exports: python -m src.loader --export exports/
+"""
+
+import csv
+import json
+import os
+import threading
+import zlib
+
+from src.records import RecordTable
+from src.storage import (
+    APPOINTMENT_CATEGORIES, APPOINTMENT_FIELDS, COMPACT_RECORDS, DOCTOR_FIELDS, LAB_RESULT_CATEGORIES,
+    LAB_RESULT_FIELDS, MemoryStore, set_store,
+)
+
+
+# Export name -> (key column, value columns), the same columns as the SQLite tables
+SOURCES = {
+    "faq": ("key", ("answer",)),
+    "appointments": ("id", APPOINTMENT_FIELDS),
+    "lab_results": ("id", LAB_RESULT_FIELDS),
+    "doctors": ("name", DOCTOR_FIELDS),
+}
+FORMATS = (".jsonl", ".csv")
+
+# Rows parsed before they are handed to the store
+CHUNK_ROWS = 10_000
+
+# CSV cells are text; these columns are converted back to the types src/data.py uses
+BOOL_COLUMNS = {"urgent", "accepting_new_patients"}
+LIST_COLUMNS = {"available_days", "languages"}
+INT_COLUMNS = {"years_experience"}
+_TRUE = {"1", "true", "yes", "y"}
+
+# Seconds between checks of the exports; 0 disables watching
+RELOAD_INTERVAL = float(os.environ.get("HEALTHCARE_RELOAD_INTERVAL", 0))
+
+
+def source_files(directory: str) -> dict:
+    """Export name -> path for the exports present in `directory`"""
+    found = {}
+    for name in SOURCES:
+        for extension in FORMATS:
+            path = os.path.join(directory, name + extension)
+            if os.path.isfile(path):
+                found[name] = path
+                break
+    return found
+
+
+def _csv_bool(value: str) -> bool:
+    return value.strip().lower() in _TRUE
+
+
+def _csv_list(value: str) -> list:
+    value = value.strip()
+    return json.loads(value) if value.startswith("[") else [item.strip() for item in value.split(";") if item.strip()]
+
+
+def _csv_converter(column: str):
+    """Function turning a CSV cell back into the column's type, None for text"""
+    if column in BOOL_COLUMNS:
+        return _csv_bool
+    if column in LIST_COLUMNS:
+        return _csv_list
+    if column in INT_COLUMNS:
+        return int
+    return None
+
+
+def _to_csv(column, value):
+    if column in LIST_COLUMNS:
+        return ";".join(value)
+    if column in BOOL_COLUMNS:
+        return "true" if value else "false"
+    return value
+
+
+class ExportReader:
+    """
+    Reads one export from where the previous read stopped. `offset` and
+    `checksum` (CRC-32) cover the complete rows read so far. A trailing row
+    without its newline is left for the next read, unless the read is
+    `final` (a full load); then it is read too, but `offset` stays before
+    it, so an append that finishes the row reads it again.
+    """
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.key_column, self.columns = SOURCES[name]
+        self.csv = path.endswith(".csv")
+        self.header = None
+        self.offset = 0
+        self.checksum = 0
+        self.rows = 0
+        self._read = (0, 0)   # (offset, checksum) after the last complete line read
+        self._tail = False    # the last read counted an unterminated row that will be read again
+
+    def chunks(self, chunk_rows: int = CHUNK_ROWS, final: bool = False):
+        """Yield lists of up to chunk_rows (key, value) pairs from the rows after `offset`"""
+        chunk = []
+        for key, value in self._rows(final):
+            chunk.append((key, value))
+            if len(chunk) == chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _lines(self, handle, final):
+        # Complete lines, plus an unterminated last one when final; offset and
+        # checksum are committed once a row has parsed
+        offset, checksum = self.offset, self.checksum
+        for line in handle:
+            if not line.endswith(b"\n"):
+                if final and line.strip() and not (self.csv and self.header is None):
+                    self._read = (offset, checksum)
+                    self._tail = True
+                    yield line.decode("utf-8")
+                return
+            offset += len(line)
+            checksum = zlib.crc32(line, checksum)
+            self._read = (offset, checksum)
+            yield line.decode("utf-8")
+
+    def _commit(self):
+        self.offset, self.checksum = self._read
+
+    def _rows(self, final=False):
+        self._read = (self.offset, self.checksum)
+        if self._tail:
+            # Read again from its start below
+            self.rows -= 1
+            self._tail = False
+        with open(self.path, "rb") as handle:
+            handle.seek(self.offset)
+            lines = self._lines(handle, final)
+            if self.csv:
+                rows = csv.reader(lines)
+                if self.header is None:
+                    self.header = next(rows, None)
+                    if self.header is None:
+                        return
+                    missing = [column for column in (self.key_column, *self.columns) if column not in self.header]
+                    if missing:
+                        raise ValueError(f"{self.path}: header has no {', '.join(missing)} column")
+                    self._commit()
+                cells = [(self.header.index(column), _csv_converter(column)) for column in self.columns]
+                key_position = self.header.index(self.key_column)
+                for row in rows:
+                    if row:
+                        values = [row[position] if convert is None else convert(row[position])
+                                  for position, convert in cells]
+                        self._commit()
+                        yield self._pair(row[key_position], values)
+                    else:
+                        self._commit()
+            else:
+                for line in lines:
+                    if line.strip():
+                        item = json.loads(line)
+                        try:
+                            values = [item[column] for column in self.columns]
+                            key = item[self.key_column]
+                        except KeyError as missing:
+                            raise ValueError(f"{self.path}: row has no {missing} field: {line.strip()[:80]}") from None
+                        self._commit()
+                        yield self._pair(key, values)
+                    else:
+                        self._commit()
+
+    def _pair(self, key, values):
+        self.rows += 1
+        if self.name == "faq":
+            return key, values[0]
+        return key, dict(zip(self.columns, values))
+
+    def prefix_checksum(self) -> int:
+        """CRC-32 of the file's first `offset` bytes as they are on disk now"""
+        checksum = 0
+        remaining = self.offset
+        with open(self.path, "rb") as handle:
+            while remaining:
+                block = handle.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                checksum = zlib.crc32(block, checksum)
+                remaining -= len(block)
+        return checksum
+
+
+def _rows(reader):
+    for chunk in reader.chunks(final=True):
+        yield from chunk
+
+
+def _load(directory: str, compact: bool):
+    files = source_files(directory)
+    if not files:
+        raise ValueError(f"No exports in {directory} (expected {', '.join(SOURCES)} as .jsonl or .csv)")
+    readers = {name: ExportReader(name, path) for name, path in files.items()}
+
+    def rows(name):
+        return _rows(readers[name]) if name in readers else ()
+
+    if compact:
+        appointments = RecordTable(APPOINTMENT_FIELDS, APPOINTMENT_CATEGORIES, rows("appointments"))
+        lab_results = RecordTable(LAB_RESULT_FIELDS, LAB_RESULT_CATEGORIES, rows("lab_results"))
+    else:
+        appointments = dict(rows("appointments"))
+        lab_results = dict(rows("lab_results"))
+    store = MemoryStore(dict(rows("faq")), appointments, lab_results, dict(rows("doctors")))
+    # Hashed here, off the request path (DataReloader runs this before the swap)
+    store.compute_data_version()
+    return store, readers
+
+
+def load_store(directory: str, compact: bool = COMPACT_RECORDS) -> MemoryStore:
+    """In-memory store built from the exports in `directory`, one chunk at a time"""
+    return _load(directory, compact)[0]
+
+
+def apply_rows(store, name: str, items):
+    """Insert or replace (key, value) pairs through the store's put_* methods"""
+    if name == "appointments":
+        store.put_appointments(items)
+    elif name == "lab_results":
+        store.put_lab_results(items)
+    elif name == "doctors":
+        store.put_doctors(items)
+    else:
+        store.put_faqs(items)
+
+
+def load_into(store, directory: str) -> dict:
+    """Stream the exports in `directory` into an existing store (e.g. SQLiteStore); returns rows per export"""
+    counts = {}
+    for name, path in source_files(directory).items():
+        reader = ExportReader(name, path)
+        for chunk in reader.chunks(final=True):
+            apply_rows(store, name, chunk)
+        counts[name] = reader.rows
+    return counts
+
+
+def write_export(path: str, name: str, items, append: bool = False):
+    """Write (key, value) pairs as an export, or append them to one; the format follows the extension"""
+    key_column, columns = SOURCES[name]
+    with open(path, "a" if append else "w", newline="") as handle:
+        if path.endswith(".csv"):
+            writer = csv.writer(handle, lineterminator="\n")
+            if not append:
+                writer.writerow([key_column, *columns])
+            for key, value in items:
+                record = {"answer": value} if name == "faq" else value
+                writer.writerow([key, *(_to_csv(column, record[column]) for column in columns)])
+        else:
+            for key, value in items:
+                record = {"answer": value} if name == "faq" else value
+                handle.write(json.dumps({key_column: key, **{column: record[column] for column in columns}}) + "\n")
+
+
+class DataReloader:
+    """
+    Serves a data directory through set_store() and keeps it current.
+    check() looks for changes once; start() checks every `interval` seconds
+    on a daemon thread. A failed check leaves the current store serving and
+    is kept in `last_error`.
+    """
+
+    def __init__(self, directory: str, interval: float = 2.0, compact: bool = COMPACT_RECORDS):
+        self.directory = directory
+        self.interval = interval
+        self.compact = compact
+        self.store = None
+        self.reloads = 0
+        self.appends = 0
+        self.last_error = None
+        self._readers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def load(self) -> MemoryStore:
+        """Build a store from every export, then swap it in"""
+        with self._lock:
+            files = source_files(self.directory)
+            stats = {name: self._stat(path) for name, path in files.items()}
+            store, readers = _load(self.directory, self.compact)
+            self._readers, self._stats = readers, stats
+            self.store = store
+            self.reloads += 1
+            set_store(store)
+            return store
+
+    def check(self) -> str:
+        """Apply changes since the last check: returns "append", "reload" or None"""
+        with self._lock:
+            files = source_files(self.directory)
+            if files != {name: reader.path for name, reader in self._readers.items()}:
+                changed = "reload"
+            else:
+                changed = None
+                appended = []
+                for name, reader in self._readers.items():
+                    stat = self._stat(reader.path)
+                    if stat == self._stats[name]:
+                        continue
+                    inode, size, _ = stat
+                    if inode == self._stats[name][0] and size >= reader.offset and \
+                            reader.prefix_checksum() == reader.checksum:
+                        appended.append((name, stat))
+                    else:
+                        changed = "reload"
+                        break
+                if changed is None and appended:
+                    for name, stat in appended:
+                        for chunk in self._readers[name].chunks():
+                            apply_rows(self.store, name, chunk)
+                        self._stats[name] = stat
+                    self.appends += 1
+                    return "append"
+        if changed == "reload":
+            self.load()
+        return changed
+
+    def start(self):
+        """Load if nothing is loaded yet, then watch in the background"""
+        if self.store is None:
+            self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="data-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+                self.last_error = None
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+
+
+if __name__ == "__main__":
+    # python -m src.loader exports/               load and report row counts
+    # python -m src.loader exports/ --db clinic.db  stream the exports into SQLite
+    # python -m src.loader --export exports/      write the src/data.py literals as JSONL exports
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Load clinic data exports")
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--db", help="stream the exports into this SQLite database")
+    parser.add_argument("--export", metavar="DIRECTORY", help="write src/data.py as JSONL exports")
+    args = parser.parse_args()
+
+    if args.export:
+        from src.data import FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS
+
+        os.makedirs(args.export, exist_ok=True)
+        for name, records in [("faq", FAQ_DATA), ("appointments", APPOINTMENTS),
+                              ("lab_results", LAB_RESULTS), ("doctors", DOCTORS)]:
+            write_export(os.path.join(args.export, name + ".jsonl"), name, records.items())
+        print(f"Wrote {args.export}")
+    elif args.directory:
+        start = time.perf_counter()
+        if args.db:
+            from src.storage import SQLiteStore
+
+            counts = load_into(SQLiteStore(args.db), args.directory)
+        else:
+            store, readers = _load(args.directory, COMPACT_RECORDS)
+            counts = {name: reader.rows for name, reader in readers.items()}
+        print(", ".join(f"{rows:,} {name}" for name, rows in counts.items()),
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        parser.error("give a directory to load or --export DIRECTORY")
@@ -1,184 +1,194 @@
 """
 MCP Server that exposes healthcare data as tools.
-The agent will connect to this server to access our 4 data sources.
+The agent will connect to this server to access our data sources.
+Tool schemas, handlers and formatters live in src/tools.py.
+Every tool call is timed and counted; see the server_stats tool.
 """
 
 import asyncio
 import json
+import os
+import time
 from mcp.server import Server
-from mcp.types import Tool, TextContent
-from src.data import FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS
+from mcp.types import Resource, Tool, TextContent
+from src.cache import LRUCache
+from src.loader import RELOAD_INTERVAL, DataReloader
+from src.metrics import ToolMetrics
+from src.storage import get_store
+from src import tools
+from src.tools import REGISTRY, string_property
 
 
 # Create MCP server instance
 app = Server("healthcare-assistant")
 
+# Per-tool memoization of formatted results, "not found" answers included
+TOOL_CACHE_SIZE = 1024
+_tool_caches = {name: LRUCache(max_entries=TOOL_CACHE_SIZE) for name in REGISTRY}
+
+# Per-tool call counts and latency histograms; HEALTHCARE_METRICS=0 turns recording off
+metrics = ToolMetrics()
+metrics.enabled = os.getenv("HEALTHCARE_METRICS", "1") != "0"
+
+# Server-only tool, not part of the shared registry the Claude demo uses
+SERVER_STATS_TOOL = Tool(
+    name="server_stats",
+    description="Report this server's per-tool call counts, error and not-found counts, latency percentiles and cache hit rates.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "format": string_property("'json' (default) or 'prometheus'")
+        }
+    }
+)
+
+# Built once at startup; list_tools() returns the same list every time
+TOOL_LIST = [
+    Tool(name=spec.name, description=spec.description, inputSchema=spec.input_schema)
+    for spec in REGISTRY.values()
+] + [SERVER_STATS_TOOL]
+
+RESOURCE_LIST = [
+    Resource(uri="stats://tools", name="tool_stats", mimeType="application/json",
+             description="Per-tool counters, latency percentiles and cache hit rates"),
+    Resource(uri="stats://prometheus", name="tool_metrics", mimeType="text/plain",
+             description="Per-tool metrics in Prometheus text format"),
+]
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """
-    Define the 4 tools available to the agent.
-    Each tool corresponds to one data source.
+    Return the tools available to the agent.
+    The lookup tools fetch records by key, the find_* tools search
+    appointments and lab results through the store's secondary indexes.
     """
-    return [
-        Tool(
-            name="check_faq",
-            description="Search frequently asked questions about clinic hours, location, insurance, services, and policies. Use this for general information queries.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "question": {
-                        "type": "string",
-                        "description": "The question or topic to search for (e.g., 'hours', 'insurance', 'location')"
-                    }
-                },
-                "required": ["question"]
-            }
-        ),
-        Tool(
-            name="lookup_appointment",
-            description="Look up appointment details by appointment ID. Returns patient name, doctor, date, time, status, and reason for visit. Appointment IDs follow format APT-XXX.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "appointment_id": {
-                        "type": "string",
-                        "description": "The appointment ID (e.g., 'APT-101')"
-                    }
-                },
-                "required": ["appointment_id"]
-            }
-        ),
-        Tool(
-            name="lookup_lab_result",
-            description="Look up laboratory test results by lab ID. Returns test type, status, urgency, and result summary. Lab IDs follow format LAB-XXX.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "lab_id": {
-                        "type": "string",
-                        "description": "The lab result ID (e.g., 'LAB-201')"
-                    }
-                },
-                "required": ["lab_id"]
-            }
-        ),
-        Tool(
-            name="find_doctor",
-            description="Get information about a specific doctor including specialty, availability, languages spoken, and whether they're accepting new patients.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "doctor_name": {
-                        "type": "string",
-                        "description": "The doctor's name (e.g., 'Dr. Smith', 'Dr. Johnson', 'Dr. Lee')"
-                    }
-                },
-                "required": ["doctor_name"]
-            }
-        )
-    ]
+    return TOOL_LIST
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """
-    Execute the requested tool and return results.
-    This is where the actual data lookup happens.
+    Execute the requested tool, reusing the memoized result when the same
+    normalized arguments were answered under the current store version.
+    Misses run on a worker thread so a slow query doesn't block the event
+    loop; the cache lookup stays on the loop. Cache hits are timed too, so
+    the percentiles show what callers see.
     """
-    
-    if name == "check_faq":
-        question = arguments["question"].lower().strip()
-        
-        # Search for matching FAQ
-        for key, answer in FAQ_DATA.items():
-            if question in key or key in question:
-                return [TextContent(
-                    type="text",
-                    text=f"FAQ Answer: {answer}"
-                )]
-        
-        # No match found
-        return [TextContent(
-            type="text",
-            text="I couldn't find an answer to that question in our FAQ. Please call us at 555-1234 for assistance."
-        )]
-    
-    elif name == "lookup_appointment":
-        apt_id = arguments["appointment_id"].upper()
-        
-        if apt_id in APPOINTMENTS:
-            apt = APPOINTMENTS[apt_id]
-            response = (
-                f"Appointment {apt_id}:\n"
-                f"Patient: {apt['patient']}\n"
-                f"Doctor: {apt['doctor']}\n"
-                f"Date: {apt['date']}\n"
-                f"Time: {apt['time']}\n"
-                f"Status: {apt['status']}\n"
-                f"Reason: {apt['reason']}"
-            )
-            return [TextContent(type="text", text=response)]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Appointment {apt_id} not found. Please verify the appointment ID."
-            )]
-    
-    elif name == "lookup_lab_result":
-        lab_id = arguments["lab_id"].upper()
-        
-        if lab_id in LAB_RESULTS:
-            lab = LAB_RESULTS[lab_id]
-            urgency = "!!! URGENT !!!" if lab["urgent"] else "Normal priority"
-            response = (
-                f"Lab Result {lab_id}:\n"
-                f"Patient: {lab['patient']}\n"
-                f"Test: {lab['test_type']}\n"
-                f"Ordered: {lab['ordered_date']}\n"
-                f"Status: {lab['status']}\n"
-                f"Priority: {urgency}\n"
-                f"Summary: {lab['result_summary']}"
-            )
-            return [TextContent(type="text", text=response)]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Lab result {lab_id} not found. Please verify the lab ID."
-            )]
-    
-    elif name == "find_doctor":
-        doctor_name = arguments["doctor_name"]
-        
-        if doctor_name in DOCTORS:
-            doc = DOCTORS[doctor_name]
-            accepting = "Yes ✓" if doc["accepting_new_patients"] else "No (full schedule)"
-            response = (
-                f"{doc['full_name']}:\n"
-                f"Specialty: {doc['specialty']}\n"
-                f"Available: {', '.join(doc['available_days'])}\n"
-                f"Accepting new patients: {accepting}\n"
-                f"Languages: {', '.join(doc['languages'])}\n"
-                f"Experience: {doc['years_experience']} years"
-            )
-            return [TextContent(type="text", text=response)]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Doctor {doctor_name} not found. Available doctors: Dr. Smith, Dr. Johnson, Dr. Lee"
-            )]
-    
-    else:
+    if name == SERVER_STATS_TOOL.name:
+        return [TextContent(type="text", text=render_stats((arguments or {}).get("format")))]
+
+    spec = REGISTRY.get(name)
+    if spec is None:
         return [TextContent(
             type="text",
             text=f"Unknown tool: {name}"
         )]
 
+    start = time.perf_counter()
+    try:
+        # Entries from older store versions are never matched again and age out of the LRU
+        cache = _tool_caches[name]
+        key = (get_store().cache_version, spec.key(arguments))
+        cached = cache.get(key)
+        if cached is None:
+            text, found = await asyncio.to_thread(spec.run, arguments)
+            cached = ([TextContent(type="text", text=text)], found)
+            cache.put(key, cached)
+    except Exception:
+        metrics.record(name, time.perf_counter() - start, error=True)
+        raise
+    result, found = cached
+    metrics.record(name, time.perf_counter() - start, found=found)
+    return result
 
-async def main():
-    """Run the MCP server"""
+
+async def run_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Execute the requested tool without memoization"""
+    spec = REGISTRY.get(name)
+    if spec is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    text = await asyncio.to_thread(spec, **arguments)
+    return [TextContent(type="text", text=text)]
+
+
+def tool_cache_stats() -> dict:
+    """Hit/miss/eviction counters per tool"""
+    return {
+        name: cache.stats.as_dict()
+        for name, cache in _tool_caches.items()
+        if cache.stats.hits or cache.stats.misses
+    }
+
+
+def render_stats(format: str = None) -> str:
+    """Tool metrics as JSON (with cache counters) or Prometheus text"""
+    if format == "prometheus":
+        return metrics.prometheus()
+    return json.dumps({"tools": metrics.snapshot(), "cache": tool_cache_stats()}, indent=2)
+
+
+@app.list_resources()
+async def list_resources() -> list[Resource]:
+    return RESOURCE_LIST
+
+
+@app.read_resource()
+async def read_resource(uri) -> str:
+    if str(uri) == "stats://prometheus":
+        return render_stats("prometheus")
+    if str(uri) == "stats://tools":
+        return render_stats()
+    raise ValueError(f"Unknown resource: {uri}")
+
+
+def create_http_app(json_response: bool = False):
+    """
+    ASGI app serving many concurrent MCP sessions from this one process:
+    streamable HTTP at /mcp, the legacy SSE transport at /sse and
+    Prometheus metrics at /metrics.
+    """
+    import contextlib
+    from mcp.server.sse import SseServerTransport
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse, Response
+    from starlette.routing import Mount, Route
+
+    session_manager = StreamableHTTPSessionManager(app=app, json_response=json_response)
+    sse = SseServerTransport("/messages/")
+
+    async def handle_streamable_http(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+    async def handle_sse(request):
+        async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+        return Response()
+
+    async def handle_metrics(request):
+        return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_):
+        async with session_manager.run():
+            yield
+
+    return Starlette(
+        routes=[
+            Mount("/mcp", app=handle_streamable_http),
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+            Route("/metrics", endpoint=handle_metrics, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+async def serve_stdio():
+    """Serve a single client over stdin/stdout"""
     from mcp.server.stdio import stdio_server
-    
+
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
             read_stream,
@@ -187,5 +197,39 @@ async def main():
         )
 
 
+async def serve_http(host: str, port: int):
+    """Serve streamable HTTP and SSE clients from one long-lived process"""
+    import uvicorn
+
+    config = uvicorn.Config(create_http_app(), host=host, port=port, log_level="warning")
+    await uvicorn.Server(config).serve()
+
+
+async def main():
+    """Run the MCP server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Healthcare MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL,
+                        help="seconds between checks of HEALTHCARE_DATA_DIR for changes (0: never)")
+    parser.add_argument("--max-result-tokens", type=int, default=tools.MAX_RESULT_TOKENS,
+                        help="end a search tool's page before its text passes this many tokens")
+    args = parser.parse_args()
+    tools.MAX_RESULT_TOKENS = args.max_result_tokens
+
+    # Watch the exports so data changes don't need a restart that drops every session
+    data_dir = os.environ.get("HEALTHCARE_DATA_DIR")
+    if data_dir and not os.environ.get("HEALTHCARE_DB") and args.reload_interval > 0:
+        DataReloader(data_dir, interval=args.reload_interval).start()
+
+    if args.transport == "http":
+        await serve_http(args.host, args.port)
+    else:
+        await serve_stdio()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
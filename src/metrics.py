@@ -0,0 +1,135 @@
+"""
+Per-tool call metrics for the MCP server.
+Counts calls, errors and "not found" answers and keeps a fixed-bucket latency
+histogram per tool, from which p50/p95/p99 are estimated. Recording a call is
+a bisect plus a few integer increments, cheap enough to leave on.
+"""
+
+import bisect
+import threading
+import time
+
+
+# Upper bounds in seconds (Prometheus "le" buckets); the last bucket is +Inf
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class LatencyHistogram:
+    """Per-bucket counts plus sum and count, like a Prometheus histogram"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the rank"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return LATENCY_BUCKETS[-1]
+
+
+class ToolStats:
+    __slots__ = ("calls", "errors", "not_found", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.not_found = 0
+        self.latency = LatencyHistogram()
+
+
+class ToolMetrics:
+    """Thread-safe registry of ToolStats keyed by tool name"""
+
+    def __init__(self):
+        self.enabled = True
+        self.started_at = time.time()
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, seconds: float, found: bool = True, error: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = ToolStats()
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            elif not found:
+                stats.not_found += 1
+            stats.latency.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._tools.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> dict:
+        """Counters and latency percentiles (milliseconds) per tool"""
+        uptime = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            return {
+                tool: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "not_found": stats.not_found,
+                    "calls_per_second": round(stats.calls / uptime, 4),
+                    "mean_ms": round(stats.latency.total / stats.calls * 1e3 if stats.calls else 0.0, 4),
+                    "p50_ms": round(stats.latency.percentile(0.50) * 1e3, 4),
+                    "p95_ms": round(stats.latency.percentile(0.95) * 1e3, 4),
+                    "p99_ms": round(stats.latency.percentile(0.99) * 1e3, 4),
+                }
+                for tool, stats in sorted(self._tools.items())
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = [
+            "# HELP mcp_tool_calls_total Tool invocations.",
+            "# TYPE mcp_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for tool, stats in tools:
+                lines.append(f'mcp_tool_calls_total{{tool="{tool}"}} {stats.calls}')
+            lines += ["# HELP mcp_tool_errors_total Tool invocations that raised.",
+                      "# TYPE mcp_tool_errors_total counter"]
+            for tool, stats in tools:
+                lines.append(f'mcp_tool_errors_total{{tool="{tool}"}} {stats.errors}')
+            lines += ["# HELP mcp_tool_not_found_total Tool invocations that found no record.",
+                      "# TYPE mcp_tool_not_found_total counter"]
+            for tool, stats in tools:
+                lines.append(f'mcp_tool_not_found_total{{tool="{tool}"}} {stats.not_found}')
+            lines += ["# HELP mcp_tool_latency_seconds Tool latency.",
+                      "# TYPE mcp_tool_latency_seconds histogram"]
+            for tool, stats in tools:
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS, stats.latency.counts):
+                    cumulative += bucket_count
+                    lines.append(f'mcp_tool_latency_seconds_bucket{{tool="{tool}",le="{bound}"}} {cumulative}')
+                lines.append(f'mcp_tool_latency_seconds_bucket{{tool="{tool}",le="+Inf"}} {stats.latency.count}')
+                lines.append(f'mcp_tool_latency_seconds_sum{{tool="{tool}"}} {stats.latency.total}')
+                lines.append(f'mcp_tool_latency_seconds_count{{tool="{tool}"}} {stats.latency.count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,117 @@
+"""
+Compact in-memory tables for appointments and lab results.
+A dict per record repeats every field name and, for data loaded from files,
+its own copy of every status, doctor and test-type string: several hundred
+bytes per row. RecordTable stores one column per field instead. Categorical
+fields are dictionary-encoded (each distinct value kept once, rows hold a
+4-byte code); free-text fields are plain lists.
+
+A RecordTable is a read-only mapping of record id -> Record, and a Record is
+a read-only mapping of field -> value, so tool code keeps using
+`store.get_appointment(apt_id)["status"]` unchanged.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    """
+    View of one row of a RecordTable. Reads the table's current row, so a
+    put() that replaces the record is visible through views taken before it.
+    Use dict(record) for a snapshot.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field):
+        column, values = self._table._readers[field]
+        value = column[self._row]
+        return value if values is None else values[value]
+
+    def __iter__(self):
+        return iter(self._table.fields)
+
+    def __len__(self):
+        return len(self._table.fields)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class RecordTable(Mapping):
+    """
+    Records with a fixed set of fields, stored column by column.
+    `categorical` names the fields to dictionary-encode: those with few
+    distinct values (status, doctor, test type, dates). Values that a put()
+    replaces stay in the dictionary; it only grows.
+    """
+
+    def __init__(self, fields, categorical=(), items=()):
+        self.fields = tuple(fields)
+        self._ids = {}                 # record id -> row
+        self._row_ids = []             # row -> record id
+        self._codes = {}               # categorical field -> {value: code}
+        self._readers = {}             # field -> (column, code -> value list or None)
+        for field in self.fields:
+            if field in categorical:
+                self._codes[field] = {}
+                self._readers[field] = (array("I"), [])
+            else:
+                self._readers[field] = ([], None)
+        # Per field, in field order: (column, values) and the value -> code dict or None
+        self._columns = [self._readers[field] for field in self.fields]
+        self._field_codes = [self._codes.get(field) for field in self.fields]
+        for record_id, record in items:
+            self.put(record_id, record)
+
+    def __getitem__(self, record_id):
+        return Record(self, self._ids[record_id])
+
+    def get(self, record_id, default=None):
+        # Skips Mapping.get's KeyError round trip on misses
+        row = self._ids.get(record_id)
+        return default if row is None else Record(self, row)
+
+    def column(self, field) -> list:
+        """Every row's value of one field, in row order (the order of iteration)"""
+        column, values = self._readers[field]
+        if values is None:
+            return list(column)
+        return [values[code] for code in column]
+
+    def __contains__(self, record_id):
+        return record_id in self._ids
+
+    def __iter__(self):
+        return iter(self._row_ids)
+
+    def __len__(self):
+        return len(self._row_ids)
+
+    def put(self, record_id, record):
+        """Add a record, or overwrite the row of an existing id in place"""
+        # Read every field first so a record missing one leaves the table untouched
+        row_values = [record[field] for field in self.fields]
+        row = self._ids.get(record_id)
+        for (column, values), codes, value in zip(self._columns, self._field_codes, row_values):
+            if codes is not None:
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(values)
+                    values.append(value)
+                value = code
+            if row is None:
+                column.append(value)
+            else:
+                column[row] = value
+        if row is None:
+            # Publish the id last: concurrent readers never see a row without its columns
+            self._ids[record_id] = len(self._row_ids)
+            self._row_ids.append(record_id)
+
+    __setitem__ = put
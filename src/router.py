@@ -0,0 +1,162 @@
+"""
+Deterministic fast path in front of the agent loop.
+Recognizes single-intent queries (one APT-/LAB- id, one doctor or one FAQ
+topic), scores how sure it is, and answers high-confidence ones straight
+from the tool data with a template. Anything compound, action-like or
+unclear, or a tool without a template, falls through to the LLM.
+"""
+
+import re
+from dataclasses import dataclass
+
+from src.faq_index import tokenize
+from src.storage import get_store
+
+
+# Routes scoring below this go to the LLM
+ROUTER_THRESHOLD = 0.8
+
+_APPOINTMENT_RE = re.compile(r"\bAPT-\d+\b", re.IGNORECASE)
+_LAB_RE = re.compile(r"\bLAB-\d+\b", re.IGNORECASE)
+_DOCTOR_RE = re.compile(r"\bdr\.?\s+([a-z][a-z'-]+)", re.IGNORECASE)
+
+# Words that carry no intent of their own (after tokenize's plural folding)
+_FILLER = frozenset("""
+    a an the is are am was be do doe did you your i me my we our us what s how where when which
+    can could please tell about of for to in on at it there any know want like would give show
+    check statu info information detail hi hello hey thank
+""".split())
+
+# Follow-ups that need reasoning or an action, not just a record
+_NEEDS_LLM = frozenset("""
+    reschedule cancel change move book schedule why mean explain should worried normal
+    refill prescription pay bill cost price compare recommend
+""".split())
+
+# Signs of more than one question in one query
+_COMPOUND = frozenset("and also plus then".split())
+
+# Words a doctor card answers by itself (after tokenize's plural folding); any
+# other word ("accept Aetna", "a good doctor") is a question for the LLM
+_DOCTOR_CARD_WORDS = frozenset("""
+    doctor specialty specialist specialize special available availability day work accepting accept
+    new patient language speak experience experienced year who
+""".split())
+
+
+def _appointment_answer(result):
+    apt_id, apt = result
+    if apt is None:
+        return None
+    return (f"Appointment {apt_id} is {apt['status']}: {apt['patient']} with {apt['doctor']} "
+            f"on {apt['date']} at {apt['time']} ({apt['reason']}).")
+
+
+def _lab_result_answer(result):
+    lab_id, lab = result
+    if lab is None:
+        return None
+    urgent = ", marked urgent" if lab["urgent"] else ""
+    return (f"Lab result {lab_id} ({lab['test_type']} for {lab['patient']}, ordered {lab['ordered_date']}) "
+            f"is {lab['status']}{urgent}. Summary: {lab['result_summary']}.")
+
+
+def _doctor_answer(result):
+    _, doc = result
+    if doc is None:
+        return None
+    accepting = "is accepting" if doc["accepting_new_patients"] else "is not accepting"
+    return (f"{doc['full_name']} ({doc['specialty']}, {doc['years_experience']} years of experience) "
+            f"is available {', '.join(doc['available_days'])}, {accepting} new patients "
+            f"and speaks {', '.join(doc['languages'])}.")
+
+
+# Answers built from each routed tool's handler data; None (nothing found)
+# falls back to the tool's own formatted "not found" message
+TEMPLATES = {
+    "check_faq": lambda answer: answer,
+    "lookup_appointment": _appointment_answer,
+    "lookup_lab_result": _lab_result_answer,
+    "find_doctor": _doctor_answer,
+}
+
+
+@dataclass(frozen=True)
+class Route:
+    tool: str
+    arguments: dict
+    confidence: float
+
+
+def _content(tokens) -> set:
+    return {token for token in tokens if token not in _FILLER}
+
+
+def _sentences(query: str) -> int:
+    return sum(1 for part in re.split(r"[.?!]+", query) if part.strip())
+
+
+def route(query: str):
+    """
+    Best single-intent Route for `query` with its confidence, or None.
+    Two or more intents (say an appointment and the hours) return a Route
+    with confidence 0 so the caller can report why it fell through.
+    """
+    appointments = {match.upper() for match in _APPOINTMENT_RE.findall(query)}
+    labs = {match.upper() for match in _LAB_RE.findall(query)}
+    doctors = {f"Dr. {name.title()}" for name in _DOCTOR_RE.findall(query)}
+
+    # Whatever the ids and names don't explain is left for the FAQ and the penalties
+    remainder = _DOCTOR_RE.sub(" ", _LAB_RE.sub(" ", _APPOINTMENT_RE.sub(" ", query)))
+    tokens = tokenize(remainder)
+    content = _content(tokens) - {"dr"}
+
+    candidates = [Route("lookup_appointment", {"appointment_id": apt_id}, 0.95) for apt_id in sorted(appointments)]
+    candidates += [Route("lookup_lab_result", {"lab_id": lab_id}, 0.95) for lab_id in sorted(labs)]
+    store = get_store()
+    candidates += [
+        Route("find_doctor", {"doctor_name": name}, 0.9 if store.match_doctor(name) is not None else 0.7)
+        for name in sorted(doctors)
+    ]
+
+    matched = store.faq_index.match(remainder) if content else None
+    if matched is not None:
+        key_content = _content(tokenize(matched[0]))
+        overlap = len(key_content & content) / len(key_content | content) if key_content | content else 0.0
+        if overlap:
+            candidates.append(Route("check_faq", {"question": query}, 0.5 + 0.45 * overlap))
+            # The FAQ topic explains its own words
+            content -= key_content
+
+    if not candidates:
+        return None
+    best = max(candidates, key=lambda candidate: candidate.confidence)
+    if len(candidates) > 1:
+        return Route(best.tool, best.arguments, 0.0)
+
+    confidence = best.confidence
+    if content & _NEEDS_LLM:
+        confidence -= 0.5
+    if content & _COMPOUND or set(tokens) & _COMPOUND or _sentences(remainder) > 1:
+        confidence -= 0.3
+    if best.tool == "find_doctor":
+        # The card only answers questions about its own fields
+        if content - _DOCTOR_CARD_WORDS:
+            confidence = 0.0
+    elif best.tool != "check_faq":
+        confidence -= 0.05 * max(0, len(content) - 2)
+    return Route(best.tool, best.arguments, round(max(confidence, 0.0), 3))
+
+
+def answer(query: str, function_map, threshold: float = ROUTER_THRESHOLD):
+    """(response text, route) when the query can skip the LLM, else None; function_map holds ToolSpecs"""
+    best = route(query)
+    if best is None or best.confidence < threshold:
+        return None
+    spec = function_map.get(best.tool)
+    template = TEMPLATES.get(best.tool)
+    if template is None or getattr(spec, "handler", None) is None:
+        return None
+    data = spec.handler(**best.arguments)
+    text = template(data)
+    return (text if text is not None else spec.formatter(data)), best
@@ -0,0 +1,187 @@
+"""
+Multi-turn chat sessions with bounded history.
+A Session keeps the conversation as turns: the user's message, the tool
+exchanges it caused and the final answer. After each turn the history is
+fitted to a token budget. Older turns lose their tool exchanges first (the
+answer already carries what mattered), then the oldest turns are dropped
+into a short extractive summary that goes out as the system prompt. The
+most recent turns always stay verbatim.
+
+Sessions live in an LRU with an idle timeout, so memory stays bounded by
+SESSION_LIMIT sessions of at most HISTORY_TOKENS each.
+"""
+
+import json
+import os
+import threading
+
+from src.cache import LRUCache
+from src.tools import CHARS_PER_TOKEN
+
+
+# Sessions kept at once; the least recently used one is forgotten first
+SESSION_LIMIT = int(os.environ.get("SESSION_LIMIT", 10_000))
+
+# Seconds a session may sit idle before it is forgotten
+SESSION_TTL = float(os.environ.get("SESSION_TTL", 1800))
+
+# Token budget for the history a session sends with each new message
+HISTORY_TOKENS = int(os.environ.get("SESSION_HISTORY_TOKENS", 4000))
+
+# Token budget for one exchange's own tool rounds before older results are elided
+TURN_TOKENS = int(os.environ.get("SESSION_TURN_TOKENS", 8000))
+
+# Latest turns never collapsed or dropped
+RECENT_TURNS = 2
+
+# Token budget for the summary of dropped turns, and characters kept per question/answer
+SUMMARY_TOKENS = 300
+SUMMARY_CHARS = 200
+
+ELIDED = "[Earlier tool result removed to save space; call the tool again if it's needed.]"
+
+
+def block_dict(block) -> dict:
+    """A content block as a plain dict (SDK objects hold more than the API needs back)"""
+    if isinstance(block, dict):
+        return block
+    if hasattr(block, "model_dump"):
+        return block.model_dump(exclude_none=True)
+    return dict(vars(block))
+
+
+def _block_chars(block: dict) -> int:
+    if block.get("type") == "tool_use":
+        return len(block["name"]) + len(json.dumps(block["input"]))
+    content = block.get("text", block.get("content", ""))
+    if isinstance(content, list):
+        return sum(_block_chars(item) for item in content)
+    return len(content)
+
+
+def message_tokens(message: dict) -> int:
+    """Estimated tokens of one message, at CHARS_PER_TOKEN characters per token"""
+    content = message["content"]
+    chars = len(content) if isinstance(content, str) else sum(_block_chars(block_dict(block)) for block in content)
+    return chars // CHARS_PER_TOKEN + 1
+
+
+def elide_tool_results(messages: list, budget: int = TURN_TOKENS, start: int = 0):
+    """
+    While messages[start:] is over budget, replace the content of tool
+    results before the newest round with a short note. The tool_result
+    blocks stay, since the API pairs each one with its tool_use.
+    """
+    total = sum(message_tokens(message) for message in messages[start:])
+    rounds = [i for i in range(start, len(messages)) if _is_tool_results(messages[i])]
+    for i in rounds[:-1]:
+        if total <= budget:
+            return
+        message = messages[i]
+        before = message_tokens(message)
+        message["content"] = [
+            {**block, "content": ELIDED} if block.get("type") == "tool_result" else block
+            for block in message["content"]
+        ]
+        total -= before - message_tokens(message)
+
+
+def _is_tool_results(message: dict) -> bool:
+    content = message["content"]
+    return message["role"] == "user" and not isinstance(content, str) and any(
+        block_dict(block).get("type") == "tool_result" for block in content
+    )
+
+
+def _shorten(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= SUMMARY_CHARS else text[:SUMMARY_CHARS - 3] + "..."
+
+
+class Session:
+    """
+    One conversation. `turns` holds the kept turns, each a list of messages
+    from the user's message to the final answer; `summary` holds one line per
+    dropped turn, oldest first. Hold `lock` while running a turn.
+    """
+
+    def __init__(self, session_id: str, history_tokens: int = HISTORY_TOKENS):
+        self.id = session_id
+        self.history_tokens = history_tokens
+        self.turns = []
+        self.summary = []
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def messages(self) -> list:
+        """The kept history, flattened, to send ahead of a new message"""
+        return [message for turn in self.turns for message in turn]
+
+    def system(self):
+        """System prompt carrying the summary of dropped turns, or None"""
+        if not self.summary:
+            return None
+        return "Summary of earlier messages in this conversation:\n" + "\n".join(self.summary)
+
+    def tokens(self) -> int:
+        return sum(message_tokens(message) for turn in self.turns for message in turn)
+
+    def add_turn(self, messages: list):
+        """Record a finished turn (user message first, answer last) and fit the history"""
+        self.turns.append([{**message, "content": self._content(message["content"])} for message in messages])
+        self.fit()
+
+    @staticmethod
+    def _content(content):
+        return content if isinstance(content, str) else [block_dict(block) for block in content]
+
+    def fit(self):
+        """Collapse, then drop, the oldest turns until the history is within budget"""
+        total = self.tokens()
+        stale = max(len(self.turns) - RECENT_TURNS, 0)
+        for turn in self.turns[:stale]:
+            if total <= self.history_tokens:
+                return
+            if len(turn) > 2:
+                before = sum(map(message_tokens, turn))
+                turn[1:-1] = []
+                total -= before - sum(map(message_tokens, turn))
+        while total > self.history_tokens and len(self.turns) > RECENT_TURNS:
+            question, *_, answer = self.turns.pop(0)
+            total -= message_tokens(question) + message_tokens(answer)
+            self.summary.append(f"User: {_shorten(question['content'])} | Assistant: {_shorten(answer['content'])}")
+            self.dropped += 1
+        while sum(len(line) for line in self.summary) > SUMMARY_TOKENS * CHARS_PER_TOKEN:
+            self.summary.pop(0)
+
+
+class SessionStore:
+    """
+    Sessions by id in an LRU with an idle timeout (src/cache.py LRUCache).
+    A forgotten session starts over the next time its id is used.
+    """
+
+    def __init__(self, max_sessions: int = SESSION_LIMIT, ttl: float = SESSION_TTL,
+                 history_tokens: int = HISTORY_TOKENS):
+        self.history_tokens = history_tokens
+        self._sessions = LRUCache(max_entries=max_sessions, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @property
+    def stats(self):
+        return self._sessions.stats
+
+    def get(self, session_id: str) -> Session:
+        """The session for `session_id`, created if needed; each use restarts its idle timeout"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id, self.history_tokens)
+            self._sessions.put(session_id, session)
+            return session
+
+    def end(self, session_id: str):
+        self._sessions.invalidate(session_id)
@@ -0,0 +1,934 @@
+"""
+Storage backends for the healthcare data.
+The MCP server and the Claude demo read records through get_store() instead of
+importing the dicts in src/data.py directly, so the data can live in SQLite.
+
+Backends:
+- MemoryStore: wraps Python dicts (today's src/data.py literals), or with
+  compact=True keeps appointments and lab results in column tables
+  (src/records.py) at a fraction of the memory
+- SQLiteStore: on-disk tables with primary-key indexes, rows loaded on lookup
+
+Both keep secondary indexes over doctor, patient, status and urgency so the
+find_* queries cost O(result size) instead of a full scan, and a date index
+(appointment date and time, lab order date, parsed once on write) so the
+*_between window queries cost O(log n + k). Writes must go through the put_*
+methods to keep those indexes current.
+
+Set HEALTHCARE_DB=/path/to/clinic.db to serve from SQLite, or
+HEALTHCARE_DATA_DIR=/path/to/exports to load CSV/JSONL exports (src/loader.py).
+"""
+
+import bisect
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from array import array
+from collections.abc import Mapping
+
+from src.dates import timestamp
+from src.doctor_index import DoctorIndex
+from src import faq_search
+from src.faq_index import FaqIndex
+from src.records import RecordTable
+
+
+# Global so that versions keep increasing when one store replaces another
+_versions = itertools.count(1)
+
+# Fields that get a secondary index, per record type
+APPOINTMENT_FILTERS = ("doctor", "patient", "status")
+LAB_RESULT_FILTERS = ("patient", "status", "urgent")
+
+# Fields whose text is parsed into the timestamp the date index orders by
+APPOINTMENT_WHEN = ("date", "time")
+LAB_RESULT_WHEN = ("ordered_date",)
+
+# Record fields, and the ones with few distinct values that compact tables dictionary-encode;
+# free text (reason, result_summary) is nearly unique per row and stays a plain column, since
+# a table's dictionary never shrinks and would keep every replaced value
+APPOINTMENT_FIELDS = ("patient", "doctor", "date", "time", "status", "reason")
+APPOINTMENT_CATEGORIES = ("doctor", "date", "time", "status")
+LAB_RESULT_FIELDS = ("patient", "test_type", "ordered_date", "status", "urgent", "result_summary")
+LAB_RESULT_CATEGORIES = ("test_type", "ordered_date", "status", "urgent")
+DOCTOR_FIELDS = ("full_name", "specialty", "available_days", "accepting_new_patients", "languages",
+                 "years_experience")
+
+# Serve the src/data.py literals from compact tables (COMPACT_RECORDS=0 keeps the dicts)
+COMPACT_RECORDS = os.environ.get("COMPACT_RECORDS", "1") != "0"
+
+
+def _index_key(value):
+    """Secondary-index lookups ignore case and surrounding whitespace"""
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+
+def _active_filters(filters: dict) -> dict:
+    active = {field: value for field, value in filters.items() if value is not None}
+    if not active:
+        raise ValueError("At least one filter is required")
+    return active
+
+
+class SecondaryIndex:
+    """
+    Maps each indexed field value to the sorted list of record ids having it.
+    Sorted postings keep query results in a stable id order. Writes replace a
+    posting list rather than edit it, so a search already walking the old
+    list (another thread, or a reload) never sees it change under it.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._postings = {field: {} for field in fields}
+
+    def build(self, items):
+        """Bulk-load (record_id, record) pairs, sorting each posting list once"""
+        items = list(items)
+        self.build_columns([record_id for record_id, _ in items],
+                           {field: [record[field] for _, record in items] for field in self.fields})
+
+    def build_columns(self, ids, columns: dict):
+        """build() from parallel lists: record ids, and per field each record's value"""
+        for field in self.fields:
+            postings = self._postings[field]
+            for record_id, value in zip(ids, columns[field]):
+                postings.setdefault(_index_key(value), []).append(record_id)
+        for values in self._postings.values():
+            for record_ids in values.values():
+                record_ids.sort()
+
+    def add(self, record_id, record):
+        for field in self.fields:
+            postings = self._postings[field]
+            key = _index_key(record[field])
+            ids = postings.get(key, [])
+            position = bisect.bisect_left(ids, record_id)
+            if position == len(ids) or ids[position] != record_id:
+                postings[key] = ids[:position] + [record_id] + ids[position:]
+
+    def add_many(self, items):
+        """add() for a batch: each touched posting list is merged once and replaced, not edited in place"""
+        added = {}
+        for record_id, record in items:
+            for field in self.fields:
+                added.setdefault((field, _index_key(record[field])), []).append(record_id)
+        for (field, key), ids in added.items():
+            postings = self._postings[field]
+            merged = postings.get(key, []) + ids
+            merged.sort()
+            postings[key] = merged
+
+    def remove(self, record_id, record):
+        for field in self.fields:
+            postings = self._postings[field]
+            key = _index_key(record[field])
+            ids = postings.get(key, [])
+            position = bisect.bisect_left(ids, record_id)
+            if position < len(ids) and ids[position] == record_id:
+                postings[key] = ids[:position] + ids[position + 1:]
+
+    def remove_many(self, items):
+        """remove() for a batch: each touched posting list is filtered once"""
+        removed = {}
+        for record_id, record in items:
+            for field in self.fields:
+                removed.setdefault((field, _index_key(record[field])), set()).add(record_id)
+        for (field, key), ids in removed.items():
+            postings = self._postings[field]
+            if key in postings:
+                postings[key] = [record_id for record_id in postings[key] if record_id not in ids]
+
+    def postings(self, field, value) -> list:
+        return self._postings[field].get(_index_key(value), [])
+
+
+class DateIndex:
+    """
+    Record ids ordered by the timestamp of their date fields (src/dates.py),
+    ties by id, with the timestamps in a parallel array: a [start, end)
+    window is two bisections and a walk over its k ids, O(log n + k).
+    Records whose date doesn't parse are left out. Like SecondaryIndex,
+    writes build new arrays and swap them in as one reference.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        # (timestamps, ids), replaced as one reference on every write
+        self._entries = (array("q"), [])
+
+    def _stamp(self, record):
+        return timestamp(*(record[field] for field in self.fields))
+
+    def build(self, items):
+        items = list(items)
+        self.build_columns([record_id for record_id, _ in items],
+                           {field: [record[field] for _, record in items] for field in self.fields})
+
+    def build_columns(self, ids, columns: dict):
+        """build() from parallel lists, as SecondaryIndex.build_columns"""
+        stamps = list(map(timestamp, *(columns[field] for field in self.fields)))
+        order = [row for row in sorted(range(len(ids)), key=ids.__getitem__) if stamps[row] is not None]
+        order.sort(key=stamps.__getitem__)  # stable: ties stay in id order
+        self._entries = (array("q", [stamps[row] for row in order]), [ids[row] for row in order])
+
+    @staticmethod
+    def _position(entries, stamp, record_id, search=bisect.bisect_left) -> int:
+        stamps, ids = entries
+        low = bisect.bisect_left(stamps, stamp)
+        high = bisect.bisect_right(stamps, stamp, low)
+        return search(ids, record_id, low, high)
+
+    def add(self, record_id, record):
+        stamp = self._stamp(record)
+        if stamp is None:
+            return
+        stamps, ids = entries = self._entries
+        position = self._position(entries, stamp, record_id)
+        if position == len(ids) or ids[position] != record_id or stamps[position] != stamp:
+            self._entries = (stamps[:position] + array("q", [stamp]) + stamps[position:],
+                             ids[:position] + [record_id] + ids[position:])
+
+    def add_many(self, items):
+        """add() for a batch: merged into copies of the arrays, which then replace them at once"""
+        added = sorted(
+            (stamp, record_id) for record_id, record in items if (stamp := self._stamp(record)) is not None
+        )
+        if not added:
+            return
+        stamps, ids = self._entries
+        merged_stamps, merged_ids = array("q"), []
+        done = 0
+        for stamp, record_id in added:
+            position = self._position((stamps, ids), stamp, record_id)
+            merged_stamps += stamps[done:position]
+            merged_ids += ids[done:position]
+            merged_stamps.append(stamp)
+            merged_ids.append(record_id)
+            done = position
+        merged_stamps += stamps[done:]
+        merged_ids += ids[done:]
+        self._entries = (merged_stamps, merged_ids)
+
+    def remove(self, record_id, record):
+        stamp = self._stamp(record)
+        if stamp is None:
+            return
+        stamps, ids = entries = self._entries
+        position = self._position(entries, stamp, record_id)
+        if position < len(ids) and ids[position] == record_id and stamps[position] == stamp:
+            self._entries = (stamps[:position] + stamps[position + 1:], ids[:position] + ids[position + 1:])
+
+    def remove_many(self, items):
+        """remove() for a batch: the arrays are filtered once"""
+        removed = {(stamp, record_id) for record_id, record in items
+                   if (stamp := self._stamp(record)) is not None}
+        if not removed:
+            return
+        stamps, ids = self._entries
+        kept = [position for position, entry in enumerate(zip(stamps, ids)) if entry not in removed]
+        self._entries = (array("q", [stamps[position] for position in kept]), [ids[position] for position in kept])
+
+    def between(self, start: int = None, end: int = None, after: tuple = None):
+        """
+        Yield the ids timed in [start, end), earliest first; None leaves that
+        end open. `after` = (timestamp, id) resumes past that entry.
+        """
+        stamps, ids = self._entries
+        low = 0 if start is None else bisect.bisect_left(stamps, start)
+        if after is not None:
+            low = max(low, self._position((stamps, ids), *after, search=bisect.bisect_right))
+        high = len(ids) if end is None else bisect.bisect_left(stamps, end, low)
+        for position in range(low, high):
+            yield ids[position]
+
+
+def _json_default(value):
+    # Compact records are mappings but not dicts
+    return dict(value) if isinstance(value, Mapping) else str(value)
+
+
+def _record_hash(kind, key, record) -> int:
+    payload = json.dumps([kind, key, record], sort_keys=True, default=_json_default).encode()
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "big")
+
+
+class Store:
+    """
+    Interface shared by all backends.
+    Records are returned as read-only mappings (plain dicts, or Record views
+    for compact tables) with the same keys as src/data.py.
+    `version` changes on every write so in-process caches can detect stale
+    entries; `data_version` fingerprints the contents so it also stays
+    meaningful across restarts (for on-disk caches). In-process caches key
+    on `cache_version`, which also covers writes from other processes where
+    the backend can see them.
+    """
+
+    def __init__(self):
+        self.version = next(_versions)
+        self._faq_index = None
+        self._faq_search = None
+        self._faq_lock = threading.Lock()
+        self._doctor_index = None
+        self._doctor_lock = threading.Lock()
+
+    def _touch(self):
+        self.version = next(_versions)
+
+    @property
+    def faq_index(self) -> FaqIndex:
+        """FAQ matcher, built once on first use"""
+        if self._faq_index is None:
+            with self._faq_lock:
+                if self._faq_index is None:
+                    self._faq_index = FaqIndex(self.faq_items())
+        return self._faq_index
+
+    @property
+    def faq_search(self):
+        """TF-IDF FAQ retrieval, built once on first use; None without numpy"""
+        if self._faq_search is None and faq_search.available():
+            with self._faq_lock:
+                if self._faq_search is None:
+                    self._faq_search = faq_search.FaqSearch(list(self.faq_items()))
+        return self._faq_search
+
+    @property
+    def doctor_index(self) -> DoctorIndex:
+        """Fuzzy doctor-name resolver, built once on first use"""
+        if self._doctor_index is None:
+            with self._doctor_lock:
+                if self._doctor_index is None:
+                    self._doctor_index = DoctorIndex(self.doctor_items())
+        return self._doctor_index
+
+    @property
+    def data_version(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def cache_version(self):
+        """Changes whenever cached tool results may be stale"""
+        return self.version
+
+    def faq_items(self):
+        raise NotImplementedError
+
+    def get_appointment(self, apt_id: str):
+        raise NotImplementedError
+
+    def get_lab_result(self, lab_id: str):
+        raise NotImplementedError
+
+    def get_doctor(self, doctor_name: str):
+        raise NotImplementedError
+
+    def doctor_names(self) -> list[str]:
+        raise NotImplementedError
+
+    def doctor_items(self):
+        """(directory key, full name) pairs for the doctor index"""
+        raise NotImplementedError
+
+    def match_doctor(self, doctor_name: str):
+        """Record for an exact key, else for the one doctor the name index resolves it to"""
+        doc = self.get_doctor(doctor_name)
+        if doc is None:
+            key = self.doctor_index.resolve(doctor_name)
+            if key is not None:
+                doc = self.get_doctor(key)
+        return doc
+
+    def get_appointments(self, apt_ids) -> dict:
+        """Fetch several appointments at once; missing ids are left out"""
+        return {apt_id: apt for apt_id in apt_ids if (apt := self.get_appointment(apt_id)) is not None}
+
+    def get_lab_results(self, lab_ids) -> dict:
+        """Fetch several lab results at once; missing ids are left out"""
+        return {lab_id: lab for lab_id in lab_ids if (lab := self.get_lab_result(lab_id)) is not None}
+
+    def get_doctors(self, doctor_names) -> dict:
+        """Fetch several doctors at once; missing names are left out"""
+        return {name: doc for name in doctor_names if (doc := self.get_doctor(name)) is not None}
+
+    def match_doctors(self, doctor_names) -> dict:
+        """get_doctors, with names that aren't keys resolved through the name index"""
+        found = self.get_doctors(doctor_names)
+        resolved = {
+            name: key for name in doctor_names
+            if name not in found and (key := self.doctor_index.resolve(name)) is not None
+        }
+        if resolved:
+            records = self.get_doctors(list(dict.fromkeys(resolved.values())))
+            found.update({name: records[key] for name, key in resolved.items() if key in records})
+        return found
+
+    def put_faq(self, key: str, answer: str):
+        raise NotImplementedError
+
+    def put_appointment(self, apt_id: str, record: dict):
+        raise NotImplementedError
+
+    def put_lab_result(self, lab_id: str, record: dict):
+        raise NotImplementedError
+
+    def put_doctor(self, doctor_name: str, record: dict):
+        raise NotImplementedError
+
+    def put_appointments(self, items):
+        for apt_id, record in items:
+            self.put_appointment(apt_id, record)
+
+    def put_lab_results(self, items):
+        for lab_id, record in items:
+            self.put_lab_result(lab_id, record)
+
+    def put_doctors(self, items):
+        for doctor_name, record in items:
+            self.put_doctor(doctor_name, record)
+
+    def put_faqs(self, items):
+        for key, answer in items:
+            self.put_faq(key, answer)
+
+    def find_appointments(self, doctor=None, patient=None, status=None, after=None):
+        """
+        Yield (appointment_id, record) pairs matching every given filter, by
+        id; `after` resumes past that id (keyset pagination)
+        """
+        raise NotImplementedError
+
+    def find_lab_results(self, patient=None, status=None, urgent=None, after=None):
+        """find_appointments for lab results"""
+        raise NotImplementedError
+
+    def find_appointments_between(self, start: int = None, end: int = None, doctor=None, status=None, after=None):
+        """
+        Yield (appointment_id, record) pairs whose date and time fall in
+        [start, end) (src/dates.py timestamps, None for an open end), earliest
+        first, keeping those that match every given filter. `after` is the
+        (timestamp, id) of the last row already seen.
+        """
+        raise NotImplementedError
+
+    def find_lab_results_between(self, start: int = None, end: int = None, status=None, urgent=None, after=None):
+        """find_appointments_between for lab results, by order date"""
+        raise NotImplementedError
+
+
+class MemoryStore(Store):
+    """
+    Dict-backed store. Keeps references to the dicts it is given; with
+    compact=True, appointments and lab results are copied into RecordTables
+    instead. RecordTables passed in are always kept as they are.
+    """
+
+    def __init__(self, faq=None, appointments=None, lab_results=None, doctors=None, compact: bool = False):
+        super().__init__()
+        self.faq = faq if faq is not None else {}
+        self.appointments = appointments if appointments is not None else {}
+        self.lab_results = lab_results if lab_results is not None else {}
+        if compact:
+            if not isinstance(self.appointments, RecordTable):
+                self.appointments = RecordTable(APPOINTMENT_FIELDS, APPOINTMENT_CATEGORIES, self.appointments.items())
+            if not isinstance(self.lab_results, RecordTable):
+                self.lab_results = RecordTable(LAB_RESULT_FIELDS, LAB_RESULT_CATEGORIES, self.lab_results.items())
+        self.doctors = doctors if doctors is not None else {}
+        self._appointment_indexes = (self._build_index(SecondaryIndex, APPOINTMENT_FILTERS, self.appointments),
+                                     self._build_index(DateIndex, APPOINTMENT_WHEN, self.appointments))
+        self._lab_indexes = (self._build_index(SecondaryIndex, LAB_RESULT_FILTERS, self.lab_results),
+                             self._build_index(DateIndex, LAB_RESULT_WHEN, self.lab_results))
+        self._digest = None
+
+    @staticmethod
+    def _build_index(index_type, fields, records):
+        index = index_type(fields)
+        if isinstance(records, RecordTable):
+            # Straight from the columns, without a Record view per row
+            index.build_columns(list(records), {field: records.column(field) for field in fields})
+        else:
+            index.build(records.items())
+        return index
+
+    @property
+    def data_version(self):
+        # XOR of per-record hashes, updated in O(1) per write; loaders compute
+        # it up front so requests only read it
+        if self._digest is None:
+            self.compute_data_version()
+        return f"{self._digest:016x}"
+
+    def compute_data_version(self) -> str:
+        """Hash every record (O(rows)); call before serving the store"""
+        digest = 0
+        for kind, records in self._collections():
+            for key, record in records.items():
+                digest ^= _record_hash(kind, key, record)
+        self._digest = digest
+        return f"{digest:016x}"
+
+    def _collections(self):
+        return [("faq", self.faq), ("appointments", self.appointments),
+                ("lab_results", self.lab_results), ("doctors", self.doctors)]
+
+    def _record_changed(self, kind, key, previous, record):
+        if self._digest is not None:
+            if previous is not None:
+                self._digest ^= _record_hash(kind, key, previous)
+            self._digest ^= _record_hash(kind, key, record)
+        self._touch()
+
+    def faq_items(self):
+        return self.faq.items()
+
+    def get_appointment(self, apt_id):
+        return self.appointments.get(apt_id)
+
+    def get_lab_result(self, lab_id):
+        return self.lab_results.get(lab_id)
+
+    def get_doctor(self, doctor_name):
+        return self.doctors.get(doctor_name)
+
+    def doctor_names(self):
+        return list(self.doctors)
+
+    def doctor_items(self):
+        return ((name, doc.get("full_name")) for name, doc in self.doctors.items())
+
+    def put_faq(self, key, answer):
+        previous = self.faq.get(key)
+        self.faq[key] = answer
+        self._faq_index = self._faq_search = None
+        self._record_changed("faq", key, previous, answer)
+
+    def put_appointment(self, apt_id, record):
+        self._put("appointments", self.appointments, self._appointment_indexes, apt_id, record)
+
+    def put_lab_result(self, lab_id, record):
+        self._put("lab_results", self.lab_results, self._lab_indexes, lab_id, record)
+
+    def put_appointments(self, items):
+        self._put_many("appointments", self.appointments, self._appointment_indexes, items)
+
+    def put_lab_results(self, items):
+        self._put_many("lab_results", self.lab_results, self._lab_indexes, items)
+
+    def _put(self, kind, records, indexes, record_id, record):
+        previous = records.get(record_id)
+        if previous is not None:
+            # Snapshot: a compact table overwrites the row the view reads
+            previous = dict(previous)
+            for index in indexes:
+                index.remove(record_id, previous)
+        records[record_id] = record
+        for index in indexes:
+            index.add(record_id, record)
+        self._record_changed(kind, record_id, previous, record)
+
+    def _put_many(self, kind, records, indexes, items):
+        # One filter and one merge per touched posting list or date array instead of an edit per record
+        items = dict(items)
+        replaced = {}
+        for record_id in items:
+            previous = records.get(record_id)
+            if previous is not None:
+                replaced[record_id] = dict(previous)
+        if replaced:
+            for index in indexes:
+                index.remove_many(replaced.items())
+        for record_id, record in items.items():
+            records[record_id] = record
+            self._record_changed(kind, record_id, replaced.get(record_id), record)
+        for index in indexes:
+            index.add_many(items.items())
+
+    def find_appointments(self, doctor=None, patient=None, status=None, after=None):
+        filters = _active_filters({"doctor": doctor, "patient": patient, "status": status})
+        return self._find(self.appointments, self._appointment_indexes[0], filters, after)
+
+    def find_lab_results(self, patient=None, status=None, urgent=None, after=None):
+        filters = _active_filters({"patient": patient, "status": status, "urgent": urgent})
+        return self._find(self.lab_results, self._lab_indexes[0], filters, after)
+
+    def find_appointments_between(self, start=None, end=None, doctor=None, status=None, after=None):
+        dates = self._appointment_indexes[1]
+        return self._find_between(self.appointments, dates.between(start, end, after),
+                                  {"doctor": doctor, "status": status})
+
+    def find_lab_results_between(self, start=None, end=None, status=None, urgent=None, after=None):
+        dates = self._lab_indexes[1]
+        return self._find_between(self.lab_results, dates.between(start, end, after),
+                                  {"status": status, "urgent": urgent})
+
+    @staticmethod
+    def _find_between(records, record_ids, filters):
+        wanted = {field: _index_key(value) for field, value in filters.items() if value is not None}
+        for record_id in record_ids:
+            record = records[record_id]
+            if all(_index_key(record[field]) == value for field, value in wanted.items()):
+                yield record_id, record
+
+    @staticmethod
+    def _find(records, index, filters, after=None):
+        # Walk the smallest posting list and check the remaining filters per row
+        candidates = sorted(filters, key=lambda field: len(index.postings(field, filters[field])))
+        driver, rest = candidates[0], candidates[1:]
+        wanted = {field: _index_key(filters[field]) for field in rest}
+        postings = index.postings(driver, filters[driver])
+        first = 0 if after is None else bisect.bisect_right(postings, after)
+        for position in range(first, len(postings)):
+            record_id = postings[position]
+            record = records[record_id]
+            if all(_index_key(record[field]) == value for field, value in wanted.items()):
+                yield record_id, record
+
+    def put_doctor(self, doctor_name, record):
+        previous = self.doctors.get(doctor_name)
+        self.doctors[doctor_name] = record
+        self._doctor_index = None
+        self._record_changed("doctors", doctor_name, previous, record)
+
+
+# table -> (primary key column, value columns)
+_TABLES = {
+    "appointments": ("id", list(APPOINTMENT_FIELDS)),
+    "lab_results": ("id", list(LAB_RESULT_FIELDS)),
+    "doctors": ("name", list(DOCTOR_FIELDS)),
+}
+
+# table -> fields parsed into its ts column (the date index)
+_TIMED = {"appointments": APPOINTMENT_WHEN, "lab_results": LAB_RESULT_WHEN}
+
+# Columns stored as JSON text or 0/1 integers and converted back on read
+_JSON_COLUMNS = {"available_days", "languages"}
+_BOOL_COLUMNS = {"urgent", "accepting_new_patients"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS faq (
+    key TEXT NOT NULL UNIQUE,
+    answer TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS appointments (
+    id TEXT PRIMARY KEY,
+    patient TEXT, doctor TEXT, date TEXT, time TEXT, status TEXT, reason TEXT, ts INTEGER
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS lab_results (
+    id TEXT PRIMARY KEY,
+    patient TEXT, test_type TEXT, ordered_date TEXT, status TEXT, urgent INTEGER, result_summary TEXT,
+    ts INTEGER
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS doctors (
+    name TEXT PRIMARY KEY,
+    full_name TEXT, specialty TEXT, available_days TEXT, accepting_new_patients INTEGER,
+    languages TEXT, years_experience INTEGER
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_appointments_doctor ON appointments(doctor COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_appointments_patient ON appointments(patient COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_appointments_status ON appointments(status COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_lab_results_patient ON lab_results(patient COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_lab_results_status ON lab_results(status COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_lab_results_urgent ON lab_results(urgent);
+"""
+
+# Run after _migrate: databases from before the date index lack the ts column
+_DATE_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_appointments_ts ON appointments(ts);
+CREATE INDEX IF NOT EXISTS idx_lab_results_ts ON lab_results(ts);
+"""
+
+
+def _encode(column, value):
+    if column in _JSON_COLUMNS:
+        return json.dumps(value)
+    if column in _BOOL_COLUMNS:
+        return int(bool(value))
+    return value
+
+
+def _decode(column, value):
+    if column in _JSON_COLUMNS:
+        return json.loads(value)
+    if column in _BOOL_COLUMNS:
+        return bool(value)
+    return value
+
+
+class SQLiteStore(Store):
+    """
+    SQLite-backed store.
+    Lookups go through the primary-key index and only the requested row is
+    loaded. Each thread gets its own connection so concurrent tool calls
+    don't share a cursor.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        self._migrate(conn)
+        conn.executescript(_DATE_SCHEMA)
+
+    @staticmethod
+    def _migrate(conn):
+        """Add and backfill the ts column in databases created before it existed"""
+        for table, fields in _TIMED.items():
+            if "ts" in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+                continue
+            pk = _TABLES[table][0]
+            with conn:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN ts INTEGER")
+                rows = conn.execute(f"SELECT {pk}, {', '.join(fields)} FROM {table}").fetchall()
+                conn.executemany(f"UPDATE {table} SET ts = ? WHERE {pk} = ?",
+                                 ((timestamp(*values), key) for key, *values in rows))
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    @property
+    def data_version(self):
+        # Any committed write changes the file's mtime or size
+        stat = os.stat(self.path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    @property
+    def cache_version(self):
+        # Other processes write the same file without touching self.version
+        return self.version, self.data_version
+
+    def _get(self, table, key):
+        pk, columns = _TABLES[table]
+        row = self._connection().execute(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE {pk} = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {column: _decode(column, value) for column, value in zip(columns, row)}
+
+    def _get_many(self, table, keys):
+        # One IN (...) query per call instead of a round trip per key
+        pk, columns = _TABLES[table]
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        cursor = self._connection().execute(
+            f"SELECT {pk}, {', '.join(columns)} FROM {table} WHERE {pk} IN ({', '.join('?' * len(keys))})",
+            keys
+        )
+        return {
+            key: {column: _decode(column, value) for column, value in zip(columns, row)}
+            for key, *row in cursor
+        }
+
+    def _put_many(self, table, items):
+        pk, columns = _TABLES[table]
+        timed = _TIMED.get(table)
+        stored = columns + ["ts"] if timed else columns
+        placeholders = ", ".join("?" * (len(stored) + 1))
+        rows = (
+            (key, *(_encode(column, record[column]) for column in columns),
+             *((timestamp(*(record[field] for field in timed)),) if timed else ()))
+            for key, record in items
+        )
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({pk}, {', '.join(stored)}) VALUES ({placeholders})",
+                    rows
+                )
+            if table == "doctors":
+                self._doctor_index = None
+            self._touch()
+
+    def _find(self, table, filters, clauses=(), params=(), order=None):
+        pk, columns = _TABLES[table]
+        clauses = list(clauses)
+        params = list(params)
+        for field, value in filters.items():
+            if field in _BOOL_COLUMNS:
+                clauses.append(f"{field} = ?")
+                params.append(_encode(field, value))
+            else:
+                clauses.append(f"{field} = ? COLLATE NOCASE")
+                params.append(value.strip())
+        cursor = self._connection().execute(
+            f"SELECT {pk}, {', '.join(columns)} FROM {table} "
+            f"WHERE {' AND '.join(clauses)} ORDER BY {order or pk}",
+            params
+        )
+        for key, *row in cursor:
+            yield key, {column: _decode(column, value) for column, value in zip(columns, row)}
+
+    def _find_between(self, table, start, end, filters, after=None):
+        clauses, params = ["ts IS NOT NULL"], []
+        if after is not None:
+            clauses.append(f"(ts, {_TABLES[table][0]}) > (?, ?)")
+            params.extend(after)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(end)
+        filters = {field: value for field, value in filters.items() if value is not None}
+        return self._find(table, filters, clauses, params, order=f"ts, {_TABLES[table][0]}")
+
+    def faq_items(self):
+        return self._connection().execute("SELECT key, answer FROM faq ORDER BY rowid").fetchall()
+
+    def get_appointment(self, apt_id):
+        return self._get("appointments", apt_id)
+
+    def get_lab_result(self, lab_id):
+        return self._get("lab_results", lab_id)
+
+    def get_doctor(self, doctor_name):
+        return self._get("doctors", doctor_name)
+
+    def doctor_names(self):
+        return [row[0] for row in self._connection().execute("SELECT name FROM doctors ORDER BY name")]
+
+    def doctor_items(self):
+        return self._connection().execute("SELECT name, full_name FROM doctors ORDER BY name").fetchall()
+
+    def get_appointments(self, apt_ids):
+        return self._get_many("appointments", apt_ids)
+
+    def get_lab_results(self, lab_ids):
+        return self._get_many("lab_results", lab_ids)
+
+    def get_doctors(self, doctor_names):
+        return self._get_many("doctors", doctor_names)
+
+    def find_appointments(self, doctor=None, patient=None, status=None, after=None):
+        filters = _active_filters({"doctor": doctor, "patient": patient, "status": status})
+        return self._find("appointments", filters, *self._after("appointments", after))
+
+    def find_lab_results(self, patient=None, status=None, urgent=None, after=None):
+        filters = _active_filters({"patient": patient, "status": status, "urgent": urgent})
+        return self._find("lab_results", filters, *self._after("lab_results", after))
+
+    @staticmethod
+    def _after(table, after) -> tuple:
+        """Extra (clauses, params) for _find resuming past the id `after`"""
+        if after is None:
+            return (), ()
+        return (f"{_TABLES[table][0]} > ?",), (after,)
+
+    def find_appointments_between(self, start=None, end=None, doctor=None, status=None, after=None):
+        return self._find_between("appointments", start, end, {"doctor": doctor, "status": status}, after)
+
+    def find_lab_results_between(self, start=None, end=None, status=None, urgent=None, after=None):
+        return self._find_between("lab_results", start, end, {"status": status, "urgent": urgent}, after)
+
+    def put_faq(self, key, answer):
+        self.put_faqs([(key, answer)])
+
+    def put_faqs(self, items):
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO faq (key, answer) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET answer = excluded.answer",
+                    items
+                )
+            self._faq_index = self._faq_search = None
+            self._touch()
+
+    def put_appointment(self, apt_id, record):
+        self._put_many("appointments", [(apt_id, record)])
+
+    def put_appointments(self, items):
+        self._put_many("appointments", items)
+
+    def put_lab_result(self, lab_id, record):
+        self._put_many("lab_results", [(lab_id, record)])
+
+    def put_lab_results(self, items):
+        self._put_many("lab_results", items)
+
+    def put_doctor(self, doctor_name, record):
+        self._put_many("doctors", [(doctor_name, record)])
+
+    def put_doctors(self, items):
+        self._put_many("doctors", items)
+
+    @classmethod
+    def create(cls, path: str, faq=None, appointments=None, lab_results=None, doctors=None):
+        """Create (or refresh) a database file from dicts shaped like src/data.py"""
+        store = cls(path)
+        if faq:
+            store.put_faqs(list(faq.items()))
+        if appointments:
+            store.put_appointments(appointments.items())
+        if lab_results:
+            store.put_lab_results(lab_results.items())
+        if doctors:
+            store.put_doctors(doctors.items())
+        return store
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_data_store() -> MemoryStore:
+    """In-memory store over the literals in src/data.py"""
+    from src.data import FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS
+    store = MemoryStore(FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS, compact=COMPACT_RECORDS)
+    store.compute_data_version()
+    return store
+
+
+def get_store() -> Store:
+    """
+    Return the process-wide store.
+    Uses SQLite when HEALTHCARE_DB is set, the CSV/JSONL exports in
+    HEALTHCARE_DATA_DIR when that is set (see src/loader.py), otherwise the
+    src/data.py dicts.
+    """
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                db_path = os.environ.get("HEALTHCARE_DB")
+                data_dir = os.environ.get("HEALTHCARE_DATA_DIR")
+                if db_path:
+                    _default_store = SQLiteStore(db_path)
+                elif data_dir:
+                    from src.loader import load_store
+                    _default_store = load_store(data_dir)
+                else:
+                    _default_store = default_data_store()
+    return _default_store
+
+
+def set_store(store: Store):
+    """Replace the process-wide store (the swap is a single reference assignment)"""
+    global _default_store
+    _default_store = store
+
+
+if __name__ == "__main__":
+    # Export the src/data.py literals: python -m src.storage clinic.db
+    import sys
+    from src.data import FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "clinic.db"
+    SQLiteStore.create(target, FAQ_DATA, APPOINTMENTS, LAB_RESULTS, DOCTORS)
+    print(f"Wrote {target}")
@@ -0,0 +1,761 @@
+"""
+Single registry of the healthcare tools.
+Each tool declares its schema, handler and formatter once. The MCP server and
+the Claude demo both build their tool lists from REGISTRY and dispatch by
+dict lookup, so adding a tool doesn't touch either of them.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+from src.dates import PERIODS, describe_window, resolve_window, timestamp, window_stamps
+from src.faq_index import tokenize
+from src.faq_search import content_words
+from src.storage import APPOINTMENT_WHEN, LAB_RESULT_WHEN, get_store
+
+
+# Rows per page of the find_* search tools, unless the call passes page_size
+DEFAULT_PAGE_SIZE = 20
+
+# Largest page_size a call may ask for
+MAX_PAGE_SIZE = 100
+
+# A page also ends before its text passes this many tokens (estimated as characters / 4)
+MAX_RESULT_TOKENS = int(os.environ.get("HEALTHCARE_MAX_RESULT_TOKENS", "2000"))
+CHARS_PER_TOKEN = 4
+
+# Cap on IDs/names accepted by the batch lookup tools
+MAX_BATCH_SIZE = 50
+
+# How many doctor names a "not found" answer suggests
+MAX_SUGGESTED_DOCTORS = 10
+
+# Ranked answers search_faq returns by default, and at most
+DEFAULT_FAQ_RESULTS = 3
+MAX_FAQ_RESULTS = 5
+
+# Lowest TF-IDF score check_faq accepts when no FAQ key matches (tuned on src/data.py)
+FAQ_SEARCH_MIN_SCORE = 0.08
+
+# How many times the runner-up's score that hit must be, so a near tie isn't taken as an answer
+FAQ_SEARCH_MIN_LEAD = 2.0
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """
+    One tool: `handler(**arguments)` fetches the data and `formatter(data)`
+    renders the response text. `cache_key(arguments)` maps equivalent calls
+    to the same hashable key (defaults to the sorted arguments), and
+    `is_found(data)` tells whether the call found anything, for metrics.
+    `compact_formatter(data)` is an optional one-line rendering for callers
+    that pay per token.
+    """
+    name: str
+    description: str
+    input_schema: dict
+    handler: Callable
+    formatter: Callable
+    cache_key: Callable = None
+    is_found: Callable = None
+    compact_formatter: Callable = None
+
+    def __call__(self, **arguments) -> str:
+        return self.formatter(self.handler(**arguments))
+
+    def compact(self, **arguments) -> str:
+        """Like calling the tool, but with the compact formatter when there is one"""
+        return (self.compact_formatter or self.formatter)(self.handler(**arguments))
+
+    def run(self, arguments: dict) -> tuple:
+        """Response text plus whether the call found anything"""
+        data = self.handler(**arguments)
+        found = self.is_found(data) if self.is_found is not None else data is not None
+        return self.formatter(data), found
+
+    def key(self, arguments: dict):
+        if self.cache_key is not None:
+            return self.cache_key(arguments)
+        return tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in arguments.items()
+        ))
+
+    def anthropic_schema(self) -> dict:
+        return {"name": self.name, "description": self.description, "input_schema": self.input_schema}
+
+
+REGISTRY = {}
+
+
+def register(spec: ToolSpec) -> ToolSpec:
+    REGISTRY[spec.name] = spec
+    return spec
+
+
+def dispatch(name: str, arguments: dict) -> str:
+    """Run a tool by name and return its response text"""
+    spec = REGISTRY.get(name)
+    if spec is None:
+        return f"Unknown tool: {name}"
+    return spec(**arguments)
+
+
+def string_property(description: str) -> dict:
+    return {"type": "string", "description": description}
+
+
+def array_property(description: str) -> dict:
+    return {"type": "array", "items": {"type": "string"}, "description": description}
+
+
+# Shared formatting helpers
+
+# Paging for the search tools. A cursor is opaque to the caller: base64 of the
+# sort key of the last row sent (keyset pagination, so rows added or removed
+# between pages don't shift the rest) and a tag of the search it belongs to.
+
+PAGING_PROPERTIES = {
+    "cursor": string_property("The cursor a previous page of this same search returned, to get the next page"),
+    "page_size": {
+        "type": "integer",
+        "minimum": 1,
+        "maximum": MAX_PAGE_SIZE,
+        "description": f"Rows per page (default {DEFAULT_PAGE_SIZE})"
+    }
+}
+
+
+@dataclass(frozen=True)
+class Page:
+    """One page of a search tool's rows, already rendered"""
+    kind: str
+    lines: list
+    cursor: str = None          # where the next page starts; None on the last page
+    continued: bool = False     # a cursor brought the caller here
+
+
+def _search_tag(search) -> str:
+    return hashlib.sha1(repr(search).encode()).hexdigest()[:8]
+
+
+def encode_cursor(search, after) -> str:
+    payload = json.dumps([_search_tag(search), after], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(search, cursor: str):
+    """The sort key a cursor resumes after; ValueError if it's malformed or from another search"""
+    try:
+        tag, after = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError("That cursor isn't valid; repeat the search without a cursor.") from None
+    if tag != _search_tag(search):
+        raise ValueError("That cursor belongs to a different search; repeat this one without a cursor.")
+    return tuple(after) if isinstance(after, list) else after
+
+
+def paginate(kind: str, search, find, format_row, sort_key, cursor: str = None, page_size: int = None):
+    """
+    Render one page of `find(after)`, a generator of (record_id, record) in
+    sort_key order. Rows are pulled one at a time and the page ends at
+    page_size rows or MAX_RESULT_TOKENS of text, so only the rows sent (plus
+    one, to tell whether more follow) are ever read. `search` identifies the
+    query so its cursors can't be replayed against another one.
+    """
+    try:
+        after = decode_cursor(search, cursor) if cursor else None
+    except ValueError as error:
+        return str(error)
+    try:
+        page_size = min(max(int(page_size or DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return f"page_size must be a whole number from 1 to {MAX_PAGE_SIZE}; repeat the search with one."
+    budget = MAX_RESULT_TOKENS * CHARS_PER_TOKEN
+    lines, last = [], None
+    for record_id, record in find(after):
+        line = format_row(record_id, record)
+        if len(lines) == page_size or (lines and budget < len(line) + 1):
+            return Page(kind, lines, encode_cursor(search, last), bool(cursor))
+        lines.append(line)
+        budget -= len(line) + 1
+        last = sort_key(record_id, record)
+    return Page(kind, lines, None, bool(cursor))
+
+
+def format_page(page) -> str:
+    """A page of rows with its continuation hint, or the message explaining why there's none"""
+    if isinstance(page, str):
+        return page
+    if not page.lines:
+        return f"No more {page.kind}." if page.continued else f"No {page.kind} found matching those filters."
+    lines = [f"{'Next' if page.continued else 'Found'} {len(page.lines)} {page.kind}:", *page.lines]
+    if page.cursor:
+        lines.append(f'More {page.kind} match; call again with cursor="{page.cursor}" for the next page.')
+    return "\n".join(lines)
+
+
+def page_found(page) -> bool:
+    return isinstance(page, Page) and bool(page.lines)
+
+
+def _by_id(record_id, record):
+    return record_id
+
+
+def _by_time(fields):
+    def sort_key(record_id, record):
+        return [timestamp(*(record[field] for field in fields)), record_id]
+    return sort_key
+
+
+def search_filters(arguments: dict) -> tuple:
+    """Normalized filter arguments, identifying a search for its cursors"""
+    return tuple(sorted(
+        (name, value.strip().lower() if isinstance(value, str) else value)
+        for name, value in arguments.items() if value is not None and value != ""
+    ))
+
+
+def batch_keys(values, normalize=str.strip) -> list:
+    """Normalize and de-duplicate the requested keys, keeping their order; a lone key is a batch of one"""
+    if values is None:
+        return []
+    if isinstance(values, (str, int, float)):
+        values = [values]
+    keys = (str(value) for value in values if value is not None)
+    return list(dict.fromkeys(normalize(key) for key in keys if key.strip()))
+
+
+def fetch_batch(keys: list, fetch) -> tuple:
+    """Fetch up to MAX_BATCH_SIZE keys in one store call"""
+    requested = keys[:MAX_BATCH_SIZE]
+    return requested, fetch(requested), len(keys)
+
+
+def format_batch(header: str, batch: tuple, format_row) -> str:
+    """One line per requested key, in request order, with NOT FOUND markers"""
+    requested, records, total = batch
+    lines = [header]
+    for key in requested:
+        record = records.get(key)
+        lines.append(f"{key}: {format_row(record)}" if record is not None else f"{key}: NOT FOUND")
+    if total > MAX_BATCH_SIZE:
+        lines.append(f"Only the first {MAX_BATCH_SIZE} of {total} entries were looked up.")
+    return "\n".join(lines)
+
+
+def urgency_label(lab: dict) -> str:
+    return "!!! URGENT !!!" if lab["urgent"] else "Normal priority"
+
+
+def appointment_row(apt_id: str, apt: dict) -> str:
+    return (
+        f"{apt_id}: {apt['patient']} with {apt['doctor']} on {apt['date']} "
+        f"at {apt['time']} ({apt['status']}) - {apt['reason']}"
+    )
+
+
+def doctor_row(doc: dict) -> str:
+    return (
+        f"{doc['full_name']} | {doc['specialty']} | {', '.join(doc['available_days'])} | "
+        f"{'accepting' if doc['accepting_new_patients'] else 'not accepting'} | "
+        f"{', '.join(doc['languages'])} | {doc['years_experience']} years"
+    )
+
+
+def lab_result_row(lab_id: str, lab: dict) -> str:
+    return (
+        f"{lab_id}: {lab['test_type']} for {lab['patient']}, ordered {lab['ordered_date']} "
+        f"({lab['status']}{', URGENT' if lab['urgent'] else ''}) - {lab['result_summary']}"
+    )
+
+
+# Tool 1: FAQ
+
+def _check_faq(question: str):
+    store = get_store()
+    answer = store.faq_index.lookup(question)
+    if answer is None and store.faq_search is not None:
+        # Paraphrases ("do you take Aetna?") miss the key index; take a confident ranked hit
+        hits = store.faq_search.search(question, 2)
+        if hits and _confident_hit(question, hits):
+            answer = hits[0][1]
+    return answer
+
+
+def _confident_hit(question: str, hits: list) -> bool:
+    """
+    The best hit scores high enough, clearly ahead of the runner-up, and
+    shares a whole word with the question: character n-grams alone match
+    off-topic questions ("can I bring my dog") to whatever is closest
+    """
+    key, answer, score = hits[0]
+    if score < FAQ_SEARCH_MIN_SCORE or (len(hits) > 1 and score < FAQ_SEARCH_MIN_LEAD * hits[1][2]):
+        return False
+    return not set(content_words(question, query=True)).isdisjoint(content_words(f"{key} {answer}"))
+
+
+def _format_faq(answer) -> str:
+    if answer is None:
+        return "I couldn't find an answer to that question in our FAQ. Please call us at 555-1234 for assistance."
+    return f"FAQ Answer: {answer}"
+
+
+register(ToolSpec(
+    name="check_faq",
+    description="Search frequently asked questions about clinic hours, location, insurance, services, and policies. Use this for general information queries.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "question": string_property("The question or topic to search for (e.g., 'hours', 'insurance', 'location')")
+        },
+        "required": ["question"]
+    },
+    handler=_check_faq,
+    formatter=_format_faq,
+    compact_formatter=lambda answer: answer if answer is not None else "No FAQ match; suggest calling 555-1234.",
+    cache_key=lambda arguments: " ".join(tokenize(arguments["question"])),
+))
+
+
+def _faq_top_k(top_k) -> int:
+    """top_k clamped to 1..MAX_FAQ_RESULTS; ValueError or TypeError if it isn't a number"""
+    return max(1, min(int(top_k if top_k is not None else DEFAULT_FAQ_RESULTS), MAX_FAQ_RESULTS))
+
+
+def _search_faq_key(arguments: dict):
+    try:
+        top_k = _faq_top_k(arguments.get("top_k"))
+    except (TypeError, ValueError):
+        top_k = None   # every bad top_k gets the same message
+    return " ".join(tokenize(arguments["question"])), top_k
+
+
+def _search_faq(question: str, top_k: int = DEFAULT_FAQ_RESULTS):
+    store = get_store()
+    try:
+        top_k = _faq_top_k(top_k)
+    except (TypeError, ValueError):
+        return f"top_k must be a whole number from 1 to {MAX_FAQ_RESULTS}; repeat the search with one."
+    if store.faq_search is not None:
+        return store.faq_search.search(question, top_k)
+    # Without numpy: the single key-index match, if any
+    hit = store.faq_index.match(question)
+    return [(hit[0], hit[1], 1.0)] if hit else []
+
+
+def _format_faq_hits(hits) -> str:
+    if isinstance(hits, str):
+        return hits
+    if not hits:
+        return "No related FAQ entries found. Please call us at 555-1234 for assistance."
+    lines = ["Related FAQ answers (best first, score 0-1):"]
+    lines += [f"{rank}. [{score:.2f}] {answer} (topic: {key})" for rank, (key, answer, score) in enumerate(hits, 1)]
+    return "\n".join(lines)
+
+
+register(ToolSpec(
+    name="search_faq",
+    description="Rank the FAQ answers most related to a free-form question, with similarity scores. Use this when check_faq finds nothing or the question is phrased unusually (e.g. 'do you take Aetna?').",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "question": string_property("The user's question in their own words"),
+            "top_k": {"type": "integer", "description": f"How many answers to return (1-{MAX_FAQ_RESULTS}, default {DEFAULT_FAQ_RESULTS})"}
+        },
+        "required": ["question"]
+    },
+    handler=_search_faq,
+    formatter=_format_faq_hits,
+    compact_formatter=lambda hits: hits if isinstance(hits, str) else (
+        " | ".join(f"{score:.2f} {answer}" for _, answer, score in hits) or "No FAQ match"
+    ),
+    is_found=lambda hits: isinstance(hits, list) and bool(hits),
+    cache_key=_search_faq_key,
+))
+
+
+# Tool 2: Appointment lookup
+
+def _lookup_appointment(appointment_id: str):
+    apt_id = appointment_id.upper()
+    return apt_id, get_store().get_appointment(apt_id)
+
+
+def _format_appointment(result) -> str:
+    apt_id, apt = result
+    if apt is None:
+        return f"Appointment {apt_id} not found. Please verify the appointment ID."
+    return (
+        f"Appointment {apt_id}:\n"
+        f"Patient: {apt['patient']}\n"
+        f"Doctor: {apt['doctor']}\n"
+        f"Date: {apt['date']}\n"
+        f"Time: {apt['time']}\n"
+        f"Status: {apt['status']}\n"
+        f"Reason: {apt['reason']}"
+    )
+
+
+register(ToolSpec(
+    name="lookup_appointment",
+    description="Look up appointment details by appointment ID. Returns patient name, doctor, date, time, status, and reason for visit. Appointment IDs follow format APT-XXX.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "appointment_id": string_property("The appointment ID (e.g., 'APT-101')")
+        },
+        "required": ["appointment_id"]
+    },
+    handler=_lookup_appointment,
+    formatter=_format_appointment,
+    compact_formatter=lambda result: appointment_row(*result) if result[1] is not None else f"{result[0]}: NOT FOUND",
+    is_found=lambda result: result[1] is not None,
+    cache_key=lambda arguments: arguments["appointment_id"].upper(),
+))
+
+
+# Tool 3: Lab result lookup
+
+def _lookup_lab_result(lab_id: str):
+    lab_id = lab_id.upper()
+    return lab_id, get_store().get_lab_result(lab_id)
+
+
+def _format_lab_result(result) -> str:
+    lab_id, lab = result
+    if lab is None:
+        return f"Lab result {lab_id} not found. Please verify the lab ID."
+    return (
+        f"Lab Result {lab_id}:\n"
+        f"Patient: {lab['patient']}\n"
+        f"Test: {lab['test_type']}\n"
+        f"Ordered: {lab['ordered_date']}\n"
+        f"Status: {lab['status']}\n"
+        f"Priority: {urgency_label(lab)}\n"
+        f"Summary: {lab['result_summary']}"
+    )
+
+
+register(ToolSpec(
+    name="lookup_lab_result",
+    description="Look up laboratory test results by lab ID. Returns test type, status, urgency, and result summary. Lab IDs follow format LAB-XXX.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "lab_id": string_property("The lab result ID (e.g., 'LAB-201')")
+        },
+        "required": ["lab_id"]
+    },
+    handler=_lookup_lab_result,
+    formatter=_format_lab_result,
+    compact_formatter=lambda result: lab_result_row(*result) if result[1] is not None else f"{result[0]}: NOT FOUND",
+    is_found=lambda result: result[1] is not None,
+    cache_key=lambda arguments: arguments["lab_id"].upper(),
+))
+
+
+# Tool 4: Doctor directory
+
+def _find_doctor(doctor_name: str):
+    # "smith", "Sarah Smith" or "Dr. Smyth" resolve through the store's name index
+    return doctor_name, get_store().match_doctor(doctor_name)
+
+
+def suggested_doctors(doctor_name: str) -> str:
+    """Closest directory names for a "not found" answer"""
+    store = get_store()
+    names = store.doctor_index.suggest(doctor_name, MAX_SUGGESTED_DOCTORS) or store.doctor_names()[:MAX_SUGGESTED_DOCTORS]
+    return ", ".join(names)
+
+
+def _format_doctor_compact(result) -> str:
+    doctor_name, doc = result
+    if doc is None:
+        return f"{doctor_name}: NOT FOUND. Doctors: {suggested_doctors(doctor_name)}"
+    return doctor_row(doc)
+
+
+def _format_doctor(result) -> str:
+    doctor_name, doc = result
+    if doc is None:
+        return f"Doctor {doctor_name} not found. Available doctors: {suggested_doctors(doctor_name)}"
+    accepting = "Yes ✓" if doc["accepting_new_patients"] else "No (full schedule)"
+    return (
+        f"{doc['full_name']}:\n"
+        f"Specialty: {doc['specialty']}\n"
+        f"Available: {', '.join(doc['available_days'])}\n"
+        f"Accepting new patients: {accepting}\n"
+        f"Languages: {', '.join(doc['languages'])}\n"
+        f"Experience: {doc['years_experience']} years"
+    )
+
+
+register(ToolSpec(
+    name="find_doctor",
+    description="Get information about a specific doctor including specialty, availability, languages spoken, and whether they're accepting new patients.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "doctor_name": string_property("The doctor's name (e.g., 'Dr. Smith', 'Sarah Smith' or 'Lee')")
+        },
+        "required": ["doctor_name"]
+    },
+    handler=_find_doctor,
+    formatter=_format_doctor,
+    compact_formatter=_format_doctor_compact,
+    is_found=lambda result: result[1] is not None,
+))
+
+
+# Search tools over the secondary indexes
+
+def doctor_filter(doctor: str):
+    """The directory key a doctor filter names ("smith", "Dr Smyth" -> "Dr. Smith"), else the name as given"""
+    if not doctor:
+        return None
+    store = get_store()
+    if store.get_doctor(doctor) is not None:
+        return doctor
+    return store.doctor_index.resolve(doctor) or doctor
+
+
+def _find_appointments(doctor: str = None, patient: str = None, status: str = None,
+                       cursor: str = None, page_size: int = None):
+    if not (doctor or patient or status):
+        return "Please provide a doctor, patient or status to search appointments."
+    # Resolved through the name index first, so the search walks one exact posting list
+    filters = {"doctor": doctor_filter(doctor), "patient": patient or None, "status": status or None}
+    return paginate(
+        "appointments", ("find_appointments", search_filters(filters)),
+        lambda after: get_store().find_appointments(**filters, after=after),
+        appointment_row, _by_id, cursor, page_size,
+    )
+
+
+register(ToolSpec(
+    name="find_appointments",
+    description="Search appointments by doctor, patient and/or status. Use this when the user doesn't know the appointment ID, e.g. 'Dr. Smith's confirmed appointments'. At least one filter is required. Results come a page at a time; pass the returned cursor to get the next page.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "doctor": string_property("The doctor's name (e.g., 'Dr. Smith')"),
+            "patient": string_property("The patient's full name (e.g., 'John Doe')"),
+            "status": string_property("Appointment status: 'confirmed', 'pending confirmation' or 'cancelled'"),
+            **PAGING_PROPERTIES
+        }
+    },
+    handler=_find_appointments,
+    formatter=format_page,
+    is_found=page_found,
+))
+
+
+def _find_lab_results(patient: str = None, status: str = None, urgent: bool = None,
+                      cursor: str = None, page_size: int = None):
+    if not (patient or status or urgent is not None):
+        return "Please provide a patient, status or urgency to search lab results."
+    filters = {"patient": patient or None, "status": status or None, "urgent": urgent}
+    return paginate(
+        "lab results", ("find_lab_results", search_filters(filters)),
+        lambda after: get_store().find_lab_results(**filters, after=after),
+        lab_result_row, _by_id, cursor, page_size,
+    )
+
+
+register(ToolSpec(
+    name="find_lab_results",
+    description="Search lab results by patient, status and/or urgency. Use this when the user doesn't know the lab ID, e.g. 'which of John Doe's labs are ready'. At least one filter is required. Results come a page at a time; pass the returned cursor to get the next page.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "patient": string_property("The patient's full name (e.g., 'John Doe')"),
+            "status": string_property("Lab status: 'ready' or 'processing'"),
+            "urgent": {
+                "type": "boolean",
+                "description": "Only urgent (true) or only non-urgent (false) results"
+            },
+            **PAGING_PROPERTIES
+        }
+    },
+    handler=_find_lab_results,
+    formatter=format_page,
+    is_found=page_found,
+))
+
+
+# Time-window searches over the date indexes
+
+def _date_window(start_date: str = None, end_date: str = None, period: str = None):
+    """(first, last) days of the requested window, or the message explaining why there isn't one"""
+    try:
+        return resolve_window(start_date, end_date, period)
+    except ValueError as error:
+        return str(error)
+
+
+def _date_window_key(arguments: dict):
+    # Relative periods ("next week") resolve against today, so key on the dates they mean
+    window = _date_window(arguments.get("start_date"), arguments.get("end_date"), arguments.get("period"))
+    filters = {name: value for name, value in arguments.items() if name not in ("start_date", "end_date", "period")}
+    return window, tuple(sorted(filters.items()))
+
+
+def _search_window(name, kind, find, format_row, fields, start_date=None, end_date=None, period=None,
+                   cursor=None, page_size=None, **filters):
+    window = _date_window(start_date, end_date, period)
+    if isinstance(window, str):
+        return window
+    start, end = window_stamps(*window)
+    return paginate(
+        f"{kind} {describe_window(*window)}", (name, window, search_filters(filters)),
+        lambda after: find(start, end, **filters, after=after),
+        format_row, _by_time(fields), cursor, page_size,
+    )
+
+
+DATE_WINDOW_PROPERTIES = {
+    "start_date": string_property("First day of the window, inclusive (e.g., 'December 1, 2025', '2025-12-01' or 'today')"),
+    "end_date": string_property("Last day of the window, inclusive (e.g., 'December 14, 2025')"),
+    "period": {
+        "type": "string",
+        "enum": list(PERIODS),
+        "description": "A named window instead of dates; weeks run Monday to Sunday"
+    }
+}
+
+
+def _find_appointments_by_date(start_date: str = None, end_date: str = None, period: str = None,
+                               doctor: str = None, status: str = None, cursor: str = None, page_size: int = None):
+    return _search_window(
+        "find_appointments_by_date", "appointments", get_store().find_appointments_between, appointment_row,
+        APPOINTMENT_WHEN, start_date, end_date, period, cursor, page_size,
+        doctor=doctor_filter(doctor), status=status or None,
+    )
+
+
+register(ToolSpec(
+    name="find_appointments_by_date",
+    description="List appointments in a date window, earliest first, e.g. 'Dr. Smith's appointments next week' or 'anything booked between December 1 and 10'. Give start_date and/or end_date, or a period such as 'today' or 'next week'; optionally narrow by doctor and status. Results come a page at a time; pass the returned cursor to get the next page.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            **DATE_WINDOW_PROPERTIES,
+            "doctor": string_property("The doctor's name (e.g., 'Dr. Smith')"),
+            "status": string_property("Appointment status: 'confirmed', 'pending confirmation' or 'cancelled'"),
+            **PAGING_PROPERTIES
+        }
+    },
+    handler=_find_appointments_by_date,
+    formatter=format_page,
+    cache_key=_date_window_key,
+    is_found=page_found,
+))
+
+
+def _find_lab_results_by_date(start_date: str = None, end_date: str = None, period: str = None,
+                              status: str = None, urgent: bool = None, cursor: str = None, page_size: int = None):
+    return _search_window(
+        "find_lab_results_by_date", "lab results ordered", get_store().find_lab_results_between, lab_result_row,
+        LAB_RESULT_WHEN, start_date, end_date, period, cursor, page_size,
+        status=status or None, urgent=urgent,
+    )
+
+
+register(ToolSpec(
+    name="find_lab_results_by_date",
+    description="List lab results ordered in a date window, earliest first, e.g. 'urgent labs ordered last week'. Give start_date and/or end_date, or a period such as 'this month'; optionally narrow by status and urgency. Results come a page at a time; pass the returned cursor to get the next page.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            **DATE_WINDOW_PROPERTIES,
+            "status": string_property("Lab status: 'ready' or 'processing'"),
+            "urgent": {
+                "type": "boolean",
+                "description": "Only urgent (true) or only non-urgent (false) results"
+            },
+            **PAGING_PROPERTIES
+        }
+    },
+    handler=_find_lab_results_by_date,
+    formatter=format_page,
+    cache_key=_date_window_key,
+    is_found=page_found,
+))
+
+
+# Batch lookups
+
+register(ToolSpec(
+    name="lookup_appointments",
+    description="Look up several appointments by ID in one call. Prefer this over repeated lookup_appointment calls when the user mentions more than one appointment. Returns one compact line per ID, with NOT FOUND for unknown IDs.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "appointment_ids": array_property("Appointment IDs (e.g., ['APT-101', 'APT-102'])")
+        },
+        "required": ["appointment_ids"]
+    },
+    handler=lambda appointment_ids: fetch_batch(
+        batch_keys(appointment_ids, lambda value: value.strip().upper()), get_store().get_appointments
+    ),
+    formatter=lambda batch: format_batch(
+        "Appointments (patient | doctor | date time | status | reason):",
+        batch,
+        lambda apt: f"{apt['patient']} | {apt['doctor']} | {apt['date']} {apt['time']} | {apt['status']} | {apt['reason']}"
+    ),
+    is_found=lambda batch: bool(batch[1]),
+))
+
+register(ToolSpec(
+    name="lookup_lab_results",
+    description="Look up several lab results by ID in one call. Prefer this over repeated lookup_lab_result calls when the user mentions more than one lab. Returns one compact line per ID, with NOT FOUND for unknown IDs.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "lab_ids": array_property("Lab result IDs (e.g., ['LAB-201', 'LAB-202'])")
+        },
+        "required": ["lab_ids"]
+    },
+    handler=lambda lab_ids: fetch_batch(
+        batch_keys(lab_ids, lambda value: value.strip().upper()), get_store().get_lab_results
+    ),
+    formatter=lambda batch: format_batch(
+        "Lab results (patient | test | ordered | status | priority | summary):",
+        batch,
+        lambda lab: (
+            f"{lab['patient']} | {lab['test_type']} | {lab['ordered_date']} | {lab['status']} | "
+            f"{'URGENT' if lab['urgent'] else 'normal'} | {lab['result_summary']}"
+        )
+    ),
+    is_found=lambda batch: bool(batch[1]),
+))
+
+register(ToolSpec(
+    name="find_doctors",
+    description="Get information about several doctors in one call. Prefer this over repeated find_doctor calls. Returns one compact line per doctor, with NOT FOUND for unknown names.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "doctor_names": array_property("Doctor names (e.g., ['Dr. Smith', 'Dr. Lee'])")
+        },
+        "required": ["doctor_names"]
+    },
+    handler=lambda doctor_names: fetch_batch(batch_keys(doctor_names), get_store().match_doctors),
+    formatter=lambda batch: format_batch(
+        "Doctors (name | specialty | available | new patients | languages | experience):",
+        batch,
+        doctor_row
+    ),
+    is_found=lambda batch: bool(batch[1]),
+))
+
+
+# Serialized once for the Anthropic API; the MCP server builds its Tool list the same way
+ANTHROPIC_TOOLS = [spec.anthropic_schema() for spec in REGISTRY.values()]
@@ -0,0 +1,215 @@
+"""
+Optional JSONL tracing of the agent loop.
+Each query becomes one span tree, written as one JSON line when it finishes:
+
+    run_agent            query, cached, answer_chars
+    ├── llm              turn, stop_reason, input_tokens, output_tokens
+    ├── tools            turn
+    │   └── tool         tool, status, result_chars
+    └── llm ...
+
+Summarize a trace file per query type with: python -m src.tracing traces.jsonl
+"""
+
+import json
+import threading
+import time
+import uuid
+
+
+class Span:
+    """A timed operation with attributes and child spans"""
+
+    __slots__ = ("name", "attributes", "start", "duration_ms", "children", "_t0", "_tracer")
+
+    def __init__(self, name: str, attributes: dict, tracer=None):
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self.duration_ms = None
+        self.children = []
+        self._t0 = time.perf_counter()
+        self._tracer = tracer
+
+    def child(self, name: str, **attributes) -> "Span":
+        span = Span(name, attributes)
+        self.children.append(span)
+        return span
+
+    def end(self, **attributes):
+        """Record attributes; the first call also fixes the duration"""
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._t0) * 1e3
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        self.end()
+        if self._tracer is not None:
+            self._tracer.write(self)
+
+    def to_dict(self) -> dict:
+        span = {
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+        }
+        if self.children:
+            span["children"] = [child.to_dict() for child in self.children]
+        return span
+
+
+class _NullSpan:
+    """Stands in for Span when tracing is off, so call sites need no branches"""
+
+    attributes = {}
+
+    def child(self, name: str, **attributes):
+        return self
+
+    def end(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Appends one JSON line per finished root span to `path`"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def trace(self, name: str, **attributes) -> Span:
+        """Root span, written out when its `with` block exits"""
+        attributes["trace_id"] = uuid.uuid4().hex
+        return Span(name, attributes, tracer=self)
+
+    def write(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class _NullTracer:
+    def trace(self, name: str, **attributes):
+        return NULL_SPAN
+
+
+NULL_TRACER = _NullTracer()
+
+
+def response_attributes(response) -> dict:
+    """Stop reason and token usage of a Messages API response"""
+    attributes = {"stop_reason": response.stop_reason}
+    usage = getattr(response, "usage", None)
+    for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+        value = getattr(usage, field, None)
+        if value is not None:
+            attributes[field] = value
+    return attributes
+
+
+# Summarizer
+
+def load_traces(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _children(span: dict, name: str) -> list:
+    return [child for child in span.get("children", ()) if child["name"] == name]
+
+
+def query_type(trace: dict) -> str:
+    """Group key: the set of tools a query used, or "cached" / "fast path" / "no tools" """
+    if trace["attributes"].get("cached"):
+        return "cached"
+    if trace["attributes"].get("routed"):
+        return "fast path"
+    names = sorted({
+        tool["attributes"].get("tool", "?")
+        for phase in _children(trace, "tools")
+        for tool in _children(phase, "tool")
+    })
+    return "+".join(names) or "no tools"
+
+
+def _percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+def summarize(traces: list, by: str = "tools") -> dict:
+    """Per-group latency split (LLM / tools / own overhead) and token usage"""
+    groups = {}
+    for trace in traces:
+        key = query_type(trace) if by == "tools" else trace["attributes"].get("query", "?")
+        groups.setdefault(key, []).append(trace)
+
+    summary = {}
+    for key, members in sorted(groups.items()):
+        wall = [trace["duration_ms"] for trace in members]
+        llm_calls = [_children(trace, "llm") for trace in members]
+        llm_ms = [sum(call["duration_ms"] for call in calls) for calls in llm_calls]
+        tool_ms = [sum(phase["duration_ms"] for phase in _children(trace, "tools")) for trace in members]
+        count = len(members)
+        summary[key] = {
+            "queries": count,
+            "errors": sum(1 for trace in members if "error" in trace["attributes"]),
+            "wall_p50_ms": _percentile(wall, 0.50),
+            "wall_p95_ms": _percentile(wall, 0.95),
+            "wall_mean_ms": sum(wall) / count,
+            "llm_calls_mean": sum(len(calls) for calls in llm_calls) / count,
+            "llm_mean_ms": sum(llm_ms) / count,
+            "tools_mean_ms": sum(tool_ms) / count,
+            "overhead_mean_ms": sum(w - l - t for w, l, t in zip(wall, llm_ms, tool_ms)) / count,
+            "input_tokens_mean": sum(
+                call["attributes"].get("input_tokens", 0) for calls in llm_calls for call in calls
+            ) / count,
+            "output_tokens_mean": sum(
+                call["attributes"].get("output_tokens", 0) for calls in llm_calls for call in calls
+            ) / count,
+        }
+    return summary
+
+
+def print_summary(summary: dict):
+    print(f"{'query type':<40} {'n':>4} {'p50 ms':>8} {'p95 ms':>8} {'llm ms':>8} {'tool ms':>8} "
+          f"{'other ms':>8} {'calls':>5} {'in tok':>7} {'out tok':>7}")
+    print("-" * 114)
+    for key, row in summary.items():
+        print(
+            f"{key[:40]:<40} {row['queries']:>4} {row['wall_p50_ms']:>8.1f} {row['wall_p95_ms']:>8.1f} "
+            f"{row['llm_mean_ms']:>8.1f} {row['tools_mean_ms']:>8.1f} {row['overhead_mean_ms']:>8.1f} "
+            f"{row['llm_calls_mean']:>5.1f} {row['input_tokens_mean']:>7.0f} {row['output_tokens_mean']:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize run_agent traces per query type")
+    parser.add_argument("path", help="JSONL file written with AGENT_TRACE_PATH")
+    parser.add_argument("--by", choices=["tools", "query"], default="tools",
+                        help="group by the set of tools used, or by query text")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    result = summarize(load_traces(args.path), by=args.by)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_summary(result)
@@ -0,0 +1,67 @@
+"""Agent variants share one tool-use loop: same answers, same history, same cache entries"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("dotenv")
+
+import demo_claude  # noqa: E402
+from benchmarks.fake_anthropic import AsyncFakeAnthropic, FakeAnthropic  # noqa: E402
+from src.cache import LRUCache, ResponseCache  # noqa: E402
+
+QUERY = "Is APT-101 still on, and is LAB-202 back?"
+SCRIPTS = {QUERY: [
+    ["Let me check both.", ("lookup_appointment", {"appointment_id": "APT-101"}),
+     ("lookup_lab_result", {"lab_id": "LAB-202"})],
+    "APT-101 is confirmed and LAB-202 is still processing.",
+]}
+ANSWER = "Let me check both. APT-101 is confirmed and LAB-202 is still processing."
+
+
+@pytest.fixture(autouse=True)
+def no_fast_path(monkeypatch):
+    monkeypatch.setattr(demo_claude, "FAST_PATH", False)
+
+
+def new_cache():
+    return ResponseCache(LRUCache(max_entries=16))
+
+
+async def collect(stream):
+    return [delta async for delta in stream]
+
+
+def test_every_variant_gives_the_same_answer():
+    assert demo_claude.run_agent(QUERY, client=FakeAnthropic(SCRIPTS), cache=None) == ANSWER
+    assert asyncio.run(demo_claude.run_agent_async(QUERY, client=AsyncFakeAnthropic(SCRIPTS), cache=None)) == ANSWER
+    assert "".join(demo_claude.stream_agent(QUERY, client=FakeAnthropic(SCRIPTS), cache=None)) == ANSWER
+    deltas = asyncio.run(collect(demo_claude.stream_agent_async(QUERY, client=AsyncFakeAnthropic(SCRIPTS), cache=None)))
+    assert "".join(deltas) == ANSWER
+
+
+@pytest.mark.parametrize("client_type, stream", [
+    (FakeAnthropic, lambda client, cache: list(demo_claude.stream_agent(QUERY, client=client, cache=cache))),
+    (AsyncFakeAnthropic, lambda client, cache: asyncio.run(
+        collect(demo_claude.stream_agent_async(QUERY, client=client, cache=cache))
+    )),
+])
+def test_a_cache_hit_repeats_what_was_streamed(client_type, stream):
+    client, cache = client_type(SCRIPTS), new_cache()
+    streamed = "".join(stream(client, cache))
+    calls = client.calls
+    assert stream(client, cache) == [streamed]
+    assert client.calls == calls
+    assert demo_claude.run_agent(QUERY, client=FakeAnthropic(SCRIPTS), cache=cache) == streamed
+
+
+def test_sync_and_async_loops_build_the_same_history():
+    trace = demo_claude.NULL_SPAN
+    sync_messages = [{"role": "user", "content": QUERY}]
+    demo_claude.agent_loop(sync_messages, FakeAnthropic(SCRIPTS), demo_claude.TOOLS, trace)
+    async_messages = [{"role": "user", "content": QUERY}]
+    asyncio.run(demo_claude.agent_loop_async(async_messages, AsyncFakeAnthropic(SCRIPTS), demo_claude.TOOLS, trace))
+    assert async_messages == sync_messages
+    # Plain dicts all the way down, as sessions and token accounting expect
+    assert all(isinstance(block, dict) for message in async_messages[1:] for block in message["content"])
@@ -0,0 +1,40 @@
+"""check_faq: key matches, ranked paraphrase fallback, and off-topic questions"""
+
+import pytest
+
+from src import faq_search
+from src.data import FAQ_DATA
+from src.tools import dispatch
+
+pytest.importorskip("numpy")
+
+NOT_FOUND = "I couldn't find an answer to that question in our FAQ."
+
+
+@pytest.mark.parametrize("question", [
+    "what is the meaning of life",
+    "can I bring my dog",
+    "do you do dental cleanings",
+])
+def test_off_topic_questions_are_not_answered(question):
+    assert dispatch("check_faq", {"question": question}).startswith(NOT_FOUND)
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("do you take Aetna?", "Aetna"),
+    ("when do you open on weekends?", "Saturday 9AM-2PM"),
+    ("do you offer virtual visits", "telehealth"),
+    ("is there parking", "Free parking"),
+])
+def test_paraphrases_are_answered(question, expected):
+    response = dispatch("check_faq", {"question": question})
+    assert response.startswith("FAQ Answer:")
+    assert expected in response
+
+
+def test_questions_do_not_grow_the_word_memo():
+    search = faq_search.FaqSearch(list(FAQ_DATA.items()))
+    vocabulary = len(search._word_features)
+    search.search("zyxwv quokka flibbertigibbet hours")
+    search.search_batch(["unheard-of words", "more novel vocabulary"])
+    assert len(search._word_features) == vocabulary
@@ -0,0 +1,53 @@
+"""Export loading: rows at the end of a file without a trailing newline"""
+
+import pytest
+
+from src import loader
+from src.data import APPOINTMENTS, FAQ_DATA
+from src.storage import SQLiteStore, get_store, set_store
+
+
+@pytest.fixture
+def restore_store():
+    # DataReloader.load swaps the process-wide store
+    original = get_store()
+    yield
+    set_store(original)
+
+
+def write_unterminated(path, name, items):
+    loader.write_export(str(path), name, items)
+    path.write_bytes(path.read_bytes().rstrip(b"\n"))
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_full_load_reads_an_unterminated_last_row(tmp_path, extension):
+    items = list(APPOINTMENTS.items())[:2]
+    write_unterminated(tmp_path / f"appointments.{extension}", "appointments", items)
+    question, answer = next(iter(FAQ_DATA.items()))
+    write_unterminated(tmp_path / "faq.jsonl", "faq", [(question, answer)])
+
+    store = loader.load_store(str(tmp_path))
+    assert [apt_id for apt_id, _ in items] == [apt_id for apt_id in store.appointments]
+    assert dict(store.faq_items()) == {question: answer}
+
+    counts = loader.load_into(SQLiteStore(str(tmp_path / "clinic.db")), str(tmp_path))
+    assert counts == {"appointments": 2, "faq": 1}
+
+
+def test_reloader_rereads_an_unterminated_row_once_it_is_finished(tmp_path, restore_store):
+    path = tmp_path / "appointments.jsonl"
+    (apt_id, record), (next_id, next_record) = list(APPOINTMENTS.items())[:2]
+    write_unterminated(path, "appointments", [(apt_id, record)])
+    reloader = loader.DataReloader(str(tmp_path))
+    store = reloader.load()
+    assert list(store.appointments) == [apt_id]
+
+    # The writer finishes the row (its closing brace was still missing) and appends another
+    path.write_bytes(path.read_bytes()[:-1])
+    with open(path, "a") as handle:
+        handle.write('}\n')
+    loader.write_export(str(path), "appointments", [(next_id, next_record)], append=True)
+    assert reloader.check() == "append"
+    assert list(store.appointments) == [apt_id, next_id]
+    assert reloader._readers["appointments"].rows == 2
@@ -0,0 +1,60 @@
+"""MCP tool calls: memoization against outside writes, and slow calls off the event loop"""
+
+import asyncio
+import dataclasses
+import time
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from src import mcp_server  # noqa: E402
+from src.data import APPOINTMENTS  # noqa: E402
+from src.storage import SQLiteStore, get_store, set_store  # noqa: E402
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    original = get_store()
+    store = SQLiteStore(str(tmp_path / "clinic.db"))
+    store.put_appointments(APPOINTMENTS.items())
+    set_store(store)
+    yield store
+    set_store(original)
+
+
+def lookup(apt_id):
+    result = asyncio.run(mcp_server.call_tool("lookup_appointment", {"appointment_id": apt_id}))
+    return result[0].text
+
+
+def test_memoized_result_is_dropped_when_another_process_writes(sqlite_store):
+    apt_id, record = next(iter(APPOINTMENTS.items()))
+    assert "Moved by the front desk" not in lookup(apt_id)
+
+    # mtime has coarse granularity on some filesystems
+    time.sleep(0.05)
+    # A second connection stands in for another process writing the same file
+    SQLiteStore(sqlite_store.path).put_appointment(apt_id, dict(record, reason="Moved by the front desk"))
+    assert "Moved by the front desk" in lookup(apt_id)
+
+
+def test_slow_tool_calls_do_not_block_the_event_loop(monkeypatch):
+    delay = 0.2
+
+    def slow_lookup(appointment_id):
+        time.sleep(delay)
+        return appointment_id, None
+
+    spec = mcp_server.REGISTRY["lookup_appointment"]
+    monkeypatch.setitem(mcp_server.REGISTRY, "lookup_appointment", dataclasses.replace(spec, handler=slow_lookup))
+
+    async def main():
+        calls = [mcp_server.call_tool("lookup_appointment", {"appointment_id": f"APT-9{i:02d}"}) for i in range(4)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*calls)
+        return time.perf_counter() - start, results
+
+    elapsed, results = asyncio.run(main())
+    assert elapsed < 4 * delay * 0.75
+    assert [result[0].text.split()[1] for result in results] == ["APT-900", "APT-901", "APT-902", "APT-903"]
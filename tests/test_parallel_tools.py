@@ -0,0 +1,97 @@
+"""One turn's tool calls run concurrently and come back in tool_use order"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("dotenv")
+
+import demo_claude  # noqa: E402
+
+# Slowest first, so the calls finish in the reverse of their order
+DELAYS = [0.4, 0.3, 0.2, 0.1]
+
+
+def slow_tool(delay: float) -> str:
+    time.sleep(delay)
+    return f"slept {delay}s"
+
+
+def failing_tool(delay: float) -> str:
+    time.sleep(delay)
+    raise RuntimeError("backend unavailable")
+
+
+FUNCTION_MAP = {"slow_tool": slow_tool, "failing_tool": failing_tool}
+
+
+@pytest.fixture(autouse=True)
+def idle_pool():
+    """Wait until every worker is free, so calls a test timed out don't hold up the next one"""
+    yield
+    barrier = threading.Barrier(demo_claude.TOOL_WORKERS + 1)
+    for _ in range(demo_claude.TOOL_WORKERS):
+        demo_claude._tool_executor.submit(barrier.wait)
+    barrier.wait()
+
+
+def tool_uses(names=None):
+    names = names or ["slow_tool"] * len(DELAYS)
+    return [SimpleNamespace(id=f"toolu_{i}", name=name, input={"delay": delay})
+            for i, (name, delay) in enumerate(zip(names, DELAYS))]
+
+
+def run_sync(uses):
+    return demo_claude.execute_tool_calls(uses, function_map=FUNCTION_MAP)
+
+
+def run_async(uses):
+    return asyncio.run(demo_claude.execute_tool_calls_async(uses, function_map=FUNCTION_MAP))
+
+
+@pytest.mark.parametrize("execute", [run_sync, run_async])
+def test_calls_overlap_and_results_keep_tool_use_order(execute):
+    uses = tool_uses()
+    start = time.perf_counter()
+    results = execute(uses)
+    elapsed = time.perf_counter() - start
+
+    # About as long as the slowest call, well under the sum of them all
+    assert elapsed < sum(DELAYS) * 0.6
+    assert [result["tool_use_id"] for result in results] == [use.id for use in uses]
+    assert [result["content"] for result in results] == [f"slept {delay}s" for delay in DELAYS]
+
+
+@pytest.mark.parametrize("execute", [run_sync, run_async])
+def test_a_failing_call_does_not_affect_the_others(execute):
+    uses = tool_uses(["slow_tool", "failing_tool", "slow_tool", "nonexistent_tool"])
+    results = execute(uses)
+    assert [result["tool_use_id"] for result in results] == [use.id for use in uses]
+    assert [bool(result.get("is_error")) for result in results] == [False, True, False, True]
+
+
+@pytest.mark.parametrize("execute", [run_sync, run_async])
+def test_time_queued_for_a_worker_does_not_count_against_the_timeout(execute, monkeypatch):
+    # Twice as many calls as workers, each taking most of the timeout: the
+    # second wave waits a full call for a worker, then still gets its own timeout
+    delay = 0.3
+    monkeypatch.setattr(demo_claude, "TOOL_TIMEOUT", delay * 1.5)
+    uses = [SimpleNamespace(id=f"toolu_{i}", name="slow_tool", input={"delay": delay})
+            for i in range(2 * demo_claude.TOOL_WORKERS)]
+    results = execute(uses)
+    assert [result.get("is_error", False) for result in results] == [False] * len(uses)
+
+
+@pytest.mark.parametrize("execute", [run_sync, run_async])
+def test_a_call_that_never_gets_a_worker_is_reported(execute, monkeypatch):
+    # Every worker is held past the timeout, so the extra call can't start in time
+    monkeypatch.setattr(demo_claude, "TOOL_TIMEOUT", 0.2)
+    uses = [SimpleNamespace(id=f"toolu_{i}", name="slow_tool", input={"delay": 0.5})
+            for i in range(demo_claude.TOOL_WORKERS + 1)]
+    results = execute(uses)
+    assert "didn't start within 0.2s" in results[-1]["content"]
+    assert all("timed out after 0.2s" in result["content"] for result in results[:-1])
@@ -0,0 +1,44 @@
+"""Fast-path router: what it answers without the model, and what it leaves to it"""
+
+import pytest
+
+from src import router
+from src.tools import REGISTRY
+
+FUNCTION_MAP = dict(REGISTRY)
+
+
+@pytest.mark.parametrize("query", [
+    "Does Dr. Lee accept Aetna?",
+    "Where is Dr. Lee located?",
+    "Is Dr. Smith a good doctor?",
+    "Can I reschedule APT-101?",
+    "Is APT-101 confirmed and what are your hours?",
+])
+def test_questions_the_tool_data_cannot_answer_fall_through(query):
+    assert router.answer(query, FUNCTION_MAP) is None
+
+
+@pytest.mark.parametrize("query, tool, expected", [
+    ("Tell me about Dr. Smith", "find_doctor", "new patients"),
+    ("Is Dr. Lee accepting new patients?", "find_doctor", "new patients"),
+    ("Is APT-101 confirmed?", "lookup_appointment", "Appointment APT-101 is confirmed"),
+    ("What's the status of LAB-202?", "lookup_lab_result", "Lab result LAB-202"),
+    ("What are your hours?", "check_faq", "Monday-Friday"),
+])
+def test_routed_answers_use_a_template(query, tool, expected):
+    text, route = router.answer(query, FUNCTION_MAP)
+    assert route.tool == tool
+    assert expected in text
+    # Templates are sentences, not the raw multi-line tool card
+    assert "\n" not in text
+
+
+def test_unknown_id_gets_the_tool_not_found_message():
+    text, _ = router.answer("Is APT-999 confirmed?", FUNCTION_MAP)
+    assert text.startswith("Appointment APT-999 not found")
+
+
+def test_every_route_has_a_template():
+    routed = {"check_faq", "lookup_appointment", "lookup_lab_result", "find_doctor"}
+    assert routed <= set(router.TEMPLATES)
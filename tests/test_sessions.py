@@ -0,0 +1,35 @@
+"""Multi-turn chat: the router only answers a conversation's first message"""
+
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("dotenv")
+
+import demo_claude  # noqa: E402
+from benchmarks.fake_anthropic import FakeAnthropic  # noqa: E402
+from src.sessions import SessionStore  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fast_path_on(monkeypatch):
+    monkeypatch.setattr(demo_claude, "FAST_PATH", True)
+
+
+def test_follow_up_goes_to_the_model_even_when_the_router_is_confident():
+    client = FakeAnthropic({
+        "Is Dr. Lee accepting new patients?": ["Yes, Dr. Lee is accepting new patients."],
+        "What about Dr. Smith?": ["Dr. Smith is accepting new patients too."],
+        "Tell me about Dr. Smith": ["Dr. Smith works Monday to Friday."],
+    })
+    sessions = SessionStore()
+
+    first = demo_claude.chat("p1", "Is Dr. Lee accepting new patients?", client=client, sessions=sessions)
+    assert client.calls == 0 and "accepting new patients" in first
+
+    # The router would answer this on its own, but after "What about ...?" it
+    # may mean something the card can't say
+    demo_claude.chat("p1", "What about Dr. Smith?", client=client, sessions=sessions)
+    answer = demo_claude.chat("p1", "Tell me about Dr. Smith", client=client, sessions=sessions)
+    assert client.calls == 2
+    assert answer == "Dr. Smith works Monday to Friday."
+    assert len(sessions.get("p1").turns) == 3
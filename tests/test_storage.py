@@ -0,0 +1,89 @@
+"""MemoryStore indexes under concurrent reads and writes"""
+
+import threading
+import time
+
+import pytest
+
+from benchmarks import synthetic
+from src.storage import MemoryStore
+
+ROWS = 20_000
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_search_while_existing_ids_are_updated(compact):
+    store = MemoryStore(appointments=dict(synthetic.appointments(ROWS)), compact=compact)
+    stop = threading.Event()
+    errors = []
+
+    def update():
+        # Rewrite existing ids with new doctors and dates, one at a time and in batches
+        round_ = 0
+        while not stop.is_set():
+            round_ += 1
+            batch = [(synthetic.appointment_id(i), record)
+                     for i, (_, record) in enumerate(synthetic.appointments(500, seed=round_))]
+            try:
+                store.put_appointments(batch)
+                store.put_appointment(*batch[0])
+            except Exception as error:
+                errors.append(error)
+                return
+
+    writer = threading.Thread(target=update)
+    writer.start()
+    try:
+        deadline = time.monotonic() + 1.0
+        while time.monotonic() < deadline:
+            for _ in store.find_appointments(doctor="Dr. Smith"):
+                pass
+            for _ in store.find_appointments_between(doctor="Dr. Lee"):
+                pass
+    finally:
+        stop.set()
+        writer.join()
+    assert not errors
+
+
+def test_updates_move_records_between_index_entries():
+    store = MemoryStore(appointments=dict(synthetic.appointments(100)))
+    apt_id = synthetic.appointment_id(0)
+    record = dict(store.get_appointment(apt_id), doctor="Dr. Nobody", date="January 2, 2030", time="9:00 AM")
+    store.put_appointments([(apt_id, record)])
+    assert [found for found, _ in store.find_appointments(doctor="Dr. Nobody")] == [apt_id]
+    assert [found for found, _ in store.find_appointments_between()][-1] == apt_id
+    store.put_appointment(apt_id, dict(record, doctor="Dr. Smith", date="January 1, 2020"))
+    assert list(store.find_appointments(doctor="Dr. Nobody")) == []
+    assert [found for found, _ in store.find_appointments_between()][0] == apt_id
+
+
+def test_loaded_store_serves_a_precomputed_data_version(tmp_path, monkeypatch):
+    from src import loader, storage
+
+    loader.write_export(str(tmp_path / "appointments.jsonl"), "appointments", synthetic.appointments(100))
+    store = loader.load_store(str(tmp_path))
+    expected = MemoryStore(appointments=dict(synthetic.appointments(100))).data_version
+
+    # Requests only read the stored value; writes still update it in O(1)
+    def rehash(*args):
+        raise AssertionError("data_version rehashed on the request path")
+
+    version = store.data_version
+    assert version == expected
+    record = dict(store.get_appointment(synthetic.appointment_id(0)), reason="Moved to a later date")
+    monkeypatch.setattr(storage, "_record_hash", rehash)
+    assert store.data_version == version
+    monkeypatch.undo()
+    store.put_appointment(synthetic.appointment_id(0), record)
+    assert store.data_version != version
+
+
+def test_compact_tables_keep_free_text_out_of_their_dictionaries():
+    store = MemoryStore(appointments=dict(synthetic.appointments(100)), compact=True)
+    apt_id = synthetic.appointment_id(0)
+    store.put_appointment(apt_id, dict(store.get_appointment(apt_id), reason="Follow-up for a one-off note"))
+    store.put_appointment(apt_id, dict(store.get_appointment(apt_id), reason="Replaced again"))
+    assert store.get_appointment(apt_id)["reason"] == "Replaced again"
+    # A replaced reason isn't held on to by the table
+    assert all("Follow-up for a one-off note" not in codes for codes in store.appointments._codes.values())
@@ -0,0 +1,76 @@
+"""Tool arguments the model gets wrong: bad paging values and batch inputs get an answer, not an exception"""
+
+import pytest
+
+from src.tools import MAX_PAGE_SIZE, REGISTRY
+
+SEARCHES = [
+    ("find_appointments", {"doctor": "Dr. Smith"}),
+    ("find_lab_results", {"patient": "John Doe"}),
+    ("find_appointments_by_date", {"period": "this month"}),
+]
+
+
+@pytest.mark.parametrize("tool, arguments", SEARCHES)
+@pytest.mark.parametrize("page_size", ["ten", [5]])
+def test_non_numeric_page_size_is_a_tool_message(tool, arguments, page_size):
+    text, found = REGISTRY[tool].run({**arguments, "page_size": page_size})
+    assert text == f"page_size must be a whole number from 1 to {MAX_PAGE_SIZE}; repeat the search with one."
+    assert not found
+
+
+def test_numeric_page_size_string_still_pages():
+    text, found = REGISTRY["find_appointments"].run({"doctor": "Dr. Smith", "page_size": "1"})
+    assert found
+    assert "cursor" in text
+
+
+def test_invalid_cursor_is_a_tool_message():
+    text, found = REGISTRY["find_appointments"].run({"doctor": "Dr. Smith", "cursor": "not-a-cursor"})
+    assert text == "That cursor isn't valid; repeat the search without a cursor."
+    assert not found
+
+
+@pytest.mark.parametrize("tool, argument, key", [
+    ("lookup_appointments", "appointment_ids", "APT-101"),
+    ("lookup_lab_results", "lab_ids", "LAB-201"),
+    ("find_doctors", "doctor_names", "Dr. Smith"),
+])
+def test_a_bare_string_is_a_batch_of_one(tool, argument, key):
+    text, found = REGISTRY[tool].run({argument: key})
+    assert found
+    lines = text.splitlines()[1:]
+    assert len(lines) == 1 and "NOT FOUND" not in lines[0]
+
+
+def test_non_string_batch_items_are_looked_up_as_text():
+    text, found = REGISTRY["lookup_appointments"].run({"appointment_ids": ["apt-101", 101, None, 3.5]})
+    assert found
+    first, *rest = text.splitlines()[1:]
+    assert first.startswith("APT-101: John Doe")
+    assert rest == ["101: NOT FOUND", "3.5: NOT FOUND"]
+
+
+@pytest.mark.parametrize("top_k", ["three", [3]])
+def test_non_numeric_top_k_is_a_tool_message(top_k):
+    spec = REGISTRY["search_faq"]
+    text, found = spec.run({"question": "when are you open?", "top_k": top_k})
+    assert text.startswith("top_k must be a whole number from 1 to")
+    assert not found
+    assert spec.compact(question="when are you open?", top_k=top_k) == text
+
+
+def test_equivalent_top_k_values_share_a_cache_key():
+    spec = REGISTRY["search_faq"]
+    keys = {spec.key({"question": "When are you open?", **extra}) for extra in ({}, {"top_k": 3}, {"top_k": "3"})}
+    assert len(keys) == 1
+
+
+@pytest.mark.parametrize("tool", ["find_appointments", "find_appointments_by_date"])
+@pytest.mark.parametrize("doctor", ["smith", "Dr Smith", "Dr. Smyth", "Sarah Smith"])
+def test_doctor_filter_resolves_through_the_name_index(tool, doctor):
+    arguments = {} if tool == "find_appointments" else {"start_date": "2020-01-01", "end_date": "2030-12-31"}
+    expected, _ = REGISTRY[tool].run({**arguments, "doctor": "Dr. Smith"})
+    text, found = REGISTRY[tool].run({**arguments, "doctor": doctor})
+    assert found
+    assert text == expected